@@ -4,6 +4,14 @@ This module contains the foundational types used across all AFD applications:
 - CommandResult: Standard response type for all commands
 - CommandError: Structured error with recovery guidance
 - Metadata types: Source, PlanStep, Alternative, Warning
+- Metric types: Histogram, CommandStats and Prometheus export
+- LoopMonitor: event-loop lag and blocking-call detection
+- Middleware: the execution chain and stock tracing, logging, timeout
+  and concurrency-limit middleware
+- run_process: child processes killed when their command is cancelled
+- Executors: thread and process pools for offloaded handlers
+- Cache types: ResultCache and dependency fingerprints
+- Batch types: run several commands with dependencies in one call
 """
 
 from afd.core.result import (
@@ -44,8 +52,37 @@ from afd.core.commands import (
     CommandHandler,
     CommandContext,
     CommandRegistry,
+    Invocation,
+    Middleware,
+    NextStep,
+    ProgressCallback,
     create_command_registry,
+    report_progress,
+    run_with_deadline,
 )
+from afd.core.metrics import CommandStats, Histogram, PrometheusWriter
+from afd.core.monitor import LoopMonitor
+from afd.core.middleware import (
+    ConcurrencyLimitMiddleware,
+    LoggingMiddleware,
+    TimeoutMiddleware,
+    TracingMiddleware,
+)
+from afd.core.process import run_process
+from afd.core.executors import ExecutionMode, Executors
+from afd.core.limits import ConcurrencyLimits, FairSemaphore
+from afd.core.cache import ResultCache, file_fingerprint, tree_fingerprint
+from afd.core.memo import (
+    Memoized,
+    clear_memos,
+    memo_stats,
+    memoize,
+    track_path,
+    tracked_open,
+    tracked_read_bytes,
+    tracked_read_text,
+)
+from afd.core.batch import BatchError, BatchStep, BatchStepResult, run_batch
 
 __all__ = [
     # Result types
@@ -83,5 +120,46 @@ __all__ = [
     "CommandHandler",
     "CommandContext",
     "CommandRegistry",
+    "Invocation",
+    "Middleware",
+    "NextStep",
+    "ProgressCallback",
     "create_command_registry",
+    "report_progress",
+    "run_with_deadline",
+    # Metric types
+    "CommandStats",
+    "Histogram",
+    "PrometheusWriter",
+    "LoopMonitor",
+    # Middleware
+    "ConcurrencyLimitMiddleware",
+    "LoggingMiddleware",
+    "TimeoutMiddleware",
+    "TracingMiddleware",
+    "run_process",
+    # Executor types
+    "ExecutionMode",
+    "Executors",
+    # Concurrency limits
+    "ConcurrencyLimits",
+    "FairSemaphore",
+    # Cache types
+    "ResultCache",
+    "file_fingerprint",
+    "tree_fingerprint",
+    # Memoization
+    "Memoized",
+    "memoize",
+    "memo_stats",
+    "clear_memos",
+    "track_path",
+    "tracked_open",
+    "tracked_read_text",
+    "tracked_read_bytes",
+    # Batch types
+    "BatchError",
+    "BatchStep",
+    "BatchStepResult",
+    "run_batch",
 ]
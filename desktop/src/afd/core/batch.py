@@ -0,0 +1,207 @@
+"""Batch execution of commands with dependencies.
+
+A batch is a list of steps, each naming a command, its input and the
+steps it depends on. Steps whose dependencies have finished run
+concurrently, up to a concurrency cap, and every step's result comes back
+together - one round trip instead of one per command.
+
+Example:
+    >>> from afd.core.batch import BatchStep, run_batch
+    >>>
+    >>> results = await run_batch(
+    ...     server.execute,
+    ...     [
+    ...         BatchStep(command="addon.validate", input={"addon": "MyAddon"}),
+    ...         BatchStep(command="addon.lint", input={"addon": "MyAddon"},
+    ...                   depends_on=["addon.validate"]),
+    ...     ],
+    ...     max_concurrency=4,
+    ... )
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from afd.core.result import CommandResult, error
+
+# Executes one command: (name, input, context) -> CommandResult
+Executor = Callable[[str, Any, Any], Awaitable[CommandResult[Any]]]
+
+# Called as each step finishes: (step result, finished count, total)
+StepCallback = Callable[["BatchStepResult", int, int], None]
+
+
+class BatchStep(BaseModel):
+    """One command in a batch.
+
+    Attributes:
+        id: Name other steps use in depends_on; defaults to the command
+            name, so it only needs setting when a command appears twice.
+        command: Command to run.
+        input: Command input.
+        depends_on: Step ids that must succeed before this step runs.
+    """
+
+    id: Optional[str] = Field(None, description="Step id (defaults to command name)")
+    command: str = Field(..., description="Command to run")
+    input: Dict[str, Any] = Field(default_factory=dict, description="Command input")
+    depends_on: List[str] = Field(
+        default_factory=list, description="Step ids that must succeed first"
+    )
+
+
+class BatchStepResult(BaseModel):
+    """Outcome of one batch step.
+
+    Attributes:
+        id: Step id.
+        command: Command that ran (or would have).
+        status: "success", "failure", or "skipped" when a dependency
+            failed or the batch stopped early.
+        duration_ms: Time spent executing the command.
+        result: The command's result (an error result for skipped steps).
+    """
+
+    id: str
+    command: str
+    status: Literal["success", "failure", "skipped"]
+    duration_ms: float = 0.0
+    result: CommandResult[Any]
+
+
+class BatchError(ValueError):
+    """Raised when a batch plan is invalid (duplicate ids, unknown or cyclic dependencies)."""
+
+
+def plan_batch(steps: List[BatchStep]) -> List[BatchStep]:
+    """Assign default ids and validate the dependency graph.
+
+    Returns:
+        The steps with ids filled in, in their original order.
+
+    Raises:
+        BatchError: On duplicate ids, unknown dependencies or cycles.
+    """
+    planned = [
+        step if step.id else step.model_copy(update={"id": step.command})
+        for step in steps
+    ]
+
+    ids = set()
+    for step in planned:
+        if step.id in ids:
+            raise BatchError(
+                f"Duplicate step id '{step.id}'; give repeated commands explicit ids"
+            )
+        ids.add(step.id)
+    for step in planned:
+        for dep in step.depends_on:
+            if dep not in ids:
+                raise BatchError(f"Step '{step.id}' depends on unknown step '{dep}'")
+
+    # Kahn's algorithm: anything left unsorted is part of a cycle
+    remaining = {step.id: set(step.depends_on) for step in planned}
+    ready = [step_id for step_id, deps in remaining.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del remaining[done]
+        for step_id, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(step_id)
+    if remaining:
+        raise BatchError(
+            f"Dependency cycle between steps: {', '.join(sorted(remaining))}"
+        )
+
+    return planned
+
+
+async def run_batch(
+    execute: Executor,
+    steps: List[BatchStep],
+    max_concurrency: int = 4,
+    stop_on_error: bool = False,
+    context: Any = None,
+    on_step_done: Optional[StepCallback] = None,
+) -> List[BatchStepResult]:
+    """Run a batch of commands, respecting dependencies.
+
+    Args:
+        execute: Executes one command, e.g. ``server.execute``.
+        steps: Steps to run.
+        max_concurrency: Most steps running at once.
+        stop_on_error: Skip steps that haven't started once any step fails.
+        context: Context passed to every command.
+        on_step_done: Called as each step finishes (e.g. to report progress).
+
+    Returns:
+        One result per step, in the order the steps were given.
+
+    Raises:
+        BatchError: If the plan is invalid; nothing is executed.
+    """
+    planned = plan_batch(steps)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    tasks: Dict[str, "asyncio.Task[BatchStepResult]"] = {}
+    finished = 0
+    failed = False
+
+    def skipped(step: BatchStep, code: str, message: str) -> BatchStepResult:
+        return BatchStepResult(
+            id=step.id,
+            command=step.command,
+            status="skipped",
+            result=error(code=code, message=message),
+        )
+
+    async def run_step(step: BatchStep) -> BatchStepResult:
+        nonlocal failed
+        deps = [await tasks[dep] for dep in step.depends_on]
+        failed_deps = [d.id for d in deps if d.status != "success"]
+        if failed_deps:
+            return skipped(
+                step,
+                "DEPENDENCY_FAILED",
+                f"Skipped because {', '.join(failed_deps)} did not succeed",
+            )
+
+        async with semaphore:
+            if stop_on_error and failed:
+                return skipped(
+                    step, "BATCH_STOPPED", "Skipped after an earlier step failed"
+                )
+            start = time.perf_counter()
+            result = await execute(step.command, step.input, context)
+            duration_ms = (time.perf_counter() - start) * 1000
+
+        if not result.success:
+            failed = True
+        return BatchStepResult(
+            id=step.id,
+            command=step.command,
+            status="success" if result.success else "failure",
+            duration_ms=round(duration_ms, 2),
+            result=result,
+        )
+
+    def step_done(task: "asyncio.Task[BatchStepResult]") -> None:
+        nonlocal finished
+        finished += 1
+        if on_step_done and not task.cancelled() and task.exception() is None:
+            on_step_done(task.result(), finished, len(planned))
+
+    # Every task exists before any runs, so dependencies can be awaited by id
+    for step in planned:
+        tasks[step.id] = asyncio.ensure_future(run_step(step))
+        tasks[step.id].add_done_callback(step_done)
+
+    try:
+        return list(await asyncio.gather(*tasks.values()))
+    finally:
+        for task in tasks.values():
+            task.cancel()
@@ -0,0 +1,203 @@
+"""Result cache for idempotent commands.
+
+Read-only commands can declare a dependency *fingerprint*: a cheap
+function of their input that changes whenever the data they read changes
+(typically file mtimes and sizes). The registry caches successful results
+keyed by command name, canonicalized input and fingerprint, so repeated
+identical calls skip the real work until a dependency changes. Mutations
+are never cached.
+
+Example:
+    >>> from afd.core.cache import ResultCache, file_fingerprint
+    >>>
+    >>> @server.command(
+    ...     name="api.search",
+    ...     description="Search the API database",
+    ...     fingerprint=lambda input: file_fingerprint(DB_PATH),
+    ... )
+    ... async def api_search(input):
+    ...     ...
+    >>>
+    >>> server.cache.stats()["hit_ratio"]
+    0.5
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from afd.core.result import CommandResult
+
+PathLike = Union[str, os.PathLike]
+
+# Number of results kept before the least recently used is evicted
+DEFAULT_MAX_ENTRIES = 256
+
+
+def canonical_input(input: Any) -> Any:
+    """Normalize command input to plain JSON-compatible data.
+
+    Pydantic models are dumped to dicts so that a model and the equivalent
+    dict produce the same cache key and fingerprint arguments.
+    """
+    if isinstance(input, BaseModel):
+        return input.model_dump(mode="json")
+    return input if input is not None else {}
+
+
+def make_cache_key(name: str, input: Any, fingerprint: Any) -> str:
+    """Build a stable cache key from a command call and its fingerprint."""
+    payload = json.dumps(
+        [name, canonical_input(input), fingerprint],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def file_fingerprint(*paths: PathLike) -> Tuple[Tuple[str, int, int], ...]:
+    """Fingerprint individual files by mtime and size.
+
+    Missing files fingerprint as ``(path, 0, -1)`` so that creating them
+    invalidates cached results.
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            parts.append((str(path), 0, -1))
+    return tuple(parts)
+
+
+def tree_fingerprint(
+    root: PathLike, suffixes: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """Fingerprint a directory tree by the path, mtime and size of its files.
+
+    Only stats files; never reads them. Hidden directories (``.git``...)
+    are skipped. Returns None if root doesn't exist.
+
+    Args:
+        root: Directory to walk.
+        suffixes: Only include files with these suffixes (e.g. ``(".lua",)``).
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return None
+    wanted = tuple(suffixes) if suffixes else None
+    digest = hashlib.blake2b(digest_size=16)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if wanted and not filename.endswith(wanted):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """LRU cache of successful command results with hit/miss accounting.
+
+    Attributes:
+        enabled: When False, every lookup misses and nothing is stored.
+        max_entries: Maximum number of cached results.
+
+    Example:
+        >>> cache = ResultCache(max_entries=2)
+        >>> key = make_cache_key("api.search", {"query": "Unit"}, fingerprint)
+        >>> cache.get("api.search", key) is None
+        True
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, CommandResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._per_command: Dict[str, Dict[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _counts(self, name: str) -> Dict[str, int]:
+        counts = self._per_command.get(name)
+        if counts is None:
+            counts = self._per_command[name] = {"hits": 0, "misses": 0}
+        return counts
+
+    def get(self, name: str, key: str) -> Optional[CommandResult]:
+        """Look up a cached result, recording a hit or miss for the command."""
+        with self._lock:
+            entry = self._entries.get(key) if self.enabled else None
+            if entry is None:
+                self.misses += 1
+                self._counts(name)["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._counts(name)["hits"] += 1
+            return entry[1]
+
+    def set(self, name: str, key: str, result: CommandResult) -> None:
+        """Store a result, evicting the least recently used if full."""
+        if not self.enabled or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (name, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, name: Optional[str] = None) -> int:
+        """Drop cached results for one command, or all of them.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            if name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [k for k, (n, _) in self._entries.items() if n == name]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache size and hit rates, overall and per command."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "commands": {
+                    name: {
+                        **counts,
+                        "hit_ratio": round(
+                            counts["hits"] / (counts["hits"] + counts["misses"]), 4
+                        ),
+                    }
+                    for name, counts in sorted(self._per_command.items())
+                },
+            }
@@ -16,14 +16,27 @@ Example:
     ...     description="Does something useful",
     ...     handler=my_handler,
     ... ))
+
+Every call runs through an ordered middleware chain, whichever entry point
+(CLI, HTTP, MCP) made it:
+
+    timing -> result cache -> deadline -> registered middleware...
+        -> single flight -> handler
+
+Register middleware with ``registry.use()`` (or ``MCPServer.use()``); stock
+middleware for tracing, logging, timeouts and concurrency limits is in
+``afd.core.middleware``.
 """
 
+import asyncio
+import time
 from dataclasses import dataclass, field
 from typing import (
     Any,
     Awaitable,
     Callable,
     Dict,
+    Iterable,
     List,
     Literal,
     Optional,
@@ -32,8 +45,13 @@ from typing import (
     Union,
 )
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
+from afd.core.cache import ResultCache, canonical_input, make_cache_key
+from afd.core.errors import timeout_error
+from afd.core.executors import ExecutionMode, Executors
+from afd.core.limits import ConcurrencyLimits
+from afd.core.metrics import CommandStats
 from afd.core.result import CommandResult
 
 TInput = TypeVar("TInput")
@@ -61,6 +79,10 @@ class CommandParameter:
     enum: Optional[List[Any]] = None
 
 
+# Receives progress events reported by a handler (see CommandContext.report_progress)
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
 @dataclass
 class CommandContext:
     """Context provided to command handlers.
@@ -69,11 +91,76 @@ class CommandContext:
         trace_id: Unique ID for this command invocation.
         timeout: Timeout in milliseconds.
         extra: Additional custom context values.
+        on_progress: Listener for progress events, set by streaming callers.
     """
 
     trace_id: Optional[str] = None
     timeout: Optional[int] = None
     extra: Dict[str, Any] = field(default_factory=dict)
+    on_progress: Optional[ProgressCallback] = None
+
+    def report_progress(
+        self,
+        message: Optional[str] = None,
+        *,
+        current: Optional[float] = None,
+        total: Optional[float] = None,
+        partial: Any = None,
+    ) -> None:
+        """Report progress to the caller, if it is listening.
+
+        Handlers may call this from worker threads; the listener is
+        responsible for handing events back to its event loop.
+
+        Args:
+            message: What the command is doing now.
+            current: Units of work completed.
+            total: Total units of work, if known.
+            partial: Partial results so far (e.g. issues found).
+
+        Example:
+            >>> for i, path in enumerate(files):
+            ...     context.report_progress(f"Parsing {path.name}", current=i, total=len(files))
+        """
+        if self.on_progress is None:
+            return
+        event: Dict[str, Any] = {}
+        if message is not None:
+            event["message"] = message
+        if current is not None:
+            event["current"] = current
+        if total is not None:
+            event["total"] = total
+            if current is not None and total:
+                event["percent"] = round(100 * current / total, 1)
+        if partial is not None:
+            event["partial"] = partial
+        self.on_progress(event)
+
+
+def report_progress(
+    context: Any,
+    message: Optional[str] = None,
+    *,
+    current: Optional[float] = None,
+    total: Optional[float] = None,
+    partial: Any = None,
+) -> None:
+    """Report progress through a handler's context, whatever it is.
+
+    Handlers may be invoked without a context, or with a transport's own
+    context object (e.g. over MCP); this is a no-op unless the context is
+    a CommandContext.
+
+    Args:
+        context: The context the handler received.
+        message: What the command is doing now.
+        current: Units of work completed.
+        total: Total units of work, if known.
+        partial: Partial results so far.
+    """
+    if isinstance(context, CommandContext):
+        context.report_progress(message, current=current, total=total, partial=partial)
 
 
 # Type alias for command handler functions
@@ -99,6 +186,24 @@ class CommandDefinition:
         tags: Tags for additional categorization.
         mutation: Whether this command performs side effects.
         execution_time: Estimated execution time category.
+        fingerprint: For read-only commands, returns a value that changes
+            whenever the data the command reads changes (e.g. file mtimes).
+            Commands with a fingerprint have their results cached.
+        coalesce: Whether identical concurrent calls share one execution.
+            Off unless set; meant for pure reads. Callers listening for
+            progress or passing ``extra`` context always run their own.
+        timeout_ms: Deadline for one execution; CommandContext.timeout
+            overrides it per call. None means no limit.
+        execution: Where the handler runs: "inline" on the event loop,
+            "thread" or "process" in the registry's worker pools (see
+            afd.core.executors).
+        max_concurrency: Most executions of this command that may run at
+            once; further calls queue in arrival order (see
+            afd.core.limits). None means no limit.
+        input_schema: Schema the handler validates its input against. The
+            registry keys cached results and shared calls on the validated
+            input, so equivalent inputs (omitted defaults, explicit nulls)
+            share one entry.
 
     Example:
         >>> async def create_doc(input, context=None):
@@ -133,6 +238,98 @@ class CommandDefinition:
     mutation: bool = False
     execution_time: Optional[Literal["instant", "fast", "slow", "long-running"]] = None
     examples: Optional[List[Dict[str, Any]]] = None
+    fingerprint: Optional[Callable[[Any], Any]] = None
+    coalesce: Optional[bool] = None
+    timeout_ms: Optional[int] = None
+    execution: ExecutionMode = "inline"
+    max_concurrency: Optional[int] = None
+    input_schema: Optional[Any] = None
+
+
+# schema -> TypeAdapter.validate_python, built on first use
+_validators: Dict[Any, Callable[[Any], Any]] = {}
+
+
+def input_validator(schema: Any) -> Callable[[Any], Any]:
+    """Cached validator for an input schema.
+
+    Builds one ``TypeAdapter`` per schema (a Pydantic model, dataclass or
+    TypedDict) and reuses its compiled validator for every call. Instances
+    of the schema pass through unchanged, as with ``model_validate``.
+    """
+    validate = _validators.get(schema)
+    if validate is None:
+        validate = _validators[schema] = TypeAdapter(schema).validate_python
+    return validate
+
+
+@dataclass
+class Invocation:
+    """One command call as it passes through the middleware chain.
+
+    Middleware may replace the input or context before calling the next
+    step; the handler receives whatever reaches the end of the chain.
+
+    Attributes:
+        command: The command being executed.
+        input: The command input.
+        context: The execution context, if any.
+    """
+
+    command: CommandDefinition
+    input: Any
+    context: Optional[CommandContext] = None
+
+    @property
+    def name(self) -> str:
+        return self.command.name
+
+
+# The rest of the chain, as seen by a middleware
+NextStep = Callable[[Invocation], Awaitable[CommandResult[Any]]]
+
+# async def middleware(call: Invocation, call_next: NextStep) -> CommandResult
+Middleware = Callable[[Invocation, NextStep], Awaitable[CommandResult[Any]]]
+
+
+def compose(middleware: Iterable[Middleware], endpoint: NextStep) -> NextStep:
+    """Chain middleware around an endpoint, first middleware outermost.
+
+    Args:
+        middleware: Middleware in the order calls pass through them.
+        endpoint: What the innermost middleware calls.
+
+    Returns:
+        A step that runs a call through the whole chain.
+    """
+    step = endpoint
+    for mw in reversed(list(middleware)):
+        step = _bind(mw, step)
+    return step
+
+
+async def run_with_deadline(
+    call: Invocation, call_next: NextStep, timeout_ms: int
+) -> CommandResult[Any]:
+    """Run the rest of the chain, failing with TIMEOUT after timeout_ms.
+
+    Past the deadline the handler is cancelled; a handler awaiting
+    ``afd.core.run_process`` has its child process killed. Work a handler
+    started in a thread, or blocking code in the handler itself, can't be
+    interrupted.
+    """
+    try:
+        return await asyncio.wait_for(call_next(call), timeout_ms / 1000)
+    except asyncio.TimeoutError:
+        err = timeout_error(call.name, timeout_ms)
+        return CommandResult(success=False, error=err.model_dump(exclude={"cause"}))
+
+
+def _bind(mw: Middleware, call_next: NextStep) -> NextStep:
+    async def step(call: Invocation) -> CommandResult[Any]:
+        return await mw(call, call_next)
+
+    return step
 
 
 class CommandRegistry(Protocol):
@@ -149,6 +346,27 @@ class CommandRegistry(Protocol):
         """
         ...
 
+    def register_lazy(self, names: Iterable[str], loader: Callable[[], None]) -> None:
+        """Declare commands that a loader registers on first use.
+
+        Args:
+            names: Command names the loader provides.
+            loader: Registers those commands (e.g. by importing a module);
+                called at most once, when one of them is first needed.
+        """
+        ...
+
+    def use(self, middleware: Middleware) -> None:
+        """Add middleware to the chain every execution passes through.
+
+        Middleware runs in the order it was added, after the built-in
+        timing, result cache and deadline steps (so cache hits skip it).
+
+        Args:
+            middleware: ``async (call, call_next) -> CommandResult``.
+        """
+        ...
+
     def get(self, name: str) -> Optional[CommandDefinition]:
         """Get a command by name.
 
@@ -172,7 +390,7 @@ class CommandRegistry(Protocol):
         ...
 
     def list(self) -> List[CommandDefinition]:
-        """Get all registered commands.
+        """Get all registered commands, loading any lazy ones.
 
         Returns:
             List of all command definitions.
@@ -209,28 +427,80 @@ class CommandRegistry(Protocol):
         ...
 
 
+class _InFlight:
+    """A command execution shared by concurrent identical calls."""
+
+    def __init__(self, task: "asyncio.Task[CommandResult[Any]]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
 class _CommandRegistryImpl:
     """Default command registry implementation."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: Optional[ResultCache] = None,
+        executors: Optional[Executors] = None,
+        limits: Optional[ConcurrencyLimits] = None,
+    ) -> None:
         self._commands: Dict[str, CommandDefinition] = {}
+        self.cache = cache
+        self.executors = executors or Executors()
+        self.limits = limits or ConcurrencyLimits()
+        self._in_flight: Dict[str, _InFlight] = {}
+        # Calls per command that joined an execution already in flight
+        self.coalesced: Dict[str, int] = {}
+        self.stats = CommandStats()
+        # Commands each task is running (innermost last), for LoopMonitor
+        self._running: Dict[Any, List[str]] = {}
+        # Declared but not yet registered commands -> loader that registers them
+        self._lazy: Dict[str, Callable[[], None]] = {}
+        self._middleware: List[Middleware] = []
+        self._chain: Optional[NextStep] = None
 
     def register(self, command: CommandDefinition) -> None:
         if command.name in self._commands:
             raise ValueError(f"Command '{command.name}' is already registered")
         self._commands[command.name] = command
+        self._lazy.pop(command.name, None)
+
+    def register_lazy(self, names: Iterable[str], loader: Callable[[], None]) -> None:
+        for name in names:
+            if name not in self._commands:
+                self._lazy[name] = loader
+
+    def use(self, middleware: Middleware) -> None:
+        self._middleware.append(middleware)
+        self._chain = None
+
+    @property
+    def middleware(self) -> List[Middleware]:
+        """Registered middleware, outermost first."""
+        return list(self._middleware)
+
+    def _load(self, name: str) -> Optional[CommandDefinition]:
+        loader = self._lazy.pop(name, None)
+        if loader is not None:
+            loader()
+            # Anything the loader was expected to provide but didn't is stale
+            for stale in [n for n, fn in self._lazy.items() if fn is loader]:
+                del self._lazy[stale]
+        return self._commands.get(name)
 
     def get(self, name: str) -> Optional[CommandDefinition]:
-        return self._commands.get(name)
+        return self._commands.get(name) or self._load(name)
 
     def has(self, name: str) -> bool:
-        return name in self._commands
+        return self.get(name) is not None
 
     def list(self) -> List[CommandDefinition]:
+        while self._lazy:
+            self._load(next(iter(self._lazy)))
         return list(self._commands.values())
 
     def list_by_category(self, category: str) -> List[CommandDefinition]:
-        return [cmd for cmd in self._commands.values() if cmd.category == category]
+        return [cmd for cmd in self.list() if cmd.category == category]
 
     async def execute(
         self,
@@ -238,7 +508,7 @@ class _CommandRegistryImpl:
         input: Any,
         context: Optional[CommandContext] = None,
     ) -> CommandResult[Any]:
-        command = self._commands.get(name)
+        command = self.get(name)
         from afd.core.result import CommandError as CmdError
 
         if not command:
@@ -251,9 +521,107 @@ class _CommandRegistryImpl:
                 ),
             )
 
+        if self._chain is None:
+            self._chain = compose(
+                [self._timed, self._cached, self._deadline, *self._middleware],
+                self._coalesced,
+            )
+        return await self._chain(Invocation(command, input, context))
+
+    async def _timed(self, call: Invocation, call_next: NextStep) -> CommandResult[Any]:
+        """Record latency as the caller saw it, cache hits and shared calls included."""
+        start = time.perf_counter()
+        result = await call_next(call)
+        self.stats.record(
+            call.name, (time.perf_counter() - start) * 1000, success=result.success
+        )
+        return result
+
+    async def _cached(
+        self, call: Invocation, call_next: NextStep
+    ) -> CommandResult[Any]:
+        """Serve from the result cache, or run and cache a success."""
+        # Keyed on the fingerprint from before the run, so a change made
+        # while it runs still invalidates the result
+        cache_key = self._cache_key(call.command, call.input)
+        if cache_key is None:
+            return await call_next(call)
+        cached = self.cache.get(call.name, cache_key)
+        if cached is not None:
+            return cached
+        result = await call_next(call)
+        if result.success:
+            self.cache.set(call.name, cache_key, result)
+        return result
+
+    async def _deadline(
+        self, call: Invocation, call_next: NextStep
+    ) -> CommandResult[Any]:
+        """Enforce the call's timeout, or else the command's timeout_ms."""
+        timeout_ms = getattr(call.context, "timeout", None) or call.command.timeout_ms
+        if not timeout_ms:
+            return await call_next(call)
+        return await run_with_deadline(call, call_next, timeout_ms)
+
+    async def _coalesced(self, call: Invocation) -> CommandResult[Any]:
+        """Join an identical call in flight, or run."""
+        command, input, context = call.command, call.input, call.context
+        name = command.name
+        # A joined caller's context never reaches the handler, so callers
+        # that need theirs (progress listeners, extra values) run alone
+        if not command.coalesce or (
+            getattr(context, "on_progress", None) or getattr(context, "extra", None)
+        ):
+            return await self._run(command, input, context)
+
+        # Single flight: identical concurrent calls share one execution.
+        # The first caller's context is the one the handler sees.
+        flight_key = make_cache_key(name, self._key_input(command, input), None)
+        flight = self._in_flight.get(flight_key)
+        if flight is None:
+            task = asyncio.ensure_future(self._run(command, input, context))
+            flight = self._in_flight[flight_key] = _InFlight(task)
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        else:
+            self.coalesced[name] = self.coalesced.get(name, 0) + 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            # Only abandon the work once every caller has gone away
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    async def _run(
+        self,
+        command: CommandDefinition,
+        input: Any,
+        context: Optional[CommandContext],
+    ) -> CommandResult[Any]:
+        # Wait for a slot under any concurrency limit before counting as running
+        gates = self.limits.gates_for(command)
+        if gates:
+            async with self.limits.slots(command, gates):
+                return await self._invoke(command, input, context)
+        return await self._invoke(command, input, context)
+
+    async def _invoke(
+        self,
+        command: CommandDefinition,
+        input: Any,
+        context: Optional[CommandContext],
+    ) -> CommandResult[Any]:
+        from afd.core.result import CommandError as CmdError
+
+        task = asyncio.current_task()
+        running = self._running.setdefault(task, [])
+        running.append(command.name)
         try:
-            result = await command.handler(input, context)
-            return result
+            return await self.executors.run(
+                command.name, command.handler, input, context, command.execution
+            )
         except Exception as e:
             return CommandResult(
                 success=False,
@@ -263,11 +631,61 @@ class _CommandRegistryImpl:
                     suggestion="Check the input parameters and try again",
                 ),
             )
+        finally:
+            running.pop()
+            if not running:
+                self._running.pop(task, None)
 
+    def command_for_task(self, task: Any) -> Optional[str]:
+        """Command the given asyncio task is executing, if any.
 
-def create_command_registry() -> CommandRegistry:
+        Safe to call from another thread (LoopMonitor's watchdog).
+        """
+        try:
+            return self._running[task][-1]
+        except (KeyError, IndexError):
+            return None
+
+    def _cache_key(self, command: CommandDefinition, input: Any) -> Optional[str]:
+        """Cache key for this call, or None if it must not be cached."""
+        if self.cache is None or command.mutation or command.fingerprint is None:
+            return None
+        key_input = self._key_input(command, input)
+        try:
+            fingerprint = command.fingerprint(key_input)
+        except Exception:
+            # A broken fingerprint must never break the command itself
+            return None
+        return make_cache_key(command.name, key_input, fingerprint)
+
+    @staticmethod
+    def _key_input(command: CommandDefinition, input: Any) -> Any:
+        """The input as the handler will see it, as plain data.
+
+        Validating first means inputs that differ only in omitted defaults
+        or explicit nulls produce the same cache and flight keys.
+        """
+        if command.input_schema is not None and input is not None:
+            try:
+                input = input_validator(command.input_schema)(input)
+            except Exception:
+                # Invalid input: the handler reports it; key on the raw form
+                pass
+        return canonical_input(input)
+
+
+def create_command_registry(
+    cache: Optional[ResultCache] = None,
+    executors: Optional[Executors] = None,
+    limits: Optional[ConcurrencyLimits] = None,
+) -> CommandRegistry:
     """Create a new command registry.
 
+    Args:
+        cache: Result cache for commands that declare a fingerprint.
+        executors: Worker pools for thread and process commands.
+        limits: Per-command and per-tag concurrency limits.
+
     Returns:
         A CommandRegistry instance for registering and executing commands.
 
@@ -276,7 +694,7 @@ def create_command_registry() -> CommandRegistry:
         >>> registry.register(my_command)
         >>> result = await registry.execute("my.command", {"arg": "value"})
     """
-    return _CommandRegistryImpl()
+    return _CommandRegistryImpl(cache, executors, limits)
 
 
 def command_to_mcp_tool(command: CommandDefinition) -> dict[str, Any]:
@@ -0,0 +1,204 @@
+"""Worker pools for commands that do blocking or CPU-bound work.
+
+Most handlers are ``async def`` but many do purely synchronous work -
+parsing every Lua file in an addon, scanning docs - which blocks the
+event loop and every other command, stream and broadcast behind it.
+Commands declare where they should run:
+
+- ``inline`` (default): on the event loop, for handlers that await I/O.
+- ``thread``: in a thread pool, for blocking I/O and work that releases
+  the GIL; the handler runs on a private event loop in the worker.
+- ``process``: in a process pool, for CPU-bound work that should use
+  more than one core. The worker process looks the command up by name on
+  its own copy of the server (see ``server_ref``), so input and result
+  must be picklable, and the handler gets no context (no progress
+  reporting).
+
+Example:
+    >>> @server.command(name="addon.complexity", ..., execution="process")
+    ... async def analyze(input, context=None):
+    ...     return success(compute_metrics(input.addon))
+    >>>
+    >>> server.executors.configure(
+    ...     process_workers=4, server_ref="myapp.commands:get_server"
+    ... )
+"""
+
+import asyncio
+import importlib
+import os
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor
+from typing import Any, Dict, Literal, Optional
+
+from afd.core.result import CommandResult, error
+
+ExecutionMode = Literal["inline", "thread", "process"]
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+class Executors:
+    """Thread and process pools that registries run offloaded handlers in.
+
+    Pools are created on first use and sized from the configured worker
+    counts (None picks the concurrent.futures defaults).
+
+    Attributes:
+        thread_workers: Maximum threads for ``thread`` commands.
+        process_workers: Maximum processes for ``process`` commands.
+        server_ref: ``"module:attribute"`` naming the server (or a
+            function returning it) in a fresh interpreter. Without it,
+            ``process`` commands run in the thread pool instead.
+    """
+
+    def __init__(
+        self,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        server_ref: Optional[str] = None,
+    ):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.server_ref = server_ref
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[Executor] = None
+        self.completed: Dict[str, int] = {"inline": 0, "thread": 0, "process": 0}
+
+    def configure(
+        self,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        server_ref: Optional[str] = None,
+    ) -> None:
+        """Change pool sizes or the server reference.
+
+        Pools already running are shut down (without waiting) and
+        recreated with the new sizes on next use.
+        """
+        if thread_workers is not None:
+            self.thread_workers = thread_workers
+        if process_workers is not None:
+            self.process_workers = process_workers
+        if server_ref is not None:
+            self.server_ref = server_ref
+        self.shutdown(wait=False)
+
+    def mode_for(self, mode: ExecutionMode) -> ExecutionMode:
+        """Where a command declaring ``mode`` will actually run."""
+        if mode == "process" and not self.server_ref:
+            return "thread"
+        return mode
+
+    async def run(
+        self, name: str, handler: Any, input: Any, context: Any, mode: ExecutionMode
+    ) -> CommandResult[Any]:
+        """Run a handler in the pool for its execution mode."""
+        mode = self.mode_for(mode)
+        if mode == "inline":
+            result = await handler(input, context)
+        elif mode == "thread":
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._thread_pool(), _run_in_thread, handler, input, context
+            )
+        else:
+            result = await self._run_in_process(name, input)
+        self.completed[mode] += 1
+        return result
+
+    async def _run_in_process(self, name: str, input: Any) -> CommandResult[Any]:
+        from afd.core.cache import canonical_input
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._process_pool(),
+                _run_in_process,
+                self.server_ref,
+                name,
+                canonical_input(input),
+            )
+        except BrokenExecutor as e:
+            # A worker died (crash, OOM kill); start a fresh pool next time
+            self._processes = None
+            return error(
+                "COMMAND_EXECUTION_ERROR",
+                f"Worker process for '{name}' exited unexpectedly: {e}",
+                suggestion="Try again; if it keeps failing run the command with execution='thread'",
+                retryable=True,
+            )
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix="afd-command"
+            )
+        return self._threads
+
+    def _process_pool(self) -> Executor:
+        if self._processes is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn everywhere: forking a process with a running event loop
+            # and worker threads is unsafe, and Windows can only spawn
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._processes
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pools; running handlers finish first when ``wait``."""
+        threads, self._threads = self._threads, None
+        processes, self._processes = self._processes, None
+        if threads is not None:
+            threads.shutdown(wait=wait)
+        if processes is not None:
+            processes.shutdown(wait=wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool sizes and executions completed per mode."""
+        return {
+            "thread_workers": self.thread_workers or min(32, (os.cpu_count() or 1) + 4),
+            "process_workers": self.process_workers or os.cpu_count() or 1,
+            "process_enabled": bool(self.server_ref),
+            "threads_started": self._threads is not None,
+            "processes_started": self._processes is not None,
+            "completed": dict(self.completed),
+        }
+
+
+def _run_in_thread(handler: Any, input: Any, context: Any) -> CommandResult[Any]:
+    """Run an async handler to completion on a worker thread's own loop."""
+    return asyncio.run(handler(input, context))
+
+
+# server_ref -> server, per worker process
+_servers: Dict[str, Any] = {}
+
+
+def resolve_server(server_ref: str) -> Any:
+    """Import the server named by ``"module:attribute"``.
+
+    The attribute may be the server itself or a function returning it.
+    """
+    server = _servers.get(server_ref)
+    if server is None:
+        module_name, _, attribute = server_ref.partition(":")
+        server = getattr(importlib.import_module(module_name), attribute)
+        if not hasattr(server, "registry"):
+            server = server()
+        _servers[server_ref] = server
+    return server
+
+
+def _run_in_process(server_ref: str, name: str, input: Any) -> CommandResult[Any]:
+    """Worker-process entry point: run one handler directly, no middleware."""
+    command = resolve_server(server_ref).registry.get(name)
+    if command is None:
+        return error(
+            "COMMAND_NOT_FOUND",
+            f"Command '{name}' not found in worker process ({server_ref})",
+        )
+    return asyncio.run(command.handler(input, None))
@@ -0,0 +1,231 @@
+"""Per-command and per-tag concurrency limits with first-come, first-served queues.
+
+Subprocess-heavy commands (linting, tests, formatting) can be fired at
+the same time by several agents and the dashboard; running them all at
+once oversubscribes the CPU and the disk. A command can declare
+``max_concurrency``, and a tag can be given a limit shared by every
+command carrying it. Calls beyond a limit wait in a FIFO queue - nobody
+is rejected, and nobody who arrived later overtakes them.
+
+Only real executions take a slot: identical calls that join one already
+in flight (single flight) and cache hits don't. Time spent queued counts
+toward the command's deadline. A command called from within another
+that already holds a gate doesn't queue on that gate again, so nested
+calls can't deadlock.
+
+Example:
+    >>> @server.command(name="addon.test", ..., tags=["subprocess"],
+    ...                 max_concurrency=2)
+    ... async def run_tests(input, context=None): ...
+    >>>
+    >>> server.limits.set_tag_limit("subprocess", 4)
+    >>> server.limits.snapshot()["tag:subprocess"]["waiting"]
+    0
+"""
+
+import asyncio
+import contextvars
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, FrozenSet, List, Optional
+
+from afd.core.metrics import Histogram
+
+# Gates held by the current call chain, so nested calls don't queue twice
+_held: contextvars.ContextVar[FrozenSet[str]] = contextvars.ContextVar(
+    "afd_held_gates", default=frozenset()
+)
+
+
+class FairSemaphore:
+    """A semaphore that grants slots strictly in arrival order.
+
+    A released slot is handed directly to the longest waiter, so a caller
+    arriving while others queue always joins the back of the line.
+    Bound to the event loop it is used on.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.running = 0
+        self._waiters: Deque["asyncio.Future[bool]"] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Callers queued for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot.
+
+        Args:
+            timeout: Give up after this many seconds; None waits indefinitely.
+
+        Returns:
+            True once a slot is held; False if none came free in time.
+        """
+        if self.running < self.limit and not self._waiters:
+            self.running += 1
+            return True
+        loop = asyncio.get_running_loop()
+        waiter: "asyncio.Future[bool]" = loop.create_future()
+        self._waiters.append(waiter)
+
+        # Expiry resolves the waiter rather than cancelling the wait, so a
+        # slot handed over at the same moment is never lost
+        def expire() -> None:
+            if not waiter.done():
+                waiter.set_result(False)
+
+        timer = loop.call_later(timeout, expire) if timeout is not None else None
+        try:
+            granted = await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                # Handed a slot just as we were cancelled: pass it on
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if not granted:
+            self._discard(waiter)
+        return granted
+
+    def release(self) -> None:
+        """Give the slot to the next waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.running -= 1
+
+    def _discard(self, waiter: "asyncio.Future[bool]") -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class _Gate:
+    """One limit (a command or a tag) and its queueing statistics."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        # One semaphore per event loop; CLI shells and tests run several
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, FairSemaphore]" = weakref.WeakKeyDictionary()
+        self.queued = 0
+        self.peak_waiting = 0
+        self.wait = Histogram()
+
+    def semaphore(self) -> FairSemaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = FairSemaphore(self.limit)
+        return semaphore
+
+    async def acquire(self, semaphore: FairSemaphore) -> None:
+        if semaphore.running < semaphore.limit and not semaphore.waiting:
+            await semaphore.acquire()
+            return
+        self.queued += 1
+        self.peak_waiting = max(self.peak_waiting, semaphore.waiting + 1)
+        start = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.wait.observe((time.perf_counter() - start) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        semaphores = list(self._semaphores.values())
+        return {
+            "limit": self.limit,
+            "running": sum(s.running for s in semaphores),
+            "waiting": sum(s.waiting for s in semaphores),
+            "peak_waiting": self.peak_waiting,
+            "queued": self.queued,
+            "wait_ms": self.wait.snapshot(),
+        }
+
+
+class ConcurrencyLimits:
+    """The concurrency gates a registry applies before running a handler.
+
+    Command limits come from each command's ``max_concurrency``; tag
+    limits are set here and apply to every command with that tag. A call
+    must get a slot from every gate that applies to it, taken in a fixed
+    order.
+
+    Attributes:
+        tags: Tag -> maximum concurrent executions across its commands.
+    """
+
+    def __init__(self, tags: Optional[Dict[str, int]] = None):
+        self.tags: Dict[str, int] = {}
+        self._gates: Dict[str, _Gate] = {}
+        for tag, limit in (tags or {}).items():
+            self.set_tag_limit(tag, limit)
+
+    def set_tag_limit(self, tag: str, limit: Optional[int]) -> None:
+        """Limit concurrent executions of commands tagged ``tag``.
+
+        None removes the limit. Executions already running keep the slot
+        they hold; new calls queue against the new limit.
+        """
+        self._gates.pop(f"tag:{tag}", None)
+        if limit is None:
+            self.tags.pop(tag, None)
+            return
+        if limit < 1:
+            raise ValueError(f"Tag '{tag}': limit must be at least 1")
+        self.tags[tag] = limit
+
+    def gates_for(self, command: Any) -> List[str]:
+        """Keys of the gates a command's executions pass through."""
+        keys = [f"tag:{tag}" for tag in command.tags or () if tag in self.tags]
+        if command.max_concurrency:
+            keys.append(f"command:{command.name}")
+        return sorted(keys)
+
+    def _gate(self, key: str, command: Any) -> _Gate:
+        gate = self._gates.get(key)
+        if gate is None:
+            kind, _, name = key.partition(":")
+            limit = self.tags[name] if kind == "tag" else command.max_concurrency
+            gate = self._gates[key] = _Gate(limit)
+        return gate
+
+    @asynccontextmanager
+    async def slots(self, command: Any, keys: List[str]) -> AsyncIterator[None]:
+        """Hold a slot in each of ``keys`` (from gates_for) while running."""
+        held = _held.get()
+        acquired: List[FairSemaphore] = []
+        try:
+            # Sorted keys, so two calls never wait on each other's gates
+            for key in keys:
+                if key in held:
+                    continue
+                gate = self._gate(key, command)
+                semaphore = gate.semaphore()
+                await gate.acquire(semaphore)
+                acquired.append(semaphore)
+            token = _held.set(held.union(keys))
+            try:
+                yield
+            finally:
+                _held.reset(token)
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Limit, running, queue depth and wait times for each gate used."""
+        return {key: gate.snapshot() for key, gate in sorted(self._gates.items())}
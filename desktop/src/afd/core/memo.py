@@ -0,0 +1,298 @@
+"""Memoization that invalidates itself when the files it read change.
+
+Loaders such as "parse every APIDefs file" or "read the FenCore catalog
+out of SavedVariables" are pure functions of their arguments and of some
+files on disk. ``@memoize`` caches their return value and records which
+files the computation read - through ``tracked_open``,
+``tracked_read_text``/``tracked_read_bytes``, or ``track_path`` for
+files it only checked or directories it listed. Before a cached value
+is reused, each recorded path is stat'ed; if any changed (or appeared,
+or disappeared), the function runs again.
+
+Memoized functions calling each other pass their dependencies up: an
+outer function is invalidated by any file an inner one read, even when
+the inner call was itself a cache hit.
+
+Example:
+    >>> from afd.core.memo import memoize, track_path, tracked_read_text
+    >>>
+    >>> @memoize(max_entries=32)
+    ... def parse_toc(path):
+    ...     return parse(tracked_read_text(path))
+    >>>
+    >>> @memoize(key=lambda: str(get_apidefs_path()))
+    ... def load_all_apis():
+    ...     root = get_apidefs_path()
+    ...     track_path(root)  # files added or removed
+    ...     return {name: ... for f in root.glob("*.lua")
+    ...             for name in parse(tracked_read_text(f))}
+    >>>
+    >>> parse_toc.stats()["hits"]
+"""
+
+import contextvars
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+PathLike = Union[str, "os.PathLike[str]"]
+CheckMode = Literal["mtime", "hash"]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# (mtime_ns, size) at the time of reading; (0, -1) for a missing path
+_Stat = Tuple[int, int]
+
+# Paths read by the memoized computation running in this context
+_reads: contextvars.ContextVar[Optional[Dict[str, _Stat]]] = contextvars.ContextVar(
+    "afd_memo_reads", default=None
+)
+
+# Every memoized function, by qualified name, for memo_stats()
+_registry: Dict[str, "Memoized"] = {}
+
+
+def _stat(path: str) -> _Stat:
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (0, -1)
+
+
+def _digest(path: str) -> Optional[bytes]:
+    """Content hash of a file; None for directories and missing files."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).digest()
+    except OSError:
+        return None
+
+
+def track_path(*paths: PathLike) -> None:
+    """Record paths the current memoized computation depends on.
+
+    Use it for files the function only checks for (so creating them
+    invalidates the result) and for directories it lists (their mtime
+    changes when entries are added or removed). Does nothing outside a
+    memoized function.
+    """
+    reads = _reads.get()
+    if reads is None:
+        return
+    for path in paths:
+        path = os.fspath(path)
+        if path not in reads:
+            # Stat before the caller reads, so a change mid-read is caught
+            reads[path] = _stat(path)
+
+
+def tracked_open(path: PathLike, mode: str = "r", **kwargs: Any) -> IO[Any]:
+    """``open()`` that records the file as a dependency (read modes only)."""
+    track_path(path)
+    return open(path, mode, **kwargs)
+
+
+def tracked_read_text(
+    path: PathLike, encoding: str = "utf-8", errors: Optional[str] = None
+) -> str:
+    """``Path.read_text()`` that records the file as a dependency."""
+    with tracked_open(path, encoding=encoding, errors=errors) as f:
+        return f.read()
+
+
+def tracked_read_bytes(path: PathLike) -> bytes:
+    """``Path.read_bytes()`` that records the file as a dependency."""
+    with tracked_open(path, "rb") as f:
+        return f.read()
+
+
+class _Entry:
+    __slots__ = ("value", "deps", "digests")
+
+    def __init__(self, value: Any, deps: Dict[str, _Stat]):
+        self.value = value
+        self.deps = deps
+        self.digests: Optional[Dict[str, Optional[bytes]]] = None
+
+
+class Memoized:
+    """A memoized function; call it like the original.
+
+    Attributes:
+        max_entries: Cached argument combinations kept (least recently
+            used evicted first).
+        check: "mtime" re-runs when a dependency's mtime or size changes;
+            "hash" also compares content when they do, so rewriting a
+            file with the same bytes (a checkout, a touch) keeps the
+            cached value.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        max_entries: int = 128,
+        key: Optional[Callable[..., Hashable]] = None,
+        check: CheckMode = "mtime",
+    ):
+        if check not in ("mtime", "hash"):
+            raise ValueError("check must be 'mtime' or 'hash'")
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.max_entries = max_entries
+        self.check = check
+        self._key = key
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        _registry[f"{func.__module__}.{func.__qualname__}"] = self
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            key = (
+                self._key(*args, **kwargs)
+                if self._key
+                else (args, tuple(sorted(kwargs.items())))
+            )
+            hash(key)
+        except TypeError:
+            # Unhashable arguments: can't cache, but still report reads
+            return self.func(*args, **kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            if self._fresh(entry):
+                with self._lock:
+                    self.hits += 1
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                _pass_up(entry.deps)
+                return entry.value
+            with self._lock:
+                self.invalidations += 1
+                self._entries.pop(key, None)
+
+        deps: Dict[str, _Stat] = {}
+        token = _reads.set(deps)
+        try:
+            value = self.func(*args, **kwargs)
+        finally:
+            _reads.reset(token)
+
+        entry = _Entry(value, deps)
+        if self.check == "hash":
+            # A file that changed since it was read gets no digest, so the
+            # next call re-runs rather than trusting content it never saw
+            entry.digests = {
+                path: _digest(path) if _stat(path) == seen else None
+                for path, seen in deps.items()
+            }
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        _pass_up(deps)
+        return value
+
+    def _fresh(self, entry: _Entry) -> bool:
+        for path, seen in entry.deps.items():
+            current = _stat(path)
+            if current == seen:
+                continue
+            digest = entry.digests.get(path) if entry.digests else None
+            if digest is None or _digest(path) != digest:
+                return False
+            # Same content, new mtime: remember it so the next check is a stat
+            entry.deps[path] = current
+        return True
+
+    def clear(self) -> int:
+        """Drop every cached value; returns how many there were."""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, hits, misses, invalidations and evictions."""
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / calls, 4) if calls else 0.0,
+                "files": sum(len(e.deps) for e in self._entries.values()),
+            }
+
+
+def _pass_up(deps: Dict[str, _Stat]) -> None:
+    """Add an inner memoized call's dependencies to the enclosing one."""
+    outer = _reads.get()
+    if outer is not None:
+        for path, seen in deps.items():
+            outer.setdefault(path, seen)
+
+
+def memoize(
+    func: Optional[F] = None,
+    *,
+    max_entries: int = 128,
+    key: Optional[Callable[..., Hashable]] = None,
+    check: CheckMode = "mtime",
+) -> Any:
+    """Cache a function's results until the files it read change.
+
+    Usable bare (``@memoize``) or with options. Results are shared between
+    callers, so treat them as read-only.
+
+    Args:
+        max_entries: Argument combinations to keep (LRU).
+        key: Builds the cache key from the call's arguments. Defaults to
+            the arguments themselves; supply one when the result also
+            depends on something that isn't an argument (e.g. a
+            configured path), or when arguments aren't hashable.
+        check: "mtime" (default) or "hash"; see ``Memoized``.
+
+    Returns:
+        A ``Memoized`` wrapper with ``stats()`` and ``clear()``.
+    """
+
+    def decorator(f: F) -> Memoized:
+        return Memoized(f, max_entries=max_entries, key=key, check=check)
+
+    return decorator(func) if func is not None else decorator
+
+
+def memo_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics for every memoized function, by qualified name."""
+    return {name: memo.stats() for name, memo in sorted(_registry.items())}
+
+
+def clear_memos() -> int:
+    """Clear every memoized function; returns the entries dropped."""
+    return sum(memo.clear() for memo in _registry.values())
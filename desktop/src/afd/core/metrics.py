@@ -0,0 +1,307 @@
+"""Lightweight metric primitives for AFD applications.
+
+Histograms use fixed, cumulative buckets (the same model Prometheus uses),
+so they are cheap to update on hot paths and can be exported as-is with
+PrometheusWriter.
+
+Example:
+    >>> from afd.core.metrics import Histogram
+    >>>
+    >>> latency = Histogram()
+    >>> latency.observe(12.5)
+    >>> latency.snapshot()["count"]
+    1
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+# Bucket upper bounds in milliseconds, tuned for command and I/O latencies
+DEFAULT_LATENCY_BUCKETS_MS: Sequence[float] = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with running count, sum, min and max.
+
+    Percentiles are estimated by linear interpolation inside the bucket
+    that contains the requested rank, which is accurate enough to spot
+    regressions without keeping every sample.
+
+    Attributes:
+        buckets: Sorted bucket upper bounds (an implicit +Inf bucket follows).
+        count: Number of observations.
+        sum: Sum of all observed values.
+        min: Smallest observed value, or None if empty.
+        max: Largest observed value, or None if empty.
+
+    Example:
+        >>> h = Histogram(buckets=(10, 100))
+        >>> for v in (5, 50, 500):
+        ...     h.observe(v)
+        >>> h.count
+        3
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets: List[float] = sorted(float(b) for b in buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all observations."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.min: Optional[float] = None
+            self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """Record a single observation.
+
+        Args:
+            value: The observed value (milliseconds for latency histograms).
+        """
+        with self._lock:
+            index = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate the value at quantile q (0-1).
+
+        Args:
+            q: Quantile to estimate, e.g. 0.95 for p95.
+
+        Returns:
+            The estimated value, or None if nothing was observed.
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            seen = 0
+            lower = 0.0
+            for i, bucket_count in enumerate(self._counts):
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                if bucket_count and seen + bucket_count >= rank:
+                    fraction = (rank - seen) / bucket_count
+                    estimate = lower + (upper - lower) * fraction
+                    # Never report outside the observed range
+                    return max(self.min, min(self.max, estimate))
+                seen += bucket_count
+                if i < len(self.buckets):
+                    lower = self.buckets[i]
+            return self.max
+
+    def cumulative_buckets(self) -> List[tuple]:
+        """Return (upper_bound, cumulative_count) pairs, ending with +Inf."""
+        with self._lock:
+            pairs = []
+            running = 0
+            for bound, bucket_count in zip(self.buckets + [float("inf")], self._counts):
+                running += bucket_count
+                pairs.append((bound, running))
+            return pairs
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the histogram.
+
+        Returns:
+            Dict with count, sum, mean, min, max, p50, p95 and p99.
+        """
+        mean = self.sum / self.count if self.count else None
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": _round(mean),
+            "min": _round(self.min),
+            "max": _round(self.max),
+            "p50": _round(self.percentile(0.50)),
+            "p95": _round(self.percentile(0.95)),
+            "p99": _round(self.percentile(0.99)),
+        }
+
+
+class CommandStats:
+    """Per-command call counts, error counts and latency histograms.
+
+    The command registry records every execution here, including results
+    served from the cache or shared with a concurrent identical call, so
+    latencies are what callers actually waited.
+
+    Example:
+        >>> stats = CommandStats()
+        >>> stats.record("addon.lint", 12.5, success=False)
+        >>> stats.snapshot()["addon.lint"]["errors"]
+        1
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latency: Dict[str, Histogram] = {}
+
+    def record(self, name: str, duration_ms: float, success: bool) -> None:
+        """Record one execution of a command."""
+        with self._lock:
+            histogram = self.latency.get(name)
+            if histogram is None:
+                histogram = self.latency[name] = Histogram()
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if not success:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        histogram.observe(duration_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Calls, errors and latency summary per command, sorted by name."""
+        with self._lock:
+            names = sorted(self.calls)
+        return {
+            name: {
+                "calls": self.calls[name],
+                "errors": self.errors.get(name, 0),
+                "latency_ms": self.latency[name].snapshot(),
+            }
+            for name in names
+        }
+
+
+class PrometheusWriter:
+    """Builds a Prometheus text exposition (format version 0.0.4).
+
+    Each metric family gets its HELP and TYPE lines on first use; all
+    samples of one family must be written together, before the next
+    family starts.
+
+    Example:
+        >>> out = PrometheusWriter()
+        >>> out.counter("app_requests_total", "Requests served", 3)
+        >>> out.histogram("app_latency_seconds", "Latency", latency)
+        >>> out.render()
+        '# HELP app_requests_total Requests served\\n...'
+    """
+
+    # Content-Type for the text exposition format
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._lines: List[str] = []
+        self._families: set = set()
+
+    def _family(self, name: str, kind: str, help: str) -> None:
+        if name not in self._families:
+            self._families.add(name)
+            self._lines.append(f"# HELP {name} {_escape_help(help)}")
+            self._lines.append(f"# TYPE {name} {kind}")
+
+    def _sample(
+        self, name: str, value: float, labels: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def counter(
+        self,
+        name: str,
+        help: str,
+        value: float,
+        labels: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Write a counter sample (name should end in ``_total``)."""
+        self._family(name, "counter", help)
+        self._sample(name, value, labels)
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        value: float,
+        labels: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Write a gauge sample."""
+        self._family(name, "gauge", help)
+        self._sample(name, value, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        histogram: Histogram,
+        labels: Optional[Dict[str, Any]] = None,
+        scale: float = 0.001,
+    ) -> None:
+        """Write a histogram's buckets, sum and count.
+
+        Args:
+            scale: Multiplier applied to bucket bounds and the sum. The
+                default converts millisecond histograms to the seconds
+                Prometheus expects; use 1 for unitless histograms.
+        """
+        self._family(name, "histogram", help)
+        labels = labels or {}
+        buckets = histogram.cumulative_buckets()
+        for bound, count in buckets:
+            le = "+Inf" if math.isinf(bound) else _format_value(bound * scale)
+            self._sample(f"{name}_bucket", count, {**labels, "le": le})
+        self._sample(f"{name}_sum", histogram.sum * scale, labels)
+        self._sample(f"{name}_count", buckets[-1][1], labels)
+
+    def render(self) -> str:
+        """The exposition text, ending with a newline."""
+        return "\n".join(self._lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Optional[Dict[str, Any]]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(round(float(value), 9))
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
@@ -0,0 +1,209 @@
+"""Stock middleware for the command execution chain.
+
+Middleware wraps every command execution, whichever entry point (CLI,
+HTTP, MCP) made the call. Timing and result caching are built into the
+registry; these cover the rest:
+
+- TracingMiddleware: trace ids and a span per execution, nested calls linked
+- LoggingMiddleware: one log line per execution, warnings for slow calls
+- TimeoutMiddleware: a default deadline for commands without timeout_ms
+- ConcurrencyLimitMiddleware: cap how many commands run at once
+
+Example:
+    >>> from afd.core.middleware import LoggingMiddleware, TimeoutMiddleware
+    >>>
+    >>> server.use(LoggingMiddleware(slow_ms=500))
+    >>> server.use(TimeoutMiddleware(default_ms=30_000))
+    >>>
+    >>> @server.use
+    ... async def tag_source(call, call_next):
+    ...     result = await call_next(call)
+    ...     ...
+    ...     return result
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+import weakref
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from afd.core.commands import (
+    CommandContext,
+    Invocation,
+    NextStep,
+    run_with_deadline,
+)
+from afd.core.errors import ErrorCodes
+from afd.core.limits import FairSemaphore
+from afd.core.result import CommandResult, error
+
+# Spans kept by TracingMiddleware
+DEFAULT_MAX_SPANS = 500
+
+# Trace id of the execution running in the current task, for nested calls
+_current_trace: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "afd_current_trace", default=None
+)
+
+
+def _new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class TracingMiddleware:
+    """Gives every execution a trace id and records a span for it.
+
+    Calls without a context get one, so handlers can read
+    ``context.trace_id``. Commands executed from inside another command
+    (e.g. the steps of a batch) record the outer call as their parent.
+
+    Attributes:
+        spans: Most recent spans, oldest first.
+    """
+
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS):
+        self.spans: "deque[Dict[str, Any]]" = deque(maxlen=max_spans)
+
+    async def __call__(
+        self, call: Invocation, call_next: NextStep
+    ) -> CommandResult[Any]:
+        if call.context is None:
+            call.context = CommandContext()
+        if call.context.trace_id is None:
+            call.context.trace_id = _new_trace_id()
+
+        span = {
+            "trace_id": call.context.trace_id,
+            "parent_id": _current_trace.get(),
+            "command": call.name,
+            "started_at": time.time(),
+        }
+        token = _current_trace.set(call.context.trace_id)
+        start = time.perf_counter()
+        try:
+            result = await call_next(call)
+        finally:
+            _current_trace.reset(token)
+            span["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self.spans.append(span)
+        span["success"] = result.success
+        if result.error is not None:
+            span["error"] = result.error.code
+        return result
+
+    def trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans of one call and everything it executed, outermost first."""
+        ids = {trace_id}
+        found = []
+        # Children finish (and are appended) before their parents
+        for span in reversed(self.spans):
+            if span["trace_id"] in ids or span["parent_id"] in ids:
+                ids.add(span["trace_id"])
+                found.append(span)
+        return found
+
+
+class LoggingMiddleware:
+    """Logs each execution's outcome and duration.
+
+    Successes are logged at ``level``; failures, and calls slower than
+    ``slow_ms``, as warnings.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.DEBUG,
+        slow_ms: Optional[float] = None,
+    ):
+        self.logger = logger or logging.getLogger("afd.commands")
+        self.level = level
+        self.slow_ms = slow_ms
+
+    async def __call__(
+        self, call: Invocation, call_next: NextStep
+    ) -> CommandResult[Any]:
+        start = time.perf_counter()
+        result = await call_next(call)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not result.success:
+            code = result.error.code if result.error else "UNKNOWN"
+            self.logger.warning("%s failed in %.1fms: %s", call.name, elapsed_ms, code)
+        elif self.slow_ms is not None and elapsed_ms > self.slow_ms:
+            self.logger.warning(
+                "%s took %.1fms (slow threshold %gms)",
+                call.name,
+                elapsed_ms,
+                self.slow_ms,
+            )
+        else:
+            self.logger.log(self.level, "%s ok in %.1fms", call.name, elapsed_ms)
+        return result
+
+
+class TimeoutMiddleware:
+    """Gives commands without a timeout of their own a default deadline.
+
+    Calls whose context sets ``timeout``, and commands declaring
+    ``timeout_ms``, are already bounded by the registry; everything else
+    fails with TIMEOUT after ``default_ms``.
+    """
+
+    def __init__(self, default_ms: int):
+        self.default_ms = default_ms
+
+    async def __call__(
+        self, call: Invocation, call_next: NextStep
+    ) -> CommandResult[Any]:
+        if getattr(call.context, "timeout", None) or call.command.timeout_ms:
+            return await call_next(call)
+        return await run_with_deadline(call, call_next, self.default_ms)
+
+
+class ConcurrencyLimitMiddleware:
+    """Caps how many executions run at once; the rest wait their turn.
+
+    Args:
+        limit: Maximum concurrent executions.
+        wait_ms: Give up with RATE_LIMITED after waiting this long for a
+            slot; None waits indefinitely.
+    """
+
+    def __init__(self, limit: int, wait_ms: Optional[int] = None):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.wait_ms = wait_ms
+        # One semaphore per event loop; CLI shells and tests run several
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, FairSemaphore]" = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> FairSemaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = FairSemaphore(self.limit)
+        return semaphore
+
+    async def __call__(
+        self, call: Invocation, call_next: NextStep
+    ) -> CommandResult[Any]:
+        semaphore = self._semaphore()
+        # Not wait_for(): on Python 3.10/3.11 a timeout racing the acquire
+        # can leave the slot taken and never released
+        if not await semaphore.acquire(self.wait_ms / 1000 if self.wait_ms else None):
+            return error(
+                ErrorCodes.RATE_LIMITED,
+                f"'{call.name}' waited {self.wait_ms}ms for one of "
+                f"{self.limit} execution slots",
+                suggestion="Wait for running commands to finish and try again",
+                retryable=True,
+            )
+        try:
+            return await call_next(call)
+        finally:
+            semaphore.release()
@@ -0,0 +1,216 @@
+"""Event-loop lag monitor.
+
+Blocking work inside an ``async def`` handler (``subprocess.run``, large
+file reads, regex scans over a whole addon) freezes the event loop, and
+every other command, stream and WebSocket broadcast waits until it ends.
+LoopMonitor measures that lag from a watchdog thread; when the loop
+stalls it records which task - and which command, if the registry knows -
+was running, and the stack it was blocked in.
+
+Example:
+    >>> from afd.core.monitor import LoopMonitor
+    >>>
+    >>> monitor = LoopMonitor(threshold_ms=100)
+    >>> monitor.resolve = server.registry.command_for_task
+    >>> monitor.start()  # from inside the running loop
+    >>> ...
+    >>> monitor.snapshot()["offenders"][0]["source"]
+    'addon.lint'
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from afd.core.metrics import Histogram
+
+# How often the loop is pinged, and how late a ping must be to count as a stall
+DEFAULT_INTERVAL_MS = 50
+DEFAULT_THRESHOLD_MS = 100
+
+# Innermost frames kept from a stalled loop's stack
+STACK_DEPTH = 8
+
+# Most recent stalls kept for inspection
+RECENT_STALLS = 20
+
+# Maps the task running on the loop to the command it is executing
+CommandResolver = Callable[[Any], Optional[str]]
+
+
+class LoopMonitor:
+    """Measures event-loop lag and attributes stalls to what caused them.
+
+    A daemon thread schedules a no-op callback on the loop every
+    ``interval_ms`` and times how long it takes to run. If it hasn't run
+    after ``threshold_ms``, the loop is blocked: the thread samples the
+    loop thread's stack and current task before the stall ends, then
+    records the stall's full duration once the loop catches up.
+
+    Attributes:
+        interval_ms: Time between pings.
+        threshold_ms: Lag above which a ping counts as a stall.
+        resolve: Maps the running task to a command name.
+        lag: Histogram of every ping's lag in milliseconds.
+        stalls: Number of stalls recorded.
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        resolve: Optional[CommandResolver] = None,
+    ):
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.resolve = resolve
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reset()
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching the running loop.
+
+        Must be called from the loop's own thread. Does nothing if this
+        loop is already being watched.
+        """
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self.stop()
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._watch, name="afd-loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def reset(self) -> None:
+        """Discard recorded lag and stalls."""
+        with self._lock:
+            self.lag = Histogram()
+            self.stalls = 0
+            self._offenders: Dict[str, Dict[str, Any]] = {}
+            self._recent: "deque[Dict[str, Any]]" = deque(maxlen=RECENT_STALLS)
+
+    def _watch(self) -> None:
+        loop, stop = self._loop, self._stop
+        while not stop.is_set():
+            answered = threading.Event()
+            sent = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # Loop closed
+
+            sample = None
+            if not answered.wait(self.threshold_ms / 1000):
+                if not loop.is_running():
+                    return  # Loop stopped, not stalled
+                # Sample now, while the blocking code is still on the stack
+                sample = self._sample()
+                while not answered.wait(0.1):
+                    if stop.is_set() or not loop.is_running():
+                        return
+
+            lag_ms = (time.perf_counter() - sent) * 1000
+            self.lag.observe(lag_ms)
+            if sample is not None:
+                self._record(lag_ms, sample)
+            stop.wait(self.interval_ms / 1000)
+
+    def _sample(self) -> Dict[str, Any]:
+        """What the loop thread is doing right now."""
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+
+        command = None
+        if task is not None and self.resolve is not None:
+            try:
+                command = self.resolve(task)
+            except Exception:
+                command = None
+
+        if task is None:
+            name = "(callback)"
+        else:
+            coro = task.get_coro()
+            name = getattr(coro, "__qualname__", None) or task.get_name()
+
+        stack: List[str] = []
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is not None:
+            stack = [
+                f"{entry.filename}:{entry.lineno} in {entry.name}"
+                for entry in traceback.extract_stack(frame)[-STACK_DEPTH:]
+            ]
+
+        return {"command": command, "task": name, "stack": stack}
+
+    def _record(self, lag_ms: float, sample: Dict[str, Any]) -> None:
+        source = sample["command"] or sample["task"]
+        with self._lock:
+            self.stalls += 1
+            offender = self._offenders.get(source)
+            if offender is None:
+                offender = self._offenders[source] = {
+                    "source": source,
+                    "command": sample["command"] is not None,
+                    "stalls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            offender["stalls"] += 1
+            offender["total_ms"] = round(offender["total_ms"] + lag_ms, 3)
+            offender["max_ms"] = round(max(offender["max_ms"], lag_ms), 3)
+            offender["last_stack"] = sample["stack"]
+            self._recent.append(
+                {
+                    **sample,
+                    "source": source,
+                    "lag_ms": round(lag_ms, 3),
+                    "at": time.time(),
+                }
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag summary, worst offenders first, and the most recent stalls."""
+        with self._lock:
+            offenders = sorted(
+                (dict(o) for o in self._offenders.values()),
+                key=lambda o: o["total_ms"],
+                reverse=True,
+            )
+            recent = list(self._recent)
+            stalls = self.stalls
+        return {
+            "running": self.running,
+            "interval_ms": self.interval_ms,
+            "threshold_ms": self.threshold_ms,
+            "lag": self.lag.snapshot(),
+            "stalls": stalls,
+            "offenders": offenders,
+            "recent": recent,
+        }
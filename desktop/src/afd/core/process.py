@@ -0,0 +1,129 @@
+"""Child processes that stop when their command does.
+
+``subprocess.run`` inside an ``async def`` handler blocks the event loop
+and can't be interrupted: a command timeout only fires after the tool
+finishes on its own. ``run_process`` awaits the child instead, and if the
+handler is cancelled - its deadline passed, or every caller went away -
+kills the child and everything it started before re-raising.
+
+Example:
+    >>> from afd.core.process import run_process
+    >>>
+    >>> try:
+    ...     result = await run_process(["luacheck", str(path)], timeout=60)
+    ... except subprocess.TimeoutExpired:
+    ...     return error(code="TIMEOUT", message="Luacheck timed out")
+    >>> result.returncode, result.stdout
+"""
+
+import asyncio
+import locale
+import os
+import signal
+import subprocess
+import sys
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+StrPath = Union[str, "os.PathLike[str]"]
+
+
+async def run_process(
+    args: Sequence[StrPath],
+    *,
+    timeout: Optional[float] = None,
+    cwd: Optional[StrPath] = None,
+    env: Optional[Mapping[str, str]] = None,
+    input: Optional[str] = None,
+) -> "subprocess.CompletedProcess[str]":
+    """Run a command to completion without blocking the event loop.
+
+    A drop-in for ``subprocess.run(args, capture_output=True, text=True,
+    timeout=...)``: returns a CompletedProcess with decoded stdout and
+    stderr, and raises ``subprocess.TimeoutExpired`` after ``timeout``
+    seconds. The process (and, on POSIX, its whole process group; on
+    Windows, its process tree) is killed on timeout or cancellation.
+
+    Args:
+        args: Program and arguments.
+        timeout: Seconds to wait before killing the process.
+        cwd: Working directory.
+        env: Environment (defaults to the current one).
+        input: Text written to the process's stdin.
+
+    Raises:
+        FileNotFoundError: If the program doesn't exist.
+        subprocess.TimeoutExpired: If it ran longer than ``timeout``.
+    """
+    args = [os.fspath(a) for a in args]
+    kwargs: Dict[str, Any] = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        # Own process group, so wrappers (busted, shell scripts) die with
+        # the tools they launch
+        kwargs["start_new_session"] = True
+
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=os.fspath(cwd) if cwd is not None else None,
+        env=dict(env) if env is not None else None,
+        **kwargs,
+    )
+    encoding = locale.getpreferredencoding(False)
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(input.encode(encoding) if input is not None else None),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise subprocess.TimeoutExpired(args, timeout) from None
+    except BaseException:
+        # Cancelled: the command's deadline passed or its callers left
+        await _kill(proc)
+        raise
+
+    return subprocess.CompletedProcess(
+        args,
+        proc.returncode,
+        stdout.decode(encoding, errors="replace"),
+        stderr.decode(encoding, errors="replace"),
+    )
+
+
+async def _kill(proc: "asyncio.subprocess.Process") -> None:
+    """Kill a process and its children, then reap it."""
+    if proc.returncode is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            # /T takes the tree (e.g. a .bat wrapper and the tool it runs).
+            # Awaited, not subprocess.run: this runs on the event loop.
+            taskkill = await asyncio.create_subprocess_exec(
+                "taskkill",
+                "/F",
+                "/T",
+                "/PID",
+                str(proc.pid),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            try:
+                await asyncio.wait_for(taskkill.wait(), 5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                taskkill.kill()
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+    try:
+        await asyncio.wait_for(proc.wait(), 5)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        pass
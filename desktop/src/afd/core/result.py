@@ -17,6 +17,7 @@ Example:
 
 from typing import Any, Generic, List, Optional, TypeVar
 
+import pydantic_core
 from pydantic import BaseModel, Field
 
 from afd.core.metadata import Alternative, PlanStep, Source, Warning
@@ -112,6 +113,34 @@ class CommandResult(BaseModel, Generic[T]):
     # Execution metadata
     metadata: Optional[ResultMetadata] = None
 
+    # Serialized form, built by to_json_bytes() and reset on assignment.
+    # A slot rather than a private attribute, so it is left out of
+    # equality, copies and pickles.
+    __slots__ = ("_json",)
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize the result to JSON once and reuse the bytes.
+
+        Results are shared between cache hits and coalesced callers, and a
+        single response is often written to several places (HTTP body,
+        history, MCP text); each of them can use these bytes instead of
+        dumping the model again. Encoding uses pydantic-core's serializer;
+        values JSON can't represent are written via ``str()``, like
+        ``json.dumps(default=str)``.
+
+        Assigning a field clears the cached bytes; changes made inside
+        ``data`` in place do not, so treat a serialized result as frozen.
+        """
+        encoded = getattr(self, "_json", None)
+        if encoded is None:
+            encoded = pydantic_core.to_json(self, serialize_unknown=True)
+            object.__setattr__(self, "_json", encoded)
+        return encoded
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, "_json", None)
+        super().__setattr__(name, value)
+
 
 def success(
     data: T,
@@ -42,7 +42,8 @@ from typing import (
 
 from pydantic import BaseModel
 
-from afd.core.commands import CommandDefinition, CommandParameter
+from afd.core.commands import CommandDefinition, CommandParameter, input_validator
+from afd.core.executors import EXECUTION_MODES, ExecutionMode
 from afd.core.result import CommandResult
 
 TInput = TypeVar("TInput", bound=BaseModel)
@@ -61,6 +62,12 @@ class CommandMetadata:
         tags: Tags for categorization.
         mutation: Whether this command modifies state.
         examples: Example inputs for documentation.
+        fingerprint: Dependency fingerprint for caching read-only results.
+        coalesce: Share one execution between identical concurrent calls
+            (None or False: never).
+        timeout_ms: Deadline for one execution (None means no limit).
+        execution: Where the handler runs: "inline", "thread" or "process".
+        max_concurrency: Most executions that may run at once (None: no limit).
     """
 
     name: str
@@ -70,6 +77,11 @@ class CommandMetadata:
     tags: List[str] = field(default_factory=list)
     mutation: bool = False
     examples: List[Dict[str, Any]] = field(default_factory=list)
+    fingerprint: Optional[Callable[[Any], Any]] = None
+    coalesce: Optional[bool] = None
+    timeout_ms: Optional[int] = None
+    execution: ExecutionMode = "inline"
+    max_concurrency: Optional[int] = None
 
 
 def define_command(
@@ -80,6 +92,11 @@ def define_command(
     tags: Optional[List[str]] = None,
     mutation: bool = False,
     examples: Optional[List[Dict[str, Any]]] = None,
+    fingerprint: Optional[Callable[[Any], Any]] = None,
+    coalesce: Optional[bool] = None,
+    timeout_ms: Optional[int] = None,
+    execution: ExecutionMode = "inline",
+    max_concurrency: Optional[int] = None,
 ) -> Callable:
     """Decorator to define a command with metadata.
 
@@ -94,6 +111,30 @@ def define_command(
         tags: Tags for categorization and filtering.
         mutation: Whether this command modifies state (default False).
         examples: Example inputs for documentation.
+        fingerprint: For read-only commands, a function of the input (as a
+            dict) returning a value that changes whenever the data the
+            command reads changes, e.g. ``file_fingerprint(path)``. Results
+            are cached until the fingerprint changes.
+        coalesce: Whether identical concurrent calls share one execution
+            (single flight). Off by default; pass True for pure reads and
+            for idempotent mutations that must not run twice at once.
+            Never set it on interactive commands or ones that start
+            processes per call. Callers with a progress listener or
+            ``extra`` context don't join a shared execution.
+        timeout_ms: Deadline for one execution. Past it the handler is
+            cancelled (killing child processes started with
+            ``afd.core.run_process``) and the caller gets a TIMEOUT error.
+            Callers can override it with ``CommandContext.timeout``.
+        execution: Where the handler runs. "inline" (default) runs it on
+            the event loop; use "thread" for blocking file or network work
+            and "process" for CPU-bound analysis, which then runs in the
+            server's worker pools (``afd.core.executors``). Process
+            handlers get picklable input, must return a picklable result
+            and receive no context.
+        max_concurrency: Most executions of this command that may run at
+            once. Further calls wait in a first-come, first-served queue
+            (``afd.core.limits``); the wait counts toward ``timeout_ms``.
+            Tag-wide limits are set on the server's ``limits``.
 
     Returns:
         Decorator function that wraps the handler.
@@ -121,32 +162,49 @@ def define_command(
             tags=tags or [],
             mutation=mutation,
             examples=examples or [],
+            fingerprint=fingerprint,
+            coalesce=coalesce,
+            timeout_ms=timeout_ms,
+            execution=execution,
+            max_concurrency=max_concurrency,
         )
-
-        @wraps(func)
-        async def wrapper(
-            raw_input: Any, context: Optional[Any] = None
-        ) -> CommandResult:
-            """Wrapper that validates input and calls the handler."""
-            # Validate input using Pydantic schema if provided
-            if input_schema and raw_input is not None:
-                if isinstance(raw_input, dict):
-                    validated_input = input_schema.model_validate(raw_input)
-                elif isinstance(raw_input, input_schema):
+        if execution not in EXECUTION_MODES:
+            raise ValueError(
+                f"Command '{name}': execution must be one of {EXECUTION_MODES}"
+            )
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"Command '{name}': max_concurrency must be at least 1")
+
+        # Resolved once here rather than on every call
+        takes_context = _accepts_context(func)
+        validate = input_validator(input_schema) if input_schema else None
+
+        if validate is None:
+            # Schema-less: pass the input straight through
+            @wraps(func)
+            async def wrapper(
+                raw_input: Any, context: Optional[Any] = None
+            ) -> CommandResult:
+                """Wrapper that calls the handler."""
+                if takes_context:
+                    return await func(raw_input, context)
+                return await func(raw_input)
+
+        else:
+
+            @wraps(func)
+            async def wrapper(
+                raw_input: Any, context: Optional[Any] = None
+            ) -> CommandResult:
+                """Wrapper that validates input and calls the handler."""
+                # Input that is already the validated model is used as-is
+                if raw_input is None or type(raw_input) is input_schema:
                     validated_input = raw_input
                 else:
-                    validated_input = input_schema.model_validate(raw_input)
-            else:
-                validated_input = raw_input
-
-            # Call the original handler
-            result = (
-                await func(validated_input, context)
-                if _accepts_context(func)
-                else await func(validated_input)
-            )
-
-            return result
+                    validated_input = validate(raw_input)
+                if takes_context:
+                    return await func(validated_input, context)
+                return await func(validated_input)
 
         # Copy metadata to wrapper
         wrapper.__afd_command__ = func.__afd_command__
@@ -221,6 +279,12 @@ def command_to_definition(func: Callable) -> Optional[CommandDefinition]:
         tags=metadata.tags,
         mutation=metadata.mutation,
         examples=metadata.examples,
+        fingerprint=metadata.fingerprint,
+        coalesce=metadata.coalesce,
+        timeout_ms=metadata.timeout_ms,
+        execution=metadata.execution,
+        max_concurrency=metadata.max_concurrency,
+        input_schema=metadata.input_schema,
     )
 
 
@@ -45,10 +45,14 @@ from typing import (
 
 from pydantic import BaseModel
 
+from afd.core.cache import ResultCache
+from afd.core.executors import ExecutionMode, Executors
+from afd.core.limits import ConcurrencyLimits
 from afd.core.commands import (
     CommandContext,
     CommandDefinition,
     CommandRegistry,
+    Middleware,
     create_command_registry,
 )
 from afd.core.result import CommandResult
@@ -122,7 +126,12 @@ class MCPServer:
             config: Server configuration.
         """
         self.config = config
-        self._registry = create_command_registry()
+        self._cache = ResultCache()
+        self._executors = Executors()
+        self._limits = ConcurrencyLimits()
+        self._registry = create_command_registry(
+            self._cache, self._executors, self._limits
+        )
         self._commands: List[Callable] = []
         self._mcp_server = None
 
@@ -141,6 +150,21 @@ class MCPServer:
         """Get the command registry."""
         return self._registry
 
+    @property
+    def cache(self) -> ResultCache:
+        """Get the result cache used for commands that declare a fingerprint."""
+        return self._cache
+
+    @property
+    def executors(self) -> Executors:
+        """Get the worker pools that thread and process commands run in."""
+        return self._executors
+
+    @property
+    def limits(self) -> ConcurrencyLimits:
+        """Get the per-command and per-tag concurrency limits."""
+        return self._limits
+
     def command(
         self,
         name: str,
@@ -150,6 +174,11 @@ class MCPServer:
         tags: Optional[List[str]] = None,
         mutation: bool = False,
         examples: Optional[List[Dict[str, Any]]] = None,
+        fingerprint: Optional[Callable[[Any], Any]] = None,
+        coalesce: Optional[bool] = None,
+        timeout_ms: Optional[int] = None,
+        execution: ExecutionMode = "inline",
+        max_concurrency: Optional[int] = None,
     ) -> Callable:
         """Decorator to register a command with this server.
 
@@ -163,6 +192,11 @@ class MCPServer:
             tags: Tags for categorization.
             mutation: Whether command modifies state.
             examples: Example inputs.
+            fingerprint: Dependency fingerprint; enables result caching.
+            coalesce: Share one execution between identical concurrent calls.
+            timeout_ms: Deadline for one execution; TIMEOUT error past it.
+            execution: "inline", "thread" or "process" (see executors).
+            max_concurrency: Most executions at once; the rest queue.
 
         Returns:
             Decorator function.
@@ -187,6 +221,11 @@ class MCPServer:
                 tags=tags,
                 mutation=mutation,
                 examples=examples,
+                fingerprint=fingerprint,
+                coalesce=coalesce,
+                timeout_ms=timeout_ms,
+                execution=execution,
+                max_concurrency=max_concurrency,
             )(func)
 
             # Register with our registry
@@ -226,8 +265,53 @@ class MCPServer:
             self._registry.register(definition)
             self._commands.append(func)
 
+    def register_lazy(self, names: List[str], loader: Callable[[], None]) -> None:
+        """Declare commands whose registration is deferred until first use.
+
+        The loader (typically importing a module and registering its
+        commands on this server) runs when one of the names is executed
+        or looked up, or when all commands are listed.
+
+        Args:
+            names: Command names the loader registers.
+            loader: Registers the commands.
+
+        Example:
+            >>> server.register_lazy(
+            ...     ["api.search", "api.info"],
+            ...     lambda: api_module().register_commands(server),
+            ... )
+        """
+        self._registry.register_lazy(names, loader)
+
+    def use(self, middleware: Middleware) -> Middleware:
+        """Add middleware to every command execution.
+
+        Applies to every entry point - CLI, HTTP and MCP all execute
+        through this server's registry. Middleware runs in the order it
+        was added, after the built-in timing and result cache steps.
+
+        Args:
+            middleware: ``async (call, call_next) -> CommandResult``.
+
+        Returns:
+            The middleware, so this can be used as a decorator.
+
+        Example:
+            >>> from afd.core.middleware import TimeoutMiddleware
+            >>> server.use(TimeoutMiddleware(default_ms=30_000))
+            >>>
+            >>> @server.use
+            ... async def audit(call, call_next):
+            ...     result = await call_next(call)
+            ...     audit_log.append((call.name, result.success))
+            ...     return result
+        """
+        self._registry.use(middleware)
+        return middleware
+
     def list_commands(self) -> List[CommandDefinition]:
-        """List all registered commands."""
+        """List all commands, registering any lazy ones first."""
         return self._registry.list()
 
     async def execute(
@@ -255,7 +339,8 @@ class MCPServer:
 
             self._mcp_server = FastMCP(self.config.name)
 
-            # Register all commands as MCP tools
+            # Register all commands as MCP tools (loading lazy ones first)
+            self._registry.list()
             for cmd in self._commands:
                 metadata = get_command_metadata(cmd)
                 if metadata:
@@ -276,7 +361,7 @@ class MCPServer:
         from pydantic import BaseModel, ConfigDict, create_model
         from typing import Any
         from mcp.server.fastmcp import Context
-        from afd.server.decorators import _accepts_context
+        from afd.server.decorators import _accepts_context, input_validator
 
         # Create the input schema
         if metadata.input_schema:
@@ -292,9 +377,13 @@ class MCPServer:
         # Using a closure and exec is the most reliable way to do this dynamically.
         handler_name = f"handler_{metadata.name.replace('.', '_')}"
         namespace = {
-            "func": func,
             "json": json,
-            "input_schema": input_schema,
+            # Validated once here; the command wrapper passes the model through
+            "validate": (
+                input_validator(metadata.input_schema)
+                if metadata.input_schema
+                else None
+            ),
             "CommandResult": CommandResult,
             "Context": Context,
             "Any": Any,
@@ -306,7 +395,7 @@ class MCPServer:
         if not fields and input_schema.model_config.get("extra") == "allow":
             arg_list.append("**kwargs")
             if metadata.input_schema:
-                call_args_code = "input_schema(**kwargs)"
+                call_args_code = "validate(kwargs)"
             else:
                 call_args_code = "kwargs"
         else:
@@ -336,7 +425,7 @@ class MCPServer:
             field_names = list(fields.keys())
             dict_construction = ", ".join([f"'{name}': {name}" for name in field_names])
             if metadata.input_schema:
-                call_args_code = f"input_schema(**{{{dict_construction}}})"
+                call_args_code = f"validate({{{dict_construction}}})"
             else:
                 call_args_code = f"{{{dict_construction}}}"
 
@@ -347,16 +436,22 @@ class MCPServer:
 
         signature = ", ".join(arg_list)
 
-        if has_context:
-            final_call = f"await func({call_args_code}, context=context)"
-        else:
-            final_call = f"await func({call_args_code})"
+        # Go through execute() so MCP calls share the registry's result cache.
+        # The registry takes a CommandContext; FastMCP's own rides in extra.
+        namespace["execute"] = self.execute
+        namespace["CommandContext"] = CommandContext
+        context_arg = (
+            "CommandContext(extra={'mcp_context': context})" if has_context else "None"
+        )
+        final_call = (
+            f"await execute({metadata.name!r}, {call_args_code}, {context_arg})"
+        )
 
         exec_code = f"""
 async def {handler_name}({signature}) -> str:
     \"\"\"MCP tool handler for {metadata.name}\"\"\"
     result = {final_call}
-    return json.dumps(result.model_dump(), default=str)
+    return result.to_json_bytes().decode("utf-8")
 """
         exec(exec_code, namespace)
         handler = namespace[handler_name]
@@ -28,12 +28,24 @@ from afd.testing.assertions import (
     assert_has_plan,
     assert_has_warnings,
     assert_has_alternatives,
+    assert_latency_under,
 )
 from afd.testing.fixtures import (
     command_context,
     mock_server,
     isolated_registry,
 )
+from afd.testing.benchmarks import (
+    OverheadReport,
+    measure_overhead,
+)
+from afd.testing.performance import (
+    LoadCall,
+    LoadReport,
+    Timings,
+    measure,
+    run_load,
+)
 
 __all__ = [
     # Assertions
@@ -45,8 +57,18 @@ __all__ = [
     "assert_has_plan",
     "assert_has_warnings",
     "assert_has_alternatives",
+    "assert_latency_under",
     # Fixtures
     "command_context",
     "mock_server",
     "isolated_registry",
+    # Benchmarks
+    "OverheadReport",
+    "measure_overhead",
+    # Performance
+    "LoadCall",
+    "LoadReport",
+    "Timings",
+    "measure",
+    "run_load",
 ]
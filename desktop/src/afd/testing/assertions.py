@@ -14,7 +14,7 @@ Example:
     >>> assert "name" in error.message
 """
 
-from typing import Any, Dict, List, Optional, TypeVar, Union
+from typing import Any, Dict, List, Optional, Sequence, TypeVar, Union
 
 from afd.core import (
     CommandResult,
@@ -26,6 +26,7 @@ from afd.core import (
     Warning as AfdWarning,
     Alternative,
 )
+from afd.testing.performance import LoadReport, Timings
 
 T = TypeVar("T")
 
@@ -411,3 +412,52 @@ def assert_has_alternatives(
         )
 
     return converted_alts
+
+
+def assert_latency_under(
+    timings: Union[Timings, LoadReport, Sequence[float]],
+    max_ms: float,
+    percentile: float = 0.95,
+    message: Optional[str] = None,
+) -> float:
+    """Assert that latency at a percentile is within a budget.
+
+    Args:
+        timings: Samples from ``measure()``, a ``LoadReport`` (all calls),
+            or a sequence of millisecond samples.
+        max_ms: Budget in milliseconds.
+        percentile: Quantile (0-1) held to the budget; 1.0 checks the
+            slowest sample.
+        message: Optional custom failure message.
+
+    Returns:
+        The measured latency at that percentile.
+
+    Raises:
+        AssertionError: If there are no samples or the budget is exceeded.
+
+    Example:
+        >>> timings = Timings()
+        >>> for _ in range(100):
+        ...     with measure(timings):
+        ...         await server.execute("api.info", {"name": "UnitName"})
+        >>> assert_latency_under(timings, 5, percentile=0.99)
+    """
+    if isinstance(timings, LoadReport):
+        timings = timings.latency
+    elif not isinstance(timings, Timings):
+        timings = Timings(timings)
+
+    value = timings.percentile(percentile)
+    if value is None:
+        raise AssertionError("Expected latency samples but none were recorded")
+
+    if value > max_ms:
+        label = f"p{percentile * 100:g}"
+        failure_msg = message or (
+            f"Expected {label} latency under {max_ms:g}ms but got {value:.2f}ms "
+            f"over {timings.count} samples ({timings.summary()})"
+        )
+        raise AssertionError(failure_msg)
+
+    return value
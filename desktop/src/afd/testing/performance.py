@@ -0,0 +1,359 @@
+"""
+Latency measurement and load generation for command performance tests.
+
+``measure()`` times blocks of code into a ``Timings`` sample set that
+reports exact percentiles; ``run_load()`` drives a server (or a
+``MockTransport``) with a weighted mix of calls from several concurrent
+workers and reports latency per command, throughput and errors. Together
+with ``assert_latency_under`` they let a test suite hold commands to a
+performance budget the same way it holds them to their behavior.
+
+Example:
+    >>> from afd.testing import Timings, assert_latency_under, measure, run_load
+    >>>
+    >>> timings = Timings()
+    >>> for _ in range(50):
+    ...     with measure(timings):
+    ...         await server.execute("api.search", {"query": "Unit"})
+    >>> assert_latency_under(timings, 20, percentile=0.95)
+    >>>
+    >>> report = await run_load(
+    ...     server,
+    ...     [("api.search", {"query": "Unit"}, 3), ("api.info", {"name": "UnitName"})],
+    ...     concurrency=8,
+    ...     total=400,
+    ... )
+    >>> print(report.summary())
+    400 calls in 0.21s (1904/s), 0 errors: p50 3.1ms, p95 6.8ms, p99 9.0ms
+    >>> assert report.errors == 0
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from afd.core import CommandContext, CommandResult
+
+
+class Timings:
+    """A set of latency samples, in milliseconds, with exact percentiles.
+
+    Unlike ``afd.core.Histogram`` every sample is kept, so percentiles are
+    exact; meant for test runs of hundreds to thousands of calls.
+
+    Example:
+        >>> timings = Timings([1.0, 2.0, 3.0, 4.0])
+        >>> timings.p50
+        2.5
+    """
+
+    def __init__(self, samples_ms: Optional[Sequence[float]] = None):
+        self.samples_ms: List[float] = list(samples_ms or ())
+        self._sorted: Optional[List[float]] = None
+
+    def add(self, ms: float) -> None:
+        """Record one sample."""
+        self.samples_ms.append(ms)
+        self._sorted = None
+
+    @property
+    def count(self) -> int:
+        return len(self.samples_ms)
+
+    @property
+    def last(self) -> Optional[float]:
+        """The most recent sample."""
+        return self.samples_ms[-1] if self.samples_ms else None
+
+    @property
+    def mean(self) -> Optional[float]:
+        return sum(self.samples_ms) / self.count if self.samples_ms else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return min(self.samples_ms) if self.samples_ms else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return max(self.samples_ms) if self.samples_ms else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0-1), interpolating between samples.
+
+        Returns:
+            The value, or None if there are no samples.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.samples_ms:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self.samples_ms)
+        values = self._sorted
+        position = q * (len(values) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def p99(self) -> Optional[float]:
+        return self.percentile(0.99)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, min, max, p50, p95 and p99, like Histogram.snapshot()."""
+        return {
+            "count": self.count,
+            "mean": _round(self.mean),
+            "min": _round(self.min),
+            "max": _round(self.max),
+            "p50": _round(self.p50),
+            "p95": _round(self.p95),
+            "p99": _round(self.p99),
+        }
+
+    def summary(self) -> str:
+        """One-line human-readable percentiles."""
+        if not self.samples_ms:
+            return "no samples"
+        return f"p50 {self.p50:.1f}ms, p95 {self.p95:.1f}ms, p99 {self.p99:.1f}ms"
+
+
+@contextmanager
+def measure(timings: Optional[Timings] = None) -> Iterator[Timings]:
+    """Time the enclosed block and add the elapsed milliseconds to ``timings``.
+
+    Reuse one ``Timings`` across a loop to collect a distribution, or
+    omit it to time a single block. The sample is recorded even if the
+    block raises.
+
+    Args:
+        timings: Sample set to add to; a new one is created if omitted.
+
+    Yields:
+        The sample set.
+
+    Example:
+        >>> with measure() as t:
+        ...     await server.execute("tools.status", {})
+        >>> t.last
+        0.42
+    """
+    timings = timings if timings is not None else Timings()
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.add((time.perf_counter() - start) * 1000)
+
+
+@dataclass
+class LoadCall:
+    """One entry in a load mix.
+
+    Attributes:
+        name: Command (or tool) to call.
+        input: Input passed on every call.
+        weight: Relative frequency within the mix.
+    """
+
+    name: str
+    input: Any = None
+    weight: float = 1.0
+
+
+# A call mix entry: LoadCall, (name, input) or (name, input, weight)
+CallSpec = Union[LoadCall, Tuple[str, Any], Tuple[str, Any, float]]
+
+
+@dataclass
+class LoadReport:
+    """What a load run did and how long calls took.
+
+    Attributes:
+        concurrency: Workers that issued calls.
+        elapsed_s: Wall time of the run.
+        latency: Latency of every call.
+        by_command: Latency per command.
+        errors: Failed calls (error results and exceptions).
+        error_codes: Failed calls by error code, or exception type.
+    """
+
+    concurrency: int
+    elapsed_s: float
+    latency: Timings = field(default_factory=Timings)
+    by_command: Dict[str, Timings] = field(default_factory=dict)
+    errors: int = 0
+    error_codes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def calls(self) -> int:
+        return self.latency.count
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second."""
+        return self.calls / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly summary."""
+        return {
+            "calls": self.calls,
+            "concurrency": self.concurrency,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput": round(self.throughput, 1),
+            "errors": self.errors,
+            "error_codes": dict(sorted(self.error_codes.items())),
+            "latency_ms": self.latency.snapshot(),
+            "by_command": {
+                name: timings.snapshot()
+                for name, timings in sorted(self.by_command.items())
+            },
+        }
+
+    def summary(self) -> str:
+        """One-line human-readable report."""
+        return (
+            f"{self.calls} calls in {self.elapsed_s:.2f}s "
+            f"({self.throughput:.0f}/s), {self.errors} errors: "
+            f"{self.latency.summary()}"
+        )
+
+
+async def run_load(
+    target: Any,
+    calls: Sequence[CallSpec],
+    *,
+    concurrency: int = 4,
+    total: Optional[int] = None,
+    duration: Optional[float] = None,
+    context: Optional[CommandContext] = None,
+    warmup: int = 0,
+    seed: Optional[int] = None,
+) -> LoadReport:
+    """Drive a server or transport with a weighted mix of calls.
+
+    ``concurrency`` workers each pick the next call from the mix (at
+    random, by weight) and issue it as soon as their previous one
+    returns, until ``total`` calls have been started or ``duration``
+    seconds have passed. A call fails if it raises or returns an
+    unsuccessful result; failures are counted and the run continues.
+
+    Args:
+        target: An MCPServer or CommandRegistry (``execute``) or a
+            transport such as ``MockTransport`` (``call_tool``).
+        calls: The mix: ``LoadCall`` objects or ``(name, input[, weight])``.
+        concurrency: Workers issuing calls at the same time.
+        total: Calls to make. Defaults to 100 when ``duration`` isn't given.
+        duration: Seconds to run for.
+        context: Passed to ``execute`` on every call (servers only).
+        warmup: Calls of each mix entry made, untimed, before the run.
+        seed: Seed for the mix selection, for a reproducible call order.
+
+    Returns:
+        Latency, throughput and error counts for the run.
+
+    Raises:
+        ValueError: If the mix is empty or concurrency is below one.
+    """
+    mix = [_load_call(spec) for spec in calls]
+    if not mix:
+        raise ValueError("calls must contain at least one entry")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if total is None and duration is None:
+        total = 100
+
+    if hasattr(target, "call_tool"):
+
+        def call(entry: LoadCall) -> Any:
+            return target.call_tool(entry.name, entry.input)
+
+    else:
+
+        def call(entry: LoadCall) -> Any:
+            return target.execute(entry.name, entry.input, context)
+
+    for entry in mix:
+        for _ in range(warmup):
+            await call(entry)
+
+    rng = random.Random(seed)
+    weights = [entry.weight for entry in mix]
+    report = LoadReport(concurrency=concurrency, elapsed_s=0.0)
+    started = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+
+    async def worker() -> None:
+        nonlocal started
+        while True:
+            if total is not None and started >= total:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            started += 1
+            entry = rng.choices(mix, weights)[0]
+            timings = report.by_command.setdefault(entry.name, Timings())
+            call_start = time.perf_counter()
+            try:
+                code = _failure_code(await call(entry))
+            except Exception as e:
+                code = type(e).__name__
+            ms = (time.perf_counter() - call_start) * 1000
+            report.latency.add(ms)
+            timings.add(ms)
+            if code is not None:
+                report.errors += 1
+                report.error_codes[code] = report.error_codes.get(code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+def _load_call(spec: CallSpec) -> LoadCall:
+    if isinstance(spec, LoadCall):
+        return spec
+    return LoadCall(*spec)
+
+
+def _failure_code(result: Any) -> Optional[str]:
+    """Error code of an unsuccessful result; None if it succeeded."""
+    if isinstance(result, CommandResult):
+        if result.success:
+            return None
+        return result.error.code if result.error else "UNKNOWN"
+    if isinstance(result, dict) and result.get("success") is False:
+        error = result.get("error")
+        if isinstance(error, dict):
+            return error.get("code", "UNKNOWN")
+        return "UNKNOWN"
+    return None
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
@@ -24,7 +24,7 @@ from afd.transports.base import (
     ToolNotFoundError,
 )
 from afd.transports.fastmcp import FastMCPTransport
-from afd.transports.mock import MockTransport
+from afd.transports.mock import MockTransport, ToolConditions
 
 __all__ = [
     "Transport",
@@ -36,4 +36,5 @@ __all__ = [
     "ToolNotFoundError",
     "FastMCPTransport",
     "MockTransport",
+    "ToolConditions",
 ]
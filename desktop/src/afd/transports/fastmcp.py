@@ -127,6 +127,8 @@ class FastMCPTransport:
             @self._mcp.tool(name=name, description=description)
             async def tool_wrapper(**kwargs):
                 result = await handler(kwargs)
+                if hasattr(result, "to_json_bytes"):
+                    return result.to_json_bytes().decode("utf-8")
                 return json.dumps(result, default=str)
 
     async def call_tool(
@@ -17,27 +17,118 @@ Example:
     >>> # Use in tests
     >>> await transport.connect()
     >>> result = await transport.call_tool("ping", {})
+    >>>
+    >>> # Simulate a slow, flaky server for performance tests
+    >>> transport.set_conditions(
+    ...     "ping", latency_ms=40, jitter_ms=15, failure_rate=0.05
+    ... )
+    >>> transport.set_conditions(max_per_second=100)  # every other tool
 """
 
+import asyncio
+import random
+import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Union
 
+from afd.core import error
 from afd.transports.base import (
+    TimeoutError,
     ToolInfo,
     ToolNotFoundError,
     Transport,
     TransportConfig,
+    TransportError,
     TransportState,
 )
 
 
 @dataclass
 class MockCall:
-    """Record of a tool call for assertions."""
+    """Record of a tool call for assertions.
+
+    Attributes:
+        tool_name: Tool called.
+        arguments: Arguments passed.
+        result: What the call returned (None if it raised).
+        latency_ms: Simulated time the call took, including any wait for
+            a throughput slot.
+        fault: Injected fault, "failure" or "timeout", or None.
+    """
 
     tool_name: str
     arguments: Dict[str, Any]
     result: Any
+    latency_ms: float = 0.0
+    fault: Optional[str] = None
+
+
+@dataclass
+class ToolConditions:
+    """Simulated network and server behavior for a tool.
+
+    Attributes:
+        latency_ms: Base latency added to every call.
+        jitter_ms: Spread around the base latency. Its meaning depends on
+            ``distribution``: "uniform" draws from base +/- jitter,
+            "normal" uses it as the standard deviation, and "exponential"
+            adds a long tail with this mean on top of the base.
+        distribution: "uniform", "normal", "exponential", or a callable
+            taking a ``random.Random`` and returning milliseconds.
+        max_per_second: Throughput cap. Calls beyond it wait their turn,
+            as they would behind a rate-limited server.
+        failure_rate: Probability (0-1) that a call fails.
+        failure_mode: "result" returns a retryable error result with
+            ``failure_code``; "raise" raises ``TransportError``.
+        failure_code: Error code of injected failures.
+        timeout_rate: Probability (0-1) that a call hangs and then raises
+            ``TimeoutError``.
+        timeout_ms: How long a timed-out call hangs; defaults to the
+            transport config's ``timeout_ms``.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    distribution: Union[
+        Literal["uniform", "normal", "exponential"], Callable[[random.Random], float]
+    ] = "uniform"
+    max_per_second: Optional[float] = None
+    failure_rate: float = 0.0
+    failure_mode: Literal["result", "raise"] = "result"
+    failure_code: str = "MOCK_FAILURE"
+    timeout_rate: float = 0.0
+    timeout_ms: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not callable(self.distribution) and self.distribution not in (
+            "uniform",
+            "normal",
+            "exponential",
+        ):
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        if self.failure_mode not in ("result", "raise"):
+            raise ValueError("failure_mode must be 'result' or 'raise'")
+        if self.max_per_second is not None and self.max_per_second <= 0:
+            raise ValueError("max_per_second must be positive")
+        for name in ("failure_rate", "timeout_rate"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw one call's latency in milliseconds (never negative)."""
+        if callable(self.distribution):
+            value = self.distribution(rng)
+        elif not self.jitter_ms:
+            value = self.latency_ms
+        elif self.distribution == "normal":
+            value = rng.gauss(self.latency_ms, self.jitter_ms)
+        elif self.distribution == "exponential":
+            value = self.latency_ms + rng.expovariate(1 / self.jitter_ms)
+        else:
+            value = rng.uniform(
+                self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms
+            )
+        return max(0.0, value)
 
 
 class MockTransport:
@@ -58,11 +149,15 @@ class MockTransport:
         >>> assert transport.last_call("ping").arguments == {}
     """
 
-    def __init__(self, config: Optional[TransportConfig] = None):
+    def __init__(
+        self, config: Optional[TransportConfig] = None, seed: Optional[int] = None
+    ):
         """Initialize mock transport.
 
         Args:
             config: Optional configuration.
+            seed: Seed for simulated latency and fault injection, for
+                reproducible runs.
         """
         self._config = config or TransportConfig()
         self._state = TransportState.DISCONNECTED
@@ -71,6 +166,10 @@ class MockTransport:
         self._calls: List[MockCall] = []
         self._should_fail_connect = False
         self._connection_error: Optional[str] = None
+        # Keyed by tool name; None holds the default for every other tool
+        self._conditions: Dict[Optional[str], ToolConditions] = {}
+        self._next_slot: Dict[Optional[str], float] = {}
+        self._rng = random.Random(seed)
 
     @property
     def state(self) -> TransportState:
@@ -128,6 +227,43 @@ class MockTransport:
         """
         self._tools[name] = (handler, description)
 
+    def set_conditions(
+        self,
+        tool_name: Optional[str] = None,
+        conditions: Optional[ToolConditions] = None,
+        **options: Any,
+    ) -> ToolConditions:
+        """Simulate latency, throughput limits and faults for a tool.
+
+        Conditions without a tool name apply to every tool that has none
+        of its own; their throughput cap is shared by all of those tools,
+        like a server-wide rate limit.
+
+        Args:
+            tool_name: Tool to configure, or None for the default.
+            conditions: Conditions to apply.
+            **options: ``ToolConditions`` fields, used when ``conditions``
+                isn't given.
+
+        Returns:
+            The conditions now in effect.
+
+        Example:
+            >>> transport.set_conditions(
+            ...     "search", latency_ms=80, jitter_ms=40,
+            ...     distribution="exponential", timeout_rate=0.01,
+            ... )
+        """
+        conditions = conditions or ToolConditions(**options)
+        self._conditions[tool_name] = conditions
+        self._next_slot.pop(tool_name, None)
+        return conditions
+
+    def clear_conditions(self, tool_name: Optional[str] = None) -> None:
+        """Remove simulated conditions for a tool (None: the default)."""
+        self._conditions.pop(tool_name, None)
+        self._next_slot.pop(tool_name, None)
+
     def add_mock_response(self, tool_name: str, response: Any) -> None:
         """Add a canned response for a tool.
 
@@ -148,41 +284,91 @@ class MockTransport:
         If a handler is registered, it's called.
         Otherwise, raises ToolNotFoundError.
 
+        Simulated conditions set with ``set_conditions`` are applied
+        before the response: the call waits for a throughput slot and its
+        sampled latency, then may fail or time out instead.
+
         Args:
             name: Tool name.
             arguments: Tool arguments.
 
         Returns:
             Tool result.
+
+        Raises:
+            ToolNotFoundError: If the tool isn't registered.
+            TimeoutError: If a timeout was injected.
+            TransportError: If a failure was injected with mode "raise".
         """
         args = arguments or {}
 
-        # Check for mock response first
+        if name not in self._mock_responses and name not in self._tools:
+            raise ToolNotFoundError(name)
+
+        key = name if name in self._conditions else None
+        conditions = self._conditions.get(key)
+        if conditions is None:
+            return self._record(name, args, await self._respond(name, args))
+
+        start = time.perf_counter()
+        await self._throttle(key, conditions)
+        await _sleep_ms(conditions.sample_latency(self._rng))
+
+        if conditions.timeout_rate and self._rng.random() < conditions.timeout_rate:
+            timeout_ms = conditions.timeout_ms
+            if timeout_ms is None:
+                timeout_ms = self._config.timeout_ms
+            await _sleep_ms(timeout_ms)
+            self._record(name, args, None, start, "timeout")
+            raise TimeoutError(f"Tool '{name}' timed out after {timeout_ms:g}ms")
+
+        if conditions.failure_rate and self._rng.random() < conditions.failure_rate:
+            message = f"Injected failure calling '{name}'"
+            if conditions.failure_mode == "raise":
+                self._record(name, args, None, start, "failure")
+                raise TransportError(message)
+            result = error(conditions.failure_code, message, retryable=True)
+            return self._record(name, args, result, start, "failure")
+
+        return self._record(name, args, await self._respond(name, args), start)
+
+    async def _respond(self, name: str, args: Dict[str, Any]) -> Any:
+        """Canned response if one is registered, otherwise the handler's result."""
         if name in self._mock_responses:
-            result = self._mock_responses[name]
-            self._calls.append(
-                MockCall(
-                    tool_name=name,
-                    arguments=args,
-                    result=result,
-                )
-            )
-            return result
-
-        # Check for registered handler
-        if name in self._tools:
-            handler, _ = self._tools[name]
-            result = await handler(args)
-            self._calls.append(
-                MockCall(
-                    tool_name=name,
-                    arguments=args,
-                    result=result,
-                )
+            return self._mock_responses[name]
+        handler, _ = self._tools[name]
+        return await handler(args)
+
+    async def _throttle(self, key: Optional[str], conditions: ToolConditions) -> None:
+        """Wait for this call's slot under the throughput cap."""
+        if not conditions.max_per_second:
+            return
+        now = time.monotonic()
+        # Reserve the next free slot before sleeping, so concurrent calls
+        # queue behind each other in arrival order
+        slot = max(now, self._next_slot.get(key, now))
+        self._next_slot[key] = slot + 1 / conditions.max_per_second
+        await asyncio.sleep(slot - now)
+
+    def _record(
+        self,
+        name: str,
+        args: Dict[str, Any],
+        result: Any,
+        start: Optional[float] = None,
+        fault: Optional[str] = None,
+    ) -> Any:
+        latency_ms = (time.perf_counter() - start) * 1000 if start is not None else 0.0
+        self._calls.append(
+            MockCall(
+                tool_name=name,
+                arguments=args,
+                result=result,
+                latency_ms=latency_ms,
+                fault=fault,
             )
-            return result
-
-        raise ToolNotFoundError(name)
+        )
+        return result
 
     async def list_tools(self) -> List[ToolInfo]:
         """List all registered tools and mock responses."""
@@ -252,3 +438,10 @@ class MockTransport:
         self._state = TransportState.DISCONNECTED
         self._should_fail_connect = False
         self._connection_error = None
+        self._conditions.clear()
+        self._next_slot.clear()
+
+
+async def _sleep_ms(ms: float) -> None:
+    if ms > 0:
+        await asyncio.sleep(ms / 1000)
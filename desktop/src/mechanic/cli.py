@@ -6,10 +6,14 @@ Follows structured command patterns:
 - `mechanic call <cmd> <json>` with positional JSON
 - `--json` and `--quiet` flags for output control
 - `mechanic shell` for interactive mode
+
+Startup matters: agents run `mech call ...` hundreds of times a session.
+Keep module-level imports light - the dashboard app (FastAPI, uvicorn,
+SQLite storage) and the file watcher are imported only by the commands
+that serve them.
 """
 
 import click
-import uvicorn
 import webbrowser
 import asyncio
 import json
@@ -18,9 +22,6 @@ import os
 import sys
 from typing import Any, Optional
 
-from .server import app
-from .watcher import SVWatcher
-
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # OUTPUT HELPERS
@@ -140,17 +141,40 @@ async def start_services(
     auto_reload=False,
     reload_key="^+r",
     stop_event=None,
+    watcher_backend=None,
 ):
+    import uvicorn
+
+    from .config import get_config
+    from .metrics import start_loop_monitor
+    from .server import app
+    from .watcher import SVWatcher
+
     if stop_event is None:
         stop_event = asyncio.Event()
 
+    watcher_settings = get_config().watcher
+    ws_settings = get_config().websocket
     watcher = SVWatcher(
-        watch_paths, src_paths=src_paths, auto_reload=auto_reload, reload_key=reload_key
+        watch_paths,
+        src_paths=src_paths,
+        auto_reload=auto_reload,
+        reload_key=reload_key,
+        backend=watcher_backend or watcher_settings["backend"],
+        poll_min_ms=watcher_settings["poll_min_ms"],
+        poll_max_ms=watcher_settings["poll_max_ms"],
     )
 
-    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="info")
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        log_level="info",
+        ws_per_message_deflate=ws_settings["per_message_deflate"],
+    )
     server = uvicorn.Server(config)
 
+    start_loop_monitor()
     server_task = asyncio.create_task(server.serve())
     watcher_task = asyncio.create_task(watcher.start(stop_event=stop_event))
 
@@ -163,7 +187,12 @@ async def start_services(
 
 
 def start_server(
-    port, watch_paths, src_paths=None, auto_reload=False, reload_key="^+r"
+    port,
+    watch_paths,
+    src_paths=None,
+    auto_reload=False,
+    reload_key="^+r",
+    watcher_backend=None,
 ):
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -183,14 +212,26 @@ def start_server(
     try:
         loop.run_until_complete(
             start_services(
-                port, watch_paths, src_paths, auto_reload, reload_key, stop_event
+                port,
+                watch_paths,
+                src_paths,
+                auto_reload,
+                reload_key,
+                stop_event,
+                watcher_backend,
             )
         )
     except (KeyboardInterrupt, asyncio.CancelledError):
         handle_signal()
         loop.run_until_complete(
             start_services(
-                port, watch_paths, src_paths, auto_reload, reload_key, stop_event
+                port,
+                watch_paths,
+                src_paths,
+                auto_reload,
+                reload_key,
+                stop_event,
+                watcher_backend,
             )
         )
     finally:
@@ -255,24 +296,17 @@ def list_commands(ctx, pattern, cmd_name):
       mechanic commands --filter libs  Filter by 'libs'
       mechanic commands -d libs.check  Show detail for libs.check
     """
-    from .commands.core import get_server
+    from .commands.core import get_server, list_command_summaries
 
     json_output = ctx.obj.get("json_output", False)
-    server = get_server()
-    commands = server.list_commands()
-
-    # Filter if pattern provided
-    if pattern:
-        commands = [c for c in commands if pattern.lower() in c.name.lower()]
 
-    # Show detail for specific command
+    # Show detail for specific command (imports only its module)
     if cmd_name:
-        matching = [c for c in commands if c.name == cmd_name]
-        if not matching:
+        cmd = get_server().registry.get(cmd_name)
+        if cmd is None or (pattern and pattern.lower() not in cmd_name.lower()):
             click.secho(f"[X] Command '{cmd_name}' not found", fg="red")
             sys.exit(1)
 
-        cmd = matching[0]
         if json_output:
             params = []
             if hasattr(cmd, "parameters") and cmd.parameters:
@@ -308,31 +342,41 @@ def list_commands(ctx, pattern, cmd_name):
                         click.echo(f"       {p.description}")
         return
 
+    # Listing reads the command manifest; no command modules are imported
+    commands = list_command_summaries()
+    if pattern:
+        commands = [c for c in commands if pattern.lower() in c.name.lower()]
+
     print_commands(commands, json_output=json_output)
 
 
 @main.command()
 @click.argument("command_name")
 @click.argument("args", default="{}")
+@click.option(
+    "--no-daemon", is_flag=True, help="Run in this process even if a daemon is up"
+)
 @click.pass_context
-def call(ctx, command_name, args):
+def call(ctx, command_name, args, no_daemon):
     """Call a command.
 
     COMMAND_NAME is the command to call (e.g., sv.discover, libs.check).
     ARGS is a JSON string of arguments (default: {}).
 
+    Runs in the `mech daemon` when one is serving this directory, otherwise
+    in-process.
+
     \b
     Examples:
       mechanic call sv.discover
       mechanic call libs.check '{"addon": "!Mechanic"}'
       mechanic --json call addon.validate '{"addon": "Weekly"}'
     """
-    from .commands.core import get_server
+    from .daemon import call_daemon
 
     json_output = ctx.obj.get("json_output", False)
     quiet = ctx.obj.get("quiet", False)
     agent = ctx.obj.get("agent", False)
-    server = get_server()
 
     # Parse args
     try:
@@ -348,7 +392,11 @@ def call(ctx, command_name, args):
     if not quiet and not json_output:
         click.echo(f"Calling {command_name}...")
 
-    result = asyncio.run(server.execute(command_name, input_data))
+    result = None if no_daemon else call_daemon(command_name, input_data)
+    if result is None:
+        from .commands.core import get_server
+
+        result = asyncio.run(get_server().execute(command_name, input_data))
     print_result(result, json_output=json_output, quiet=quiet)
 
     if not result.success:
@@ -363,7 +411,7 @@ def shell(ctx):
     Provides a REPL for calling commands interactively.
     Type 'help' for commands, 'exit' to quit.
     """
-    from .commands.core import get_server
+    from .commands.core import get_server, list_command_summaries
 
     server = get_server()
     json_output = ctx.obj.get("json_output", False)
@@ -398,7 +446,7 @@ Commands:
                 continue
 
             if line == "commands":
-                commands = server.list_commands()
+                commands = list_command_summaries()
                 print_commands(commands, json_output=json_output)
                 continue
 
@@ -477,8 +525,16 @@ def status(ctx):
 @click.option(
     "--reload-key", default="9", help="Key to send for auto-reload (default: 9)."
 )
+@click.option(
+    "--watcher-backend",
+    type=click.Choice(["native", "polling"]),
+    default=None,
+    help="SavedVariables change detection (use 'polling' for network drives and VMs).",
+)
 @click.pass_context
-def dashboard(ctx, port, watch, src, no_browser, auto_reload, reload_key):
+def dashboard(
+    ctx, port, watch, src, no_browser, auto_reload, reload_key, watcher_backend
+):
     """Start the Mechanic Dashboard and watch for changes."""
     from .commands.core import get_server
 
@@ -528,6 +584,7 @@ def dashboard(ctx, port, watch, src, no_browser, auto_reload, reload_key):
         src_paths=src_paths,
         auto_reload=auto_reload,
         reload_key=reload_key,
+        watcher_backend=watcher_backend,
     )
 
 
@@ -564,6 +621,102 @@ def stop(ctx, port):
             click.secho(f"[X] Could not connect to port {port}", fg="red")
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMANDS - Daemon
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@main.group()
+def daemon():
+    """Keep a warm process that `mech call` forwards to.
+
+    \b
+    Examples:
+      mechanic daemon start --background   Start and return once it's ready
+      mechanic daemon status               Show pid, uptime and calls served
+      mechanic daemon stop                 Shut it down
+    """
+
+
+def _print_daemon_status(info: dict, json_output: bool) -> None:
+    if json_output:
+        click.echo(json.dumps(info, indent=2))
+        return
+    click.echo(f"  PID: {info['pid']}")
+    click.echo(f"  Uptime: {info['uptime_s']}s")
+    click.echo(f"  Calls served: {info['served']}")
+    click.echo(f"  Directory: {info['cwd']}")
+
+
+@daemon.command("start")
+@click.option(
+    "--idle-timeout",
+    default=30.0,
+    show_default=True,
+    help="Minutes without calls before the daemon exits.",
+)
+@click.option("--background", "-b", is_flag=True, help="Detach and return once ready.")
+@click.pass_context
+def daemon_start(ctx, idle_timeout, background):
+    """Start the daemon (in the foreground unless --background)."""
+    from .daemon import LOG_FILENAME, Daemon, request, start_background
+    from .config import get_data_dir
+
+    if background:
+        if request({"op": "ping"}) is not None:
+            click.secho("[OK] Daemon already running", fg="green")
+            return
+        if not start_background(idle_timeout):
+            click.secho(
+                f"[X] Daemon did not start; see {get_data_dir() / LOG_FILENAME}",
+                fg="red",
+            )
+            sys.exit(1)
+        click.secho("[OK] Daemon started", fg="green")
+        return
+
+    click.echo(f"Daemon serving {os.getcwd()} (idle timeout {idle_timeout:g} min)")
+    try:
+        asyncio.run(Daemon(idle_timeout).serve())
+    except RuntimeError as e:
+        click.secho(f"[X] {e}", fg="red")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@daemon.command("stop")
+@click.pass_context
+def daemon_stop(ctx):
+    """Stop the running daemon."""
+    from .daemon import request
+
+    info = request({"op": "shutdown"})
+    if info is None:
+        click.secho("[X] No daemon running", fg="red")
+        sys.exit(1)
+    click.secho(f"[OK] Daemon stopped after {info['served']} calls", fg="green")
+
+
+@daemon.command("status")
+@click.pass_context
+def daemon_status(ctx):
+    """Show whether the daemon is running."""
+    from .daemon import request
+
+    json_output = ctx.obj.get("json_output", False)
+    info = request({"op": "ping"})
+    if info is None:
+        if json_output:
+            click.echo(json.dumps({"running": False}))
+        else:
+            click.secho("[X] No daemon running", fg="red")
+        sys.exit(1)
+    if not json_output:
+        click.secho("[OK] Daemon running", fg="green")
+    _print_daemon_status({"running": True, **info}, json_output)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # COMMANDS - Convenience Wrappers
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from afd import CommandResult, success, error
+from afd.core import memoize, track_path, tracked_read_text, tree_fingerprint
 from afd.core.metadata import create_source
 from pydantic import BaseModel, Field
 
@@ -210,19 +211,29 @@ def parse_nested_table(table_str: str) -> List[Dict[str, Any]]:
 
 
 def load_all_apis() -> Dict[str, Dict[str, Any]]:
-    """Load all API definitions from the APIDefs folder."""
+    """Load all API definitions from the APIDefs folder.
+
+    Parsed once and reused until an APIDefs file changes; treat the
+    result as read-only.
+    """
     path = get_apidefs_path()
     if not path:
         return {}
+    return _load_apidefs(path)
+
 
+@memoize(max_entries=4)
+def _load_apidefs(path: Path) -> Dict[str, Dict[str, Any]]:
     all_apis = {}
 
+    # Adding or removing a file changes the folder's mtime
+    track_path(path)
     for lua_file in path.glob("*.lua"):
         if lua_file.name in ("table.lua",):  # Skip utility files
             continue
 
         try:
-            content = lua_file.read_text(encoding="utf-8")
+            content = tracked_read_text(lua_file)
             apis = parse_lua_table_simple(content)
             all_apis.update(apis)
         except Exception:
@@ -231,6 +242,12 @@ def load_all_apis() -> Dict[str, Dict[str, Any]]:
     return all_apis
 
 
+def apidefs_fingerprint(input: Dict[str, Any]) -> Optional[str]:
+    """Result-cache fingerprint covering every APIDefs file load_all_apis reads."""
+    path = get_apidefs_path()
+    return tree_fingerprint(path, (".lua",)) if path else None
+
+
 def format_signature(api: Dict[str, Any]) -> str:
     """Generate human-readable signature from API definition."""
     params = api.get("params", [])
@@ -378,6 +395,8 @@ def register_commands(server):
         description="Search WoW APIs by name pattern. Works offline (reads static definitions).",
         input_schema=APISearchInput,
         output_schema=APISearchResult,
+        fingerprint=apidefs_fingerprint,
+        coalesce=True,
     )
     async def api_search(
         input: APISearchInput, context: Any = None
@@ -434,6 +453,8 @@ def register_commands(server):
         description="Get detailed information about a specific WoW API",
         input_schema=APIInfoInput,
         output_schema=APIInfoResult,
+        fingerprint=apidefs_fingerprint,
+        coalesce=True,
     )
     async def api_info(
         input: APIInfoInput, context: Any = None
@@ -457,7 +478,7 @@ def register_commands(server):
             )
 
         # Enrich with signature
-        api["signature"] = format_signature(api)
+        api = {**api, "signature": format_signature(api)}
 
         src = create_source(
             type="file", id="apidefs", title=f"APIDefs/{api['key'].split('.')[0]}.lua"
@@ -474,6 +495,7 @@ def register_commands(server):
         description="List APIs by namespace or category",
         input_schema=APIListInput,
         output_schema=APIListResult,
+        coalesce=True,
     )
     async def api_list(
         input: APIListInput, context: Any = None
@@ -521,6 +543,7 @@ def register_commands(server):
         description="Queue API tests for in-game execution. After running this, /reload in WoW to execute tests.",
         input_schema=APIQueueInput,
         output_schema=APIQueueResult,
+        mutation=True,
     )
     async def api_queue(
         input: APIQueueInput, context: Any = None
@@ -570,6 +593,7 @@ def register_commands(server):
         name="api.stats",
         description="Get statistics about available WoW APIs",
         output_schema=APIStatsResult,
+        coalesce=True,
     )
     async def api_stats(
         input: Dict[str, Any], context: Any = None
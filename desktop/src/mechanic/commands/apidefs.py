@@ -6,6 +6,7 @@ Migrated from ADDON_DEV/Tools/APIPopulator to AFD commands.
 Enhanced with Townlong Yak integration and pure-Python Lua parser.
 """
 
+import asyncio
 import io
 import json
 import os
@@ -18,9 +19,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
-
 from afd import CommandResult, success, error
+from afd.core import report_progress
 from afd.core.metadata import create_source
 from pydantic import BaseModel, Field
 
@@ -506,7 +506,15 @@ async def _api_populate(
     # Parse all documentation files
     files = [f for f in doc_dir.iterdir() if f.name.endswith("Documentation.lua")]
 
-    for file_path in files:
+    for index, file_path in enumerate(files):
+        report_progress(
+            context,
+            f"Parsing {file_path.name}",
+            current=index,
+            total=len(files),
+        )
+        # Let streaming callers flush progress between files
+        await asyncio.sleep(0)
         data = _parse_blizzard_file(lua_exe, dumper_script, file_path)
         if not data or "Functions" not in data:
             continue
@@ -803,6 +811,9 @@ async def _api_download(
     # Construct download URL
     download_url = f"{TOWNLONG_YAK_BASE}/{build_id}/get"
 
+    # Imported here: requests is slow to import and only this command uses it
+    import requests
+
     try:
         # Download the ZIP file
         response = requests.get(download_url, stream=True, timeout=120)
@@ -894,6 +905,9 @@ def register_commands(server):
         description="Parse Blizzard API documentation and generate api_database.json",
         input_schema=APIPopulateInput,
         output_schema=APIPopulateOutput,
+        mutation=True,
+        coalesce=True,
+        execution="thread",
     )(_api_populate)
 
     server.command(
@@ -901,6 +915,8 @@ def register_commands(server):
         description="Generate APIDefs Lua files from api_database.json for Mechanic",
         input_schema=APIGenerateInput,
         output_schema=APIGenerateOutput,
+        mutation=True,
+        coalesce=True,
     )(_api_generate)
 
     server.command(
@@ -908,6 +924,8 @@ def register_commands(server):
         description="Full refresh: parse Blizzard docs and regenerate all APIDefs in one step",
         input_schema=APIRefreshInput,
         output_schema=APIRefreshOutput,
+        mutation=True,
+        coalesce=True,
     )(_api_refresh)
 
     server.command(
@@ -915,4 +933,6 @@ def register_commands(server):
         description="Download FrameXML from Townlong Yak and optionally refresh API definitions",
         input_schema=APIDownloadInput,
         output_schema=APIDownloadOutput,
+        mutation=True,
+        coalesce=True,
     )(_api_download)
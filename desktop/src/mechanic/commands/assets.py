@@ -307,6 +307,8 @@ def register_commands(server):
         description="Sync addon assets: convert PNG to TGA and copy other files from assets_source to assets",
         input_schema=AssetsSyncInput,
         output_schema=AssetsSyncOutput,
+        mutation=True,
+        coalesce=True,
     )(_assets_sync)
 
     server.command(
@@ -5,12 +5,14 @@ Scans and searches Blizzard UI atlas icons.
 Migrated from ADDON_DEV/Tools/AtlasScanner.
 """
 
+import asyncio
 import json
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from afd import CommandResult, success, error
+from afd.core import file_fingerprint, report_progress
 from afd.core.metadata import create_source
 from pydantic import BaseModel, Field
 
@@ -71,6 +73,9 @@ class AtlasSearchOutput(BaseModel):
 XML_ATLAS_RE = re.compile(r'atlas\s*=\s*"([^"]+)"', re.IGNORECASE)
 LUA_ATLAS_RE = re.compile(r'SetAtlas\s*\(\s*"([^"]+)"', re.IGNORECASE)
 
+# Report scan progress every N files
+PROGRESS_INTERVAL = 200
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
@@ -115,6 +120,12 @@ def _find_atlas_index() -> Optional[Path]:
     return None
 
 
+def _atlas_index_fingerprint(input: Dict[str, Any]) -> Any:
+    """Result-cache fingerprint for the atlas index atlas.search reads."""
+    index_path = _find_atlas_index()
+    return file_fingerprint(index_path) if index_path else None
+
+
 def _wildcard_to_regex(pattern: str) -> re.Pattern:
     """Convert a wildcard pattern to regex."""
     # Escape special regex chars except *
@@ -172,9 +183,17 @@ async def _atlas_scan(
     xml_count = 0
     lua_count = 0
 
-    for file_path in addons_path.rglob("*"):
-        if file_path.suffix not in [".xml", ".lua"]:
-            continue
+    source_files = [p for p in addons_path.rglob("*") if p.suffix in (".xml", ".lua")]
+    for index, file_path in enumerate(source_files):
+        if index % PROGRESS_INTERVAL == 0:
+            report_progress(
+                context,
+                f"Scanning {file_path.parent.name}",
+                current=index,
+                total=len(source_files),
+            )
+            # Let streaming callers flush progress between batches
+            await asyncio.sleep(0)
 
         try:
             content = file_path.read_text(encoding="utf-8", errors="ignore")
@@ -336,6 +355,8 @@ def register_commands(server):
         description="Scan wow-ui-source for atlas icons and generate searchable index",
         input_schema=AtlasScanInput,
         output_schema=AtlasScanOutput,
+        mutation=True,
+        coalesce=True,
     )(_atlas_scan)
 
     server.command(
@@ -343,4 +364,6 @@ def register_commands(server):
         description="Search Blizzard UI atlas icons by name pattern (supports wildcards)",
         input_schema=AtlasSearchInput,
         output_schema=AtlasSearchOutput,
+        fingerprint=_atlas_index_fingerprint,
+        coalesce=True,
     )(_atlas_search)
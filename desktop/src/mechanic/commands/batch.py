@@ -0,0 +1,118 @@
+"""
+Batch execution command for Mechanic Desktop.
+
+Runs several commands in one call - typically the pre-commit checks
+(addon.validate, addon.lint, addon.deadcode, addon.security,
+addon.complexity, addon.deprecations) - concurrently where their
+dependencies allow, and returns every result together.
+"""
+
+import time
+from typing import Any, List
+
+from afd import CommandResult, success, error
+from afd.core import BatchError, BatchStep, BatchStepResult, report_progress, run_batch
+from pydantic import BaseModel, Field
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCHEMAS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class BatchRunInput(BaseModel):
+    steps: List[BatchStep] = Field(
+        ...,
+        min_length=1,
+        description="Commands to run: {command, input, id?, depends_on?}",
+    )
+    max_concurrency: int = Field(
+        default=4, ge=1, le=16, description="Most commands running at once"
+    )
+    stop_on_error: bool = Field(
+        default=False, description="Skip commands not yet started once one fails"
+    )
+
+
+class BatchRunOutput(BaseModel):
+    results: List[BatchStepResult] = Field(
+        ..., description="One result per step, in request order"
+    )
+    succeeded: int
+    failed: int
+    skipped: int
+    duration_ms: float = Field(..., description="Wall time for the whole batch")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMANDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def register_commands(server):
+    """Register batch execution commands."""
+
+    @server.command(
+        name="batch.run",
+        description="Run several commands in one call, concurrently where depends_on allows",
+        input_schema=BatchRunInput,
+        output_schema=BatchRunOutput,
+        tags=["batch"],
+        mutation=True,
+    )
+    async def batch_run(
+        input: BatchRunInput, context: Any = None
+    ) -> CommandResult[BatchRunOutput]:
+        if any(step.command == "batch.run" for step in input.steps):
+            return error(
+                code="INVALID_BATCH",
+                message="batch.run cannot be nested inside a batch",
+                suggestion="Flatten the steps into a single batch",
+            )
+
+        def step_done(result: BatchStepResult, finished: int, total: int) -> None:
+            report_progress(
+                context,
+                f"{result.id}: {result.status}",
+                current=finished,
+                total=total,
+                partial={"id": result.id, "status": result.status},
+            )
+
+        start = time.perf_counter()
+        try:
+            results = await run_batch(
+                server.execute,
+                input.steps,
+                max_concurrency=input.max_concurrency,
+                stop_on_error=input.stop_on_error,
+                on_step_done=step_done,
+            )
+        except BatchError as e:
+            return error(
+                code="INVALID_BATCH",
+                message=str(e),
+                suggestion="Check step ids and depends_on references",
+            )
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        counts = {"success": 0, "failure": 0, "skipped": 0}
+        for result in results:
+            counts[result.status] += 1
+
+        reasoning = f"{counts['success']}/{len(results)} commands succeeded in {duration_ms:.0f}ms"
+        problems = [r.id for r in results if r.status != "success"]
+        if problems:
+            reasoning += f"; not successful: {', '.join(problems)}"
+
+        return success(
+            data=BatchRunOutput(
+                results=results,
+                succeeded=counts["success"],
+                failed=counts["failure"],
+                skipped=counts["skipped"],
+                duration_ms=duration_ms,
+            ),
+            reasoning=reasoning,
+            confidence=1.0,
+        )
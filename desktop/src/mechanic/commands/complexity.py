@@ -20,7 +20,7 @@ import re
 import time
 import hashlib
 
-from ..config import find_addon_path
+from ..config import addon_fingerprint, find_addon_path
 from ..lua_analyzer import Confidence
 
 
@@ -580,6 +580,9 @@ def register_commands(server):
         description="Detect code complexity issues in a WoW addon (nesting, long functions, magic numbers)",
         input_schema=ComplexityInput,
         output_schema=ComplexityResult,
+        fingerprint=addon_fingerprint,
+        execution="process",
+        coalesce=True,
     )
     async def analyze_complexity(
         input: ComplexityInput, context: Any = None
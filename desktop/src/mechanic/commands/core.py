@@ -7,6 +7,8 @@ from typing import Dict, Any, List, Optional
 import time
 import os
 import asyncio
+import functools
+import importlib
 
 # Create the AFD server instance
 server = create_server(name="mechanic-desktop", version="0.1.0")
@@ -43,6 +45,7 @@ class ShutdownOutput(BaseModel):
     description="Parse a WoW SavedVariables file and extract !Mechanic data",
     input_schema=ParseInput,
     output_schema=SavedVariables,
+    timeout_ms=30_000,
 )
 async def parse_sv(
     input: ParseInput, context: Any = None
@@ -57,9 +60,16 @@ async def parse_sv(
             suggestion="Ensure the path is correct and World of Warcraft has written the file.",
         )
 
+    # The watcher passes an IngestTrace so read/parse stages can be timed
+    trace = getattr(context, "extra", {}).get("ingest_trace") if context else None
+
     try:
-        content = file_path_obj.read_text(encoding="utf-8")
-        data = parse_savedvariables(content)
+        # Off the event loop: large files take a while, and past the
+        # deadline the caller gets TIMEOUT instead of waiting it out
+        content = await asyncio.to_thread(file_path_obj.read_text, encoding="utf-8")
+        if trace:
+            trace.mark("read")
+        data = await asyncio.to_thread(parse_savedvariables, content)
 
         # Logic from watcher moved to command for compliance
         var_name = file_path_obj.stem
@@ -103,6 +113,9 @@ async def parse_sv(
                         tests.append(test_entry)
                 addon_data["tests"] = tests
 
+        if trace:
+            trace.mark("parse")
+
         src = create_source(
             type="file",
             id=f"sv-{var_name}",
@@ -161,6 +174,7 @@ async def get_metrics(
     name="sv.discover",
     description="Automatically discover SavedVariables paths for all WoW flavors",
     output_schema=DiscoverOutput,
+    coalesce=True,
 )
 async def discover_sv(
     input: Dict[str, Any], context: Any = None
@@ -199,6 +213,7 @@ async def discover_sv(
     name="server.shutdown",
     description="Gracefully shut down the Mechanic Desktop server",
     output_schema=ShutdownOutput,
+    mutation=True,
 )
 async def shutdown_server(
     input: Dict[str, Any], context: Any = None
@@ -223,114 +238,121 @@ async def shutdown_server(
     )
 
 
+# Command modules and the function each uses to register its commands,
+# in registration order
+COMMAND_MODULES = {
+    "development": "register_commands",
+    "release": "register_commands",
+    "locale": "register_commands",
+    "atlas": "register_commands",
+    "environment": "register_commands",
+    "tools": "register_tools_commands",
+    "output": "register_commands",
+    "docs": "register_commands",
+    "api": "register_commands",
+    "lua": "register_commands",
+    "sandbox": "register_commands",
+    "research": "register_commands",  # Gemini API
+    "assets": "register_commands",
+    "perf": "register_commands",
+    "apidefs": "register_commands",
+    "fencore": "register_commands",
+    "deadcode": "register_commands",
+    "staledocs": "register_commands",
+    "security": "register_commands",
+    "complexity": "register_commands",
+    "diagnostics": "register_commands",
+    "batch": "register_commands",
+}
+
 # Flag to track if commands have been registered
 _commands_registered = False
 
+# Command modules imported and registered so far
+_loaded_modules = set()
 
-def get_server():
-    global _commands_registered
-
-    if not _commands_registered:
-        # Register development commands from the development module
-        from . import development
-
-        development.register_commands(server)
-
-        # Register release pipeline commands
-        from . import release
-
-        release.register_commands(server)
-
-        # Register locale commands
-        from . import locale
-
-        locale.register_commands(server)
-
-        # Register atlas commands
-        from . import atlas
-
-        atlas.register_commands(server)
-
-        # Register environment commands
-        from . import environment
-
-        environment.register_commands(server)
-
-        # Register tool management commands
-        from . import tools
-
-        tools.register_tools_commands(server)
-
-        # Register addon output command (AFD)
-        from . import output
-
-        output.register_commands(server)
-
-        # Register documentation generation commands
-        from . import docs
+# name -> module/description/tags for every command (see manifest.py)
+_manifest: Optional[Dict[str, Any]] = None
 
-        docs.register_commands(server)
 
-        # Register API reference commands
-        from . import api
+def _load_module(module: str) -> None:
+    """Import a command module and register its commands (once)."""
+    if module in _loaded_modules:
+        return
+    _loaded_modules.add(module)
+    imported = importlib.import_module(f".{module}", __package__)
+    getattr(imported, COMMAND_MODULES[module])(server)
 
-        api.register_commands(server)
 
-        # Register Lua eval commands
-        from . import lua
+def _register_all() -> Dict[str, List[Any]]:
+    """Register every module now; returns the commands each one added."""
+    registered = {"core": server.list_commands()}
+    for module in COMMAND_MODULES:
+        before = {c.name for c in server.list_commands()}
+        _load_module(module)
+        registered[module] = [c for c in server.list_commands() if c.name not in before]
+    return registered
 
-        lua.register_commands(server)
 
-        # Register sandbox testing commands
-        from . import sandbox
-
-        sandbox.register_commands(server)
-
-        # Register research commands (Gemini API)
-        from . import research
-
-        research.register_commands(server)
-
-        # Register asset management commands
-        from . import assets
-
-        assets.register_commands(server)
-
-        # Register performance profiling commands
-        from . import perf
-
-        perf.register_commands(server)
-
-        # Register API definition generation commands
-        from . import apidefs
-
-        apidefs.register_commands(server)
-
-        # Register FenCore catalog commands
-        from . import fencore
-
-        fencore.register_commands(server)
-
-        # Register dead code detection commands
-        from . import deadcode
+def get_server():
+    """Get the Mechanic AFD server.
 
-        deadcode.register_commands(server)
+    Command modules are registered lazily: a cached manifest says which
+    module provides each command, and a module is imported only when one
+    of its commands is executed or looked up, or all commands are listed.
+    """
+    global _commands_registered, _manifest
 
-        # Register stale documentation detection commands
-        from . import staledocs
+    if not _commands_registered:
+        from . import manifest as command_manifest
+
+        fingerprint = command_manifest.source_fingerprint()
+        path = command_manifest.manifest_path()
+        _manifest = command_manifest.load_manifest(path, fingerprint)
+
+        if _manifest is None:
+            # First run or a command module changed: import everything once
+            _manifest = command_manifest.build_manifest(fingerprint, _register_all())
+            command_manifest.save_manifest(path, _manifest)
+        else:
+            by_module: Dict[str, List[str]] = {}
+            for name, entry in _manifest["commands"].items():
+                by_module.setdefault(entry["module"], []).append(name)
+            for module, names in by_module.items():
+                if module in COMMAND_MODULES:
+                    server.register_lazy(names, functools.partial(_load_module, module))
+
+        # Apply result cache settings
+        from ..config import get_config
+
+        cache_settings = get_config().cache
+        server.cache.enabled = cache_settings["enabled"]
+        server.cache.max_entries = cache_settings["max_entries"]
+
+        # Worker processes re-create this server to run process commands
+        executor_settings = get_config().executors
+        server.executors.configure(
+            thread_workers=executor_settings["thread_workers"],
+            process_workers=executor_settings["process_workers"],
+            server_ref="mechanic.commands.core:get_server",
+        )
 
-        staledocs.register_commands(server)
+        # Queue tool-spawning commands rather than oversubscribing the CPU
+        for tag, limit in get_config().concurrency["tags"].items():
+            server.limits.set_tag_limit(tag, limit)
 
-        # Register security analysis commands
-        from . import security
+        _commands_registered = True
 
-        security.register_commands(server)
+    return server
 
-        # Register complexity analysis commands
-        from . import complexity
 
-        complexity.register_commands(server)
+def list_command_summaries():
+    """Name, description and tags of every command, without loading any.
 
-        _commands_registered = True
+    Returns:
+        List of manifest.CommandSummary, sorted by name.
+    """
+    from .manifest import summaries
 
-    return server
+    get_server()
+    return summaries(_manifest)
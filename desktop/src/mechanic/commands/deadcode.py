@@ -15,16 +15,18 @@ Comprehensive analysis to find:
 """
 
 from afd import CommandResult, success, error
+from afd.core import report_progress
 from afd.core.metadata import create_source
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from enum import Enum
+import asyncio
 import re
 import time
 import xml.etree.ElementTree as ET
 
-from ..config import find_addon_path
+from ..config import addon_fingerprint, find_addon_path
 from ..lua_analyzer import (
     LuaAnalyzer,
     TokenScanner,
@@ -679,11 +681,23 @@ def find_stale_event_handlers(
 
 
 def analyze_addon(
-    addon_path: Path, addon_name: str, input: DeadCodeInput
+    addon_path: Path,
+    addon_name: str,
+    input: DeadCodeInput,
+    progress: Optional[Callable[..., None]] = None,
 ) -> DeadCodeResult:
-    """Run comprehensive dead code analysis on an addon."""
+    """Run comprehensive dead code analysis on an addon.
+
+    ``progress`` is called with ``report_progress`` keyword arguments as
+    files are parsed and after each detector, with that detector's issues
+    as partial results.
+    """
     start_time = time.time()
 
+    def report(message: str, **kwargs) -> None:
+        if progress:
+            progress(message=message, **kwargs)
+
     # Get files to analyze
     all_lua_files = list(get_all_lua_files(addon_path, addon_name))
     loaded_files = get_loaded_files(addon_path, addon_name)
@@ -692,7 +706,8 @@ def analyze_addon(
     analyzer = LuaAnalyzer(addon_name)
     files_content: Dict[Path, str] = {}
 
-    for lua_file in all_lua_files:
+    for index, lua_file in enumerate(all_lua_files):
+        report(f"Parsing {lua_file.name}", current=index, total=len(all_lua_files))
         try:
             content = lua_file.read_text(encoding="utf-8", errors="replace")
             files_content[lua_file] = content
@@ -704,34 +719,61 @@ def analyze_addon(
     all_issues: List[DeadCodeIssue] = []
     categories = input.categories or [c.value for c in DeadCodeCategory]
 
-    # Run each detector based on requested categories
-    if DeadCodeCategory.ORPHANED_FILE.value in categories:
-        all_issues.extend(find_orphaned_files(addon_path, addon_name))
-
-    if DeadCodeCategory.UNUSED_FUNCTION.value in categories:
-        all_issues.extend(find_unused_functions(analyzer, addon_path))
-
-    if DeadCodeCategory.UNUSED_LOCAL.value in categories:
-        all_issues.extend(find_unused_locals(analyzer, addon_path))
-
-    if DeadCodeCategory.UNUSED_LIBRARY.value in categories:
-        all_issues.extend(find_unused_libraries(addon_path, addon_name, analyzer))
-
-    if DeadCodeCategory.UNUSED_LOCALE.value in categories:
-        all_issues.extend(find_unused_locale_strings(addon_path, analyzer))
-
-    if DeadCodeCategory.UNREACHABLE_CODE.value in categories:
-        all_issues.extend(find_unreachable_code(addon_path, all_lua_files))
-
-    if DeadCodeCategory.COMMENTED_CODE.value in categories:
-        all_issues.extend(find_commented_code_blocks(addon_path, all_lua_files))
-
-    if DeadCodeCategory.DEAD_EXPORT.value in categories:
-        all_issues.extend(find_dead_exports(analyzer, addon_path, addon_name))
+    # Detectors in run order
+    detectors = [
+        (
+            DeadCodeCategory.ORPHANED_FILE,
+            lambda: find_orphaned_files(addon_path, addon_name),
+        ),
+        (
+            DeadCodeCategory.UNUSED_FUNCTION,
+            lambda: find_unused_functions(analyzer, addon_path),
+        ),
+        (
+            DeadCodeCategory.UNUSED_LOCAL,
+            lambda: find_unused_locals(analyzer, addon_path),
+        ),
+        (
+            DeadCodeCategory.UNUSED_LIBRARY,
+            lambda: find_unused_libraries(addon_path, addon_name, analyzer),
+        ),
+        (
+            DeadCodeCategory.UNUSED_LOCALE,
+            lambda: find_unused_locale_strings(addon_path, analyzer),
+        ),
+        (
+            DeadCodeCategory.UNREACHABLE_CODE,
+            lambda: find_unreachable_code(addon_path, all_lua_files),
+        ),
+        (
+            DeadCodeCategory.COMMENTED_CODE,
+            lambda: find_commented_code_blocks(addon_path, all_lua_files),
+        ),
+        (
+            DeadCodeCategory.DEAD_EXPORT,
+            lambda: find_dead_exports(analyzer, addon_path, addon_name),
+        ),
+        (
+            DeadCodeCategory.STALE_EVENT,
+            lambda: find_stale_event_handlers(addon_path, analyzer, files_content),
+        ),
+    ]
+    detectors = [(c, d) for c, d in detectors if c.value in categories]
 
-    if DeadCodeCategory.STALE_EVENT.value in categories:
-        all_issues.extend(
-            find_stale_event_handlers(addon_path, analyzer, files_content)
+    # Run each detector based on requested categories
+    for index, (category, detector) in enumerate(detectors):
+        found = detector()
+        all_issues.extend(found)
+        if not input.include_suspicious:
+            found = [i for i in found if i.confidence != Confidence.SUSPICIOUS.value]
+        report(
+            f"Checked {category.value.replace('_', ' ')}",
+            current=index + 1,
+            total=len(detectors),
+            partial={
+                "category": category.value,
+                "issues": [i.model_dump() for i in found[:100]],
+            },
         )
 
     # Filter by confidence if requested
@@ -774,6 +816,8 @@ def register_commands(server):
         description="Detect dead code in a WoW addon (unused functions, orphaned files, etc.)",
         input_schema=DeadCodeInput,
         output_schema=DeadCodeResult,
+        fingerprint=addon_fingerprint,
+        coalesce=True,
     )
     async def detect_deadcode(
         input: DeadCodeInput, context: Any = None
@@ -787,7 +831,14 @@ def register_commands(server):
                 suggestion="Check the addon name or provide an explicit path with the 'path' parameter",
             )
 
-        result = analyze_addon(addon_path, input.addon, input)
+        # Run off the event loop so progress reaches streaming callers live
+        result = await asyncio.to_thread(
+            analyze_addon,
+            addon_path,
+            input.addon,
+            input,
+            lambda message, **kwargs: report_progress(context, message, **kwargs),
+        )
 
         src = create_source(
             type="analysis",
@@ -4,7 +4,9 @@ Migrated from ADDON_DEV/Tools to first-class AFD commands.
 """
 
 from afd import CommandResult, success, error
+from afd.core.memo import memoize, track_path, tracked_open, tracked_read_text
 from afd.core.metadata import create_source, create_warning, WarningSeverity
+from afd.core.process import run_process
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
@@ -52,9 +54,13 @@ REQUIRED_FIELDS = ["Title", "Version"]
 RECOMMENDED_FIELDS = ["Notes", "Author"]
 
 
+@memoize(max_entries=256)
 def parse_toc_file(toc_path: Path) -> Dict[str, Any]:
-    """Parse a .toc file and extract metadata and file list."""
-    content = toc_path.read_text(encoding="utf-8", errors="replace")
+    """Parse a .toc file and extract metadata and file list.
+
+    Cached per path until the file changes; treat the result as read-only.
+    """
+    content = tracked_read_text(toc_path, errors="replace")
     lines = content.splitlines()
 
     metadata = {}
@@ -209,6 +215,7 @@ def register_commands(server):
         description="Validate a WoW addon's .toc file for common issues",
         input_schema=AddonInput,
         output_schema=ValidationResult,
+        coalesce=True,
     )
     async def validate_addon(
         input: AddonInput, context: Any = None
@@ -286,6 +293,8 @@ def register_commands(server):
         description="Run Luacheck linter on a WoW addon",
         input_schema=LintInput,
         output_schema=LintResult,
+        tags=["subprocess"],
+        timeout_ms=90_000,
     )
     async def lint_addon(
         input: LintInput, context: Any = None
@@ -326,12 +335,7 @@ def register_commands(server):
 
         # Run luacheck
         try:
-            result = subprocess.run(
-                lint_cmd,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
+            result = await run_process(lint_cmd, timeout=60)
         except subprocess.TimeoutExpired:
             return error(
                 code="TIMEOUT",
@@ -406,6 +410,10 @@ def register_commands(server):
         description="Run StyLua formatter on a WoW addon",
         input_schema=FormatInput,
         output_schema=FormatResult,
+        mutation=True,
+        coalesce=True,
+        tags=["subprocess"],
+        timeout_ms=90_000,
     )
     async def format_addon(
         input: FormatInput, context: Any = None
@@ -438,7 +446,7 @@ def register_commands(server):
         cmd.append(str(addon_path))
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = await run_process(cmd, timeout=60)
         except subprocess.TimeoutExpired:
             return error(
                 code="TIMEOUT",
@@ -507,6 +515,9 @@ def register_commands(server):
         description="Run Busted unit tests on a WoW addon",
         input_schema=TestInput,
         output_schema=TestResult,
+        tags=["subprocess"],
+        timeout_ms=150_000,
+        max_concurrency=2,
     )
     async def test_addon(
         input: TestInput, context: Any = None
@@ -567,9 +578,7 @@ def register_commands(server):
 
 
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=120, cwd=str(addon_path)
-            )
+            result = await run_process(cmd, timeout=120, cwd=addon_path)
         except FileNotFoundError:
             return error(
                 code="TOOL_NOT_FOUND",
@@ -677,17 +686,22 @@ def register_commands(server):
         by_severity: Dict[str, int] = {}
         database_version: str = ""
 
+    @memoize(max_entries=1)
     def load_deprecated_apis() -> tuple[Dict, str]:
-        """Load deprecated APIs from JSON database."""
+        """Load deprecated APIs from JSON database (cached until it changes).
+
+        Treat the result as read-only.
+        """
         import json
 
         # Try to load from data directory
         data_dir = Path(__file__).parent.parent.parent.parent / "data"
         db_path = data_dir / "deprecated_apis.json"
 
+        track_path(db_path)
         if db_path.exists():
             try:
-                with open(db_path, encoding="utf-8") as f:
+                with tracked_open(db_path, encoding="utf-8") as f:
                     data = json.load(f)
                     apis = {}
                     for entry in data.get("apis", []):
@@ -732,6 +746,7 @@ def register_commands(server):
         description="Scan a WoW addon for deprecated API calls (100+ APIs, 11.0-12.0)",
         input_schema=DeprecationInput,
         output_schema=DeprecationResult,
+        coalesce=True,
     )
     async def scan_deprecations(
         input: DeprecationInput, context: Any = None
@@ -0,0 +1,276 @@
+"""
+AFD commands for runtime diagnostics of the Mechanic Desktop server.
+"""
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from afd.core import CommandResult, CommandContext, success
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCHEMAS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class WatcherStatsInput(BaseModel):
+    """Input for watcher.stats command."""
+
+    reset: bool = Field(
+        default=False, description="Clear the histograms after reading them"
+    )
+
+
+class WatcherStatsOutput(BaseModel):
+    """Ingest pipeline latency histograms."""
+
+    stages: Dict[str, Dict[str, Any]] = Field(
+        ...,
+        description="Per-stage latency summary in ms (fs_event, debounce, read, parse, storage, broadcast)",
+    )
+    total: Dict[str, Any] = Field(
+        ..., description="End-to-end latency from filesystem event to broadcast"
+    )
+    completed: int = Field(..., description="Reloads that reached the dashboard")
+    skipped: int = Field(
+        ..., description="Changes dropped before broadcast (no data or errors)"
+    )
+    last: Optional[Dict[str, Any]] = Field(
+        None, description="Stage timings for the most recent change"
+    )
+
+
+class WsStatsInput(BaseModel):
+    """Input for ws.stats command."""
+
+    pass
+
+
+class WsStatsOutput(BaseModel):
+    """Dashboard WebSocket fan-out state."""
+
+    clients: int = Field(..., description="Connected WebSocket clients")
+    policy: str = Field(
+        ..., description="Slow-consumer policy (drop_oldest, latest, disconnect)"
+    )
+    max_queue: int = Field(..., description="Outbound queue limit per client")
+    broadcasts: int = Field(..., description="Messages broadcast since startup")
+    queued: int = Field(..., description="Messages waiting across all clients")
+    dropped: int = Field(
+        ..., description="Messages discarded by the slow-consumer policy"
+    )
+    slow_disconnects: int = Field(
+        ..., description="Clients disconnected for falling behind or failing sends"
+    )
+    seq: int = Field(0, description="Sequence number of the latest broadcast")
+    replay_buffered: int = Field(
+        0, description="Broadcasts held for reconnecting clients"
+    )
+    resumes: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Reconnects served by replaying missed events vs. a full snapshot",
+    )
+    encodings: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Frames, bytes and encode time per frame encoding (json, packed)",
+    )
+    per_client: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Queue depth and counters per client"
+    )
+
+
+class CacheStatsInput(BaseModel):
+    """Input for cache.stats command."""
+
+    clear: bool = Field(
+        default=False, description="Drop all cached results after reading stats"
+    )
+
+
+class CacheStatsOutput(BaseModel):
+    """Command result cache state."""
+
+    enabled: bool = Field(..., description="Whether results are being cached")
+    entries: int = Field(..., description="Cached results")
+    max_entries: int = Field(..., description="Cache size limit")
+    hits: int = Field(..., description="Calls answered from the cache")
+    misses: int = Field(..., description="Calls that ran the command")
+    evictions: int = Field(..., description="Results evicted to stay under the limit")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+    commands: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict, description="Hits, misses and hit ratio per command"
+    )
+    coalesced: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Calls per command that shared an identical call already in flight",
+    )
+    memo: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Memoized loaders (APIDefs, TOC files, FenCore catalog): hits, misses, invalidations",
+    )
+
+
+class ServerDiagnosticsInput(BaseModel):
+    """Input for server.diagnostics command."""
+
+    reset: bool = Field(
+        default=False, description="Clear recorded lag and stalls after reading them"
+    )
+
+
+class ServerDiagnosticsOutput(BaseModel):
+    """Event-loop health of the running server."""
+
+    running: bool = Field(
+        ..., description="Whether the loop monitor is active in this process"
+    )
+    interval_ms: float = Field(..., description="How often the loop is checked")
+    threshold_ms: float = Field(..., description="Lag that counts as a stall")
+    lag: Dict[str, Any] = Field(..., description="Event-loop lag summary in ms")
+    stalls: int = Field(..., description="Stalls recorded")
+    offenders: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Commands (or tasks) that blocked the loop, worst first, with the stack they blocked in",
+    )
+    recent: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Most recent stalls"
+    )
+    executors: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Worker pool sizes and executions completed per mode (inline/thread/process)",
+    )
+    concurrency: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Per-command and per-tag concurrency limits: running, queue depth and wait times",
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMANDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def register_commands(server):
+    """Register diagnostics commands."""
+
+    @server.command(
+        name="watcher.stats",
+        description="Get SavedVariables ingest latency histograms (file write to WebSocket delivery)",
+        input_schema=WatcherStatsInput,
+        output_schema=WatcherStatsOutput,
+        tags=["watcher", "diagnostics"],
+    )
+    async def watcher_stats(
+        input: WatcherStatsInput, context: CommandContext
+    ) -> CommandResult:
+        """Report per-stage timings collected by the file watcher."""
+        from ..metrics import ingest_stats
+
+        snapshot = ingest_stats.snapshot()
+        if input.reset:
+            ingest_stats.reset()
+
+        output = WatcherStatsOutput(**snapshot)
+        total = snapshot["total"]
+
+        if not snapshot["completed"]:
+            reasoning = "No reloads have been ingested yet. Do /reload in-game with the dashboard running."
+        else:
+            reasoning = (
+                f"{snapshot['completed']} reload(s) ingested, "
+                f"p50 {total['p50']}ms / p95 {total['p95']}ms end-to-end"
+            )
+
+        return success(data=output, reasoning=reasoning, confidence=1.0)
+
+    @server.command(
+        name="ws.stats",
+        description="Get dashboard WebSocket queue depths, slow-consumer drops and frame sizes per encoding",
+        input_schema=WsStatsInput,
+        output_schema=WsStatsOutput,
+        tags=["websocket", "diagnostics"],
+    )
+    async def ws_stats(input: WsStatsInput, context: CommandContext) -> CommandResult:
+        """Report per-client send queue state for the dashboard server."""
+        from ..server import manager
+
+        stats = manager.stats()
+        output = WsStatsOutput(**stats)
+
+        reasoning = (
+            f"{stats['clients']} client(s) connected, {stats['queued']} message(s) queued, "
+            f"{stats['dropped']} dropped ({stats['policy']} policy)"
+        )
+        return success(data=output, reasoning=reasoning, confidence=1.0)
+
+    @server.command(
+        name="cache.stats",
+        description="Get command result cache hit rates and coalesced duplicate calls (api.search, addon.deadcode...)",
+        input_schema=CacheStatsInput,
+        output_schema=CacheStatsOutput,
+        tags=["cache", "diagnostics"],
+    )
+    async def cache_stats(
+        input: CacheStatsInput, context: CommandContext
+    ) -> CommandResult:
+        """Report result cache hit rates, overall and per command."""
+        from afd.core.memo import clear_memos, memo_stats
+
+        stats = server.cache.stats()
+        memo = memo_stats()
+        if input.clear:
+            server.cache.invalidate()
+            clear_memos()
+
+        coalesced = dict(getattr(server.registry, "coalesced", {}))
+        output = CacheStatsOutput(**stats, coalesced=coalesced, memo=memo)
+        reasoning = (
+            f"{stats['hits']} hit(s), {stats['misses']} miss(es) "
+            f"({stats['hit_ratio']:.0%} hit ratio), {stats['entries']} result(s) cached, "
+            f"{sum(coalesced.values())} call(s) coalesced"
+        )
+        return success(data=output, reasoning=reasoning, confidence=1.0)
+
+    @server.command(
+        name="server.diagnostics",
+        description="Find commands that block the server's event loop (synchronous subprocess calls, file I/O, CPU-heavy scans)",
+        input_schema=ServerDiagnosticsInput,
+        output_schema=ServerDiagnosticsOutput,
+        tags=["server", "diagnostics"],
+    )
+    async def server_diagnostics(
+        input: ServerDiagnosticsInput, context: CommandContext
+    ) -> CommandResult:
+        """Report event-loop lag and the commands that caused stalls."""
+        from ..metrics import loop_monitor
+
+        snapshot = loop_monitor.snapshot()
+        if input.reset:
+            loop_monitor.reset()
+
+        output = ServerDiagnosticsOutput(
+            **snapshot,
+            executors=server.executors.snapshot(),
+            concurrency=server.limits.snapshot(),
+        )
+        lag = snapshot["lag"]
+
+        if not snapshot["running"] and not lag["count"]:
+            reasoning = (
+                "The loop monitor isn't running in this process. It runs inside "
+                "`mech dashboard` and `mech mcp`; query those servers instead."
+            )
+        elif not snapshot["stalls"]:
+            reasoning = (
+                f"No stalls over {snapshot['threshold_ms']}ms; "
+                f"loop lag p99 {lag['p99']}ms"
+            )
+        else:
+            worst = snapshot["offenders"][0]
+            reasoning = (
+                f"{snapshot['stalls']} stall(s) over {snapshot['threshold_ms']}ms. "
+                f"Worst: {worst['source']} ({worst['stalls']} stall(s), "
+                f"up to {worst['max_ms']:.0f}ms). Move blocking work to "
+                "asyncio.to_thread, and subprocesses to afd.core.run_process."
+            )
+
+        return success(data=output, reasoning=reasoning, confidence=1.0)
@@ -243,6 +243,8 @@ def register_commands(server):
         description="Generate CLI reference documentation from registered commands",
         input_schema=DocsGenerateInput,
         output_schema=DocsGenerateOutput,
+        mutation=True,
+        coalesce=True,
     )
     async def generate_docs(
         input: DocsGenerateInput, context: Any = None
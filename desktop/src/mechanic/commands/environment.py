@@ -4,10 +4,12 @@ Handles addon creation, junction syncing, and library management.
 """
 
 from afd import CommandResult, success, error
+from afd.core import report_progress
 from afd.core.metadata import create_source, create_warning, WarningSeverity
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional
+import asyncio
 import subprocess
 import shutil
 
@@ -45,6 +47,7 @@ def register_commands(server):
         description="Create a new WoW addon from a template",
         input_schema=AddonCreateInput,
         output_schema=AddonCreateResult,
+        mutation=True,
     )
     async def create_addon(
         input: AddonCreateInput, context: Any = None
@@ -193,6 +196,8 @@ def register_commands(server):
         description="Create junction links from development addon to WoW client folders",
         input_schema=AddonSyncInput,
         output_schema=AddonSyncResult,
+        mutation=True,
+        coalesce=True,
     )
     async def sync_addon(
         input: AddonSyncInput, context: Any = None
@@ -482,6 +487,7 @@ def register_commands(server):
         description="Creates a libs.json config file from currently installed libraries. ⚠️ Will NOT overwrite existing config unless overwrite=true is set.",
         input_schema=LibsInitInput,
         output_schema=LibsInitResult,
+        mutation=True,
     )
     async def init_libs(
         input: LibsInitInput, context: Any = None
@@ -659,6 +665,8 @@ def register_commands(server):
         description="Sync addon libraries based on libs.json config",
         input_schema=LibsSyncInput,
         output_schema=LibsSyncResult,
+        mutation=True,
+        coalesce=True,
     )
     async def sync_libs(
         input: LibsSyncInput, context: Any = None
@@ -728,7 +736,15 @@ def register_commands(server):
 
         if mode == "include":
             # Process configured libraries
-            for lib_name, lib_config in configured_libs.items():
+            for index, (lib_name, lib_config) in enumerate(configured_libs.items()):
+                report_progress(
+                    context,
+                    f"Syncing {lib_name}",
+                    current=index,
+                    total=len(configured_libs),
+                )
+                # Let streaming callers flush progress between libraries
+                await asyncio.sleep(0)
                 target_path = libs_path / lib_name
                 version = _get_lib_version_config(lib_config)
 
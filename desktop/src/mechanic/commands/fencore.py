@@ -7,9 +7,11 @@ Provides MCP-discoverable catalog of FenCore logic domains:
 - fencore-info: Get detailed function info
 """
 
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from afd import CommandResult, success, error
+from afd.core.memo import memoize, track_path, tracked_read_text
 from afd.core.metadata import create_source
 from pydantic import BaseModel, Field
 
@@ -90,18 +92,26 @@ def get_fencore_catalog() -> Optional[Dict]:
     Get FenCore catalog from MechanicDB.
 
     FenCore registers its catalog with MechanicLib, which syncs to MechanicDB.
+    The SavedVariables file is parsed again only after WoW rewrites it;
+    treat the result as read-only.
     """
     config = get_config()
     if not config.wtf_path:
         return None
 
     # Find MechanicDB SavedVariables
-    sv_path = config.wtf_path / "SavedVariables" / "!Mechanic.lua"
+    return _load_fencore_catalog(config.wtf_path / "SavedVariables" / "!Mechanic.lua")
+
+
+@memoize(max_entries=4)
+def _load_fencore_catalog(sv_path: Path) -> Optional[Dict]:
+    # Tracked even when missing, so the first /reload picks it up
+    track_path(sv_path)
     if not sv_path.exists():
         return None
 
     try:
-        content = sv_path.read_text(encoding="utf-8")
+        content = tracked_read_text(sv_path)
         sv_data = parse_savedvariables(content)
         mechanic_db = sv_data.get("MechanicDB", {})
         registered = mechanic_db.get("registered", {})
@@ -129,6 +139,7 @@ def register_commands(server):
         description="Get full catalog of FenCore logic domains and functions",
         input_schema=CatalogInput,
         output_schema=CatalogOutput,
+        coalesce=True,
     )
     async def fencore_catalog(
         input: CatalogInput, context: Any = None
@@ -170,6 +181,7 @@ def register_commands(server):
         description="Search FenCore functions by name or description",
         input_schema=SearchInput,
         output_schema=SearchOutput,
+        coalesce=True,
     )
     async def fencore_search(
         input: SearchInput, context: Any = None
@@ -234,6 +246,7 @@ def register_commands(server):
         description="Get detailed info about a specific FenCore function",
         input_schema=InfoInput,
         output_schema=InfoOutput,
+        coalesce=True,
     )
     async def fencore_info(
         input: InfoInput, context: Any = None
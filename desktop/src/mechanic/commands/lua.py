@@ -171,6 +171,7 @@ def register_commands(server):
         description="Queue Lua code snippets for in-game execution. After running this, /reload in WoW to execute.",
         input_schema=LuaQueueInput,
         output_schema=LuaQueueResult,
+        mutation=True,
     )
     async def lua_queue(
         input: LuaQueueInput, context: Any = None
@@ -0,0 +1,106 @@
+"""
+Command manifest for lazy registration.
+
+Importing every command module costs far more than running most commands
+(pydantic schemas, large constant tables, requests...). The manifest maps
+each command name to the module that registers it, plus its description
+and tags, so `get_server()` can register modules on first use and
+`mech commands` can list everything without importing any of them.
+
+It is cached in the data directory and rebuilt, by importing every module
+once, whenever a command module's source changes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from afd.core.cache import tree_fingerprint
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
+MANIFEST_FILENAME = "command_manifest.json"
+
+
+class CommandSummary(NamedTuple):
+    """What `mech commands` shows for a command, without loading it."""
+
+    name: str
+    description: str
+    tags: List[str]
+
+
+def source_fingerprint() -> Optional[str]:
+    """Fingerprint of the command modules' source files."""
+    return tree_fingerprint(Path(__file__).parent, (".py",))
+
+
+def manifest_path() -> Path:
+    """Where the manifest is cached (the Mechanic data directory)."""
+    from ..config import get_config
+
+    return get_config().data_dir / MANIFEST_FILENAME
+
+
+def load_manifest(path: Path, fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Read a cached manifest; None if missing, unreadable or stale."""
+    if fingerprint is None:
+        return None
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("fingerprint") != fingerprint
+        or not isinstance(manifest.get("commands"), dict)
+    ):
+        return None
+    return manifest
+
+
+def save_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    """Write the manifest atomically; failures only cost the next startup."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def build_manifest(
+    fingerprint: Optional[str], modules: Dict[str, List[Any]]
+) -> Dict[str, Any]:
+    """Build a manifest from the commands each module registered.
+
+    Args:
+        fingerprint: Source fingerprint the manifest is valid for.
+        modules: Module name -> CommandDefinitions it registered.
+    """
+    commands = {}
+    for module, definitions in modules.items():
+        for definition in definitions:
+            commands[definition.name] = {
+                "module": module,
+                "description": definition.description,
+                "tags": list(definition.tags or []),
+            }
+    return {
+        "version": MANIFEST_VERSION,
+        "fingerprint": fingerprint,
+        "commands": commands,
+    }
+
+
+def summaries(manifest: Dict[str, Any]) -> List[CommandSummary]:
+    """Every command in the manifest, sorted by name."""
+    return [
+        CommandSummary(name, entry["description"], entry.get("tags", []))
+        for name, entry in sorted(manifest["commands"].items())
+    ]
@@ -593,6 +593,7 @@ def register_commands(server):
         description="Get all addon output (errors, tests, console) for agent consumption. Use agent_mode=true for compressed output.",
         input_schema=AddonOutputInput,
         output_schema=AddonOutputResult,
+        coalesce=True,
     )
     async def addon_output(
         input: AddonOutputInput, context: Any = None
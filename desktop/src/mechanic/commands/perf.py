@@ -332,6 +332,8 @@ def register_commands(server):
         description="Record a performance baseline measurement for an addon",
         input_schema=PerfBaselineInput,
         output_schema=PerfBaselineOutput,
+        mutation=True,
+        coalesce=True,
     )(_perf_baseline)
 
     server.command(
@@ -44,6 +44,7 @@ def register_commands(server):
         description="Update the version in a WoW addon's .toc file",
         input_schema=VersionBumpInput,
         output_schema=VersionBumpResult,
+        mutation=True,
     )
     async def bump_version(
         input: VersionBumpInput, context: Any = None
@@ -136,6 +137,7 @@ def register_commands(server):
         description="Add an entry to the addon's CHANGELOG.md",
         input_schema=ChangelogAddInput,
         output_schema=ChangelogAddResult,
+        mutation=True,
     )
     async def add_changelog(
         input: ChangelogAddInput, context: Any = None
@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional
 
 from afd import CommandResult, success, error
 from afd.core.metadata import create_source
+from afd.core.process import run_process
 from pydantic import BaseModel, Field
 
 from ..config import get_config, find_addon_path
@@ -303,6 +304,8 @@ def register_commands(server):
         description="Generate WoW API stubs from APIDefs database for sandbox testing",
         input_schema=GenerateInput,
         output_schema=GenerateResult,
+        mutation=True,
+        coalesce=True,
     )
     async def sandbox_generate(
         input: GenerateInput, context: Any = None
@@ -429,6 +432,8 @@ def register_commands(server):
         description="Execute Lua code in sandbox environment with WoW API stubs",
         input_schema=ExecInput,
         output_schema=ExecResult,
+        tags=["subprocess"],
+        timeout_ms=45_000,
     )
     async def sandbox_exec(
         input: ExecInput, context: Any = None
@@ -497,12 +502,8 @@ end
 
         # Execute Lua
         try:
-            result = subprocess.run(
-                [str(lua_path), "-e", full_script],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=str(sandbox_folder),
+            result = await run_process(
+                [lua_path, "-e", full_script], timeout=30, cwd=sandbox_folder
             )
         except subprocess.TimeoutExpired:
             return error(
@@ -535,6 +536,9 @@ end
         description="Run Busted tests for an addon's Core layer with WoW API stubs",
         input_schema=TestInput,
         output_schema=TestResult,
+        tags=["subprocess"],
+        timeout_ms=90_000,
+        max_concurrency=2,
     )
     async def sandbox_test(
         input: TestInput, context: Any = None
@@ -679,12 +683,8 @@ end
         start_time = time.perf_counter()
 
         try:
-            result = subprocess.run(
-                [str(lua_path), "-e", full_script],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                cwd=str(addon_path),
+            result = await run_process(
+                [lua_path, "-e", full_script], timeout=60, cwd=addon_path
             )
         except subprocess.TimeoutExpired:
             return error(code="TIMEOUT", message="Tests timed out after 60 seconds")
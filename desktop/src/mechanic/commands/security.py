@@ -583,6 +583,8 @@ def register_commands(server):
         description="Detect security issues in a WoW addon (combat lockdown, secret values, taint)",
         input_schema=SecurityInput,
         output_schema=SecurityResult,
+        execution="process",
+        coalesce=True,
     )
     async def analyze_security(
         input: SecurityInput, context: Any = None
@@ -430,6 +430,8 @@ def register_commands(server):
         description="Detect stale or broken documentation in a WoW addon",
         input_schema=StaleDocsInput,
         output_schema=StaleDocsResult,
+        execution="thread",
+        coalesce=True,
     )
     async def detect_stale_docs(
         input: StaleDocsInput, context: Any = None
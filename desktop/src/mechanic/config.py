@@ -29,6 +29,9 @@ _desktop_env = Path(__file__).parent.parent.parent / ".env"
 if _desktop_env.exists():
     load_dotenv(_desktop_env, override=True)
 
+# The .env files above, lowest priority first
+ENV_FILES = (_user_env, _desktop_env)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PATH DISCOVERY
@@ -152,6 +155,9 @@ class MechanicConfig:
             self._config["wow_root"] = os.environ["MECHANIC_WOW_ROOT"]
         if "MECHANIC_DEV_PATH" in os.environ:
             self._config["dev_path"] = os.environ["MECHANIC_DEV_PATH"]
+        if "MECHANIC_WATCHER_BACKEND" in os.environ:
+            self._config.setdefault("watcher", {})
+            self._config["watcher"]["backend"] = os.environ["MECHANIC_WATCHER_BACKEND"]
 
         self._loaded = True
 
@@ -215,6 +221,99 @@ class MechanicConfig:
         """Get WoW flavors to target (e.g., _retail_, _beta_, _ptr_)."""
         return self._config.get("flavors", ["_retail_", "_beta_", "_ptr_"])
 
+    @property
+    def watcher(self) -> Dict[str, Any]:
+        """
+        Get SavedVariables watcher settings.
+
+        backend: "native" (OS change notifications) or "polling" (adaptive
+        stat polling, for WoW installs on network shares or VMs).
+        poll_min_ms / poll_max_ms: polling interval bounds after a reload
+        and when idle.
+        """
+        settings = {"backend": "native", "poll_min_ms": 100, "poll_max_ms": 2000}
+        settings.update(self._config.get("watcher", {}))
+        return settings
+
+    @property
+    def websocket(self) -> Dict[str, Any]:
+        """
+        Get dashboard WebSocket settings.
+
+        max_queue: outbound messages buffered per client.
+        slow_consumer: what to do when a client's queue is full -
+        "drop_oldest", "latest" (keep only the newest update per addon)
+        or "disconnect".
+        send_timeout_ms: disconnect a client whose socket stops accepting data.
+        per_message_deflate: negotiate permessage-deflate compression.
+        replay_buffer: recent broadcasts kept so reconnecting clients can
+        catch up without refetching everything.
+        """
+        settings = {
+            "max_queue": 100,
+            "slow_consumer": "drop_oldest",
+            "send_timeout_ms": 10000,
+            "per_message_deflate": True,
+            "replay_buffer": 256,
+        }
+        settings.update(self._config.get("websocket", {}))
+        return settings
+
+    @property
+    def cache(self) -> Dict[str, Any]:
+        """
+        Get command result cache settings.
+
+        enabled: cache results of read-only commands that declare a
+        fingerprint (api.search, addon.deadcode...) until their files change.
+        max_entries: results kept before the least recently used is evicted.
+        """
+        settings = {"enabled": True, "max_entries": 256}
+        settings.update(self._config.get("cache", {}))
+        return settings
+
+    @property
+    def loop_monitor(self) -> Dict[str, Any]:
+        """
+        Get event-loop monitor settings (see server.diagnostics).
+
+        enabled: watch the dashboard and MCP servers' event loop for stalls.
+        interval_ms: how often the loop is checked.
+        stall_threshold_ms: lag above which a check is recorded as a stall
+        and attributed to the command that was running.
+        """
+        settings = {"enabled": True, "interval_ms": 50, "stall_threshold_ms": 100}
+        settings.update(self._config.get("loop_monitor", {}))
+        return settings
+
+    @property
+    def executors(self) -> Dict[str, Any]:
+        """
+        Get worker pool sizes for offloaded commands.
+
+        thread_workers: threads for blocking commands (docs.stale, api.populate).
+        process_workers: processes for CPU-bound analyzers (addon.complexity,
+        addon.security), so several can run on separate cores.
+        null picks a default from the CPU count.
+        """
+        settings = {"thread_workers": None, "process_workers": None}
+        settings.update(self._config.get("executors", {}))
+        return settings
+
+    @property
+    def concurrency(self) -> Dict[str, Any]:
+        """
+        Get concurrency limits for commands that spawn tools.
+
+        tags: maximum concurrent executions per command tag. "subprocess"
+        covers addon.lint, addon.format, addon.test, sandbox.exec and
+        sandbox.test; further calls queue in arrival order. null removes
+        a limit.
+        """
+        tags = {"subprocess": 4}
+        tags.update(self._config.get("concurrency", {}).get("tags", {}))
+        return {"tags": tags}
+
     @property
     def template_path(self) -> Optional[Path]:
         """Get the path to the addon template."""
@@ -274,6 +373,12 @@ class MechanicConfig:
             "flavors": self.flavors,
             "data_dir": str(self.data_dir),
             "addon_search_paths": [str(p) for p in self.get_addon_search_paths()],
+            "watcher": self.watcher,
+            "websocket": self.websocket,
+            "cache": self.cache,
+            "loop_monitor": self.loop_monitor,
+            "executors": self.executors,
+            "concurrency": self.concurrency,
         }
 
     def save_user_config(self, config: Dict[str, Any]):
@@ -354,6 +459,23 @@ def find_addon_path(
     return candidates[0]
 
 
+def addon_fingerprint(input: Dict[str, Any]) -> Optional[str]:
+    """
+    Result-cache fingerprint for commands that analyze an addon's files.
+
+    Resolves the addon like find_addon_path and fingerprints its tree by
+    file mtimes and sizes, so cached results expire as soon as any file
+    in the addon changes.
+
+    Args:
+        input: Command input with "addon" and optional "path"
+    """
+    from afd.core import tree_fingerprint
+
+    addon_path = find_addon_path(input.get("addon", ""), input.get("path"))
+    return tree_fingerprint(addon_path) if addon_path else None
+
+
 def discover_saved_variables() -> List[Path]:
     """
     Discover SavedVariables folders for accounts where !Mechanic is installed.
@@ -0,0 +1,564 @@
+"""
+WebSocket connection management for the Mechanic dashboard.
+
+Every connected client (browser tab or agent) gets a bounded outbound queue
+drained by its own sender task, so a slow or stuck consumer only ever delays
+itself. When a client's queue is full, the slow-consumer policy decides what
+happens:
+
+    drop_oldest  Discard the oldest queued message to make room
+    latest       Discard queued messages superseded by the new one (same
+                 key, e.g. the same addon's reload); fall back to drop_oldest
+    disconnect   Close the connection; the dashboard reconnects and refetches
+
+Clients choose a frame encoding when connecting (/ws?encoding=packed):
+"json" text frames (default) or "packed" binary frames (see packing.py).
+
+Messages are published on topics such as "addon:Weekly" or "errors:Weekly".
+A subscription matches a topic exactly or as a prefix up to ":", so
+"errors" receives errors for every addon and "errors:Weekly" only for one.
+Clients start subscribed to DEFAULT_TOPICS (full reload payloads) and
+adjust that by sending
+
+    {"type": "subscribe", "topics": ["errors:Weekly", "tests"]}
+    {"type": "unsubscribe", "topics": ["tests"]}
+
+or replace it by connecting with /ws?topics=errors:Weekly,tests. Each published
+payload is encoded at most once per (topic, encoding) in use.
+
+Every published payload carries a "seq" number and is kept in a ring
+buffer. New clients get {"type": "hello", "epoch", "seq"}; a reconnecting
+client passes the last seq it saw (and the epoch it saw it in):
+
+    /ws?last_seq=42&epoch=18f3a2c01b
+    {"type": "resume", "last_seq": 42, "epoch": "18f3a2c01b"}
+
+and receives only the events it missed, or - if those have left the
+buffer or the server restarted - the latest payload for each topic. Either
+way it ends with {"type": "resumed", "mode": "replay"|"snapshot", ...}.
+
+Catch-up frames and control messages (hello, resumed, subscribed) go
+through a separate queue that is sent first and is exempt from the
+slow-consumer policy: a snapshot can hold far more topics than max_queue,
+and dropping or disconnecting over it would leave a client with partial
+state, or in a reconnect loop. The limit applies to live traffic only.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from afd.core.metrics import Histogram
+
+from .packing import pack
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "latest", "disconnect")
+ENCODINGS = ("json", "packed")
+
+# Topic kinds published for each reload (see server.reload_topics)
+TOPIC_KINDS = ("addon", "console", "errors", "tests", "perf")
+# Full reload payloads for every addon, as before topics existed
+DEFAULT_TOPICS = ("addon",)
+
+# Frame size buckets in bytes (1 KB .. 16 MB)
+FRAME_SIZE_BUCKETS = tuple(1024 * 4**i for i in range(8))
+
+# WebSocket close code 1013: "Try Again Later"
+CLOSE_SLOW_CONSUMER = 1013
+
+
+class ClientConnection:
+    """A single WebSocket client with its own bounded send queue."""
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_queue: int = 100,
+        policy: str = "drop_oldest",
+        send_timeout: float = 10.0,
+        on_close: Optional[Callable[["ClientConnection"], None]] = None,
+        encoding: str = "json",
+        topics: Optional[Iterable[str]] = None,
+    ):
+        self.websocket = websocket
+        self.encoding = encoding
+        self.topics: Set[str] = set(DEFAULT_TOPICS if topics is None else topics)
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.on_close = on_close
+
+        # (key, message) pairs; a deque so "latest" can drop superseded entries
+        self._queue: deque = deque()
+        # Catch-up and control frames: sent first, never dropped
+        self._catch_up: deque = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.sent = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue) + len(self._catch_up)
+
+    def subscribed(self, topic: Optional[str]) -> bool:
+        """Whether this client wants messages published on `topic` (None = all)."""
+        if topic is None:
+            return True
+        return any(topic_matches(sub, topic) for sub in self.topics)
+
+    def start(self) -> None:
+        """Start the sender task (requires a running event loop)."""
+        self._task = asyncio.create_task(self._sender())
+
+    def enqueue(self, message: Union[str, bytes], key: Optional[str] = None) -> bool:
+        """
+        Queue a message without blocking.
+
+        Returns:
+            True if the message was queued, False if the client is closed
+            or was disconnected by the slow-consumer policy.
+        """
+        if self.closed:
+            return False
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == "disconnect":
+                self.close("slow consumer")
+                return False
+
+            if self.policy == "latest" and key is not None:
+                kept = deque(item for item in self._queue if item[0] != key)
+                self.dropped += len(self._queue) - len(kept)
+                self._queue = kept
+
+            while len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+
+        self._queue.append((key, message))
+        self.high_water = max(self.high_water, self.queued)
+        self._ready.set()
+        return True
+
+    def enqueue_catch_up(
+        self, messages: Iterable[Union[str, bytes]], replaces_pending: bool = False
+    ) -> bool:
+        """
+        Queue catch-up or control frames, ahead of live traffic and outside
+        the slow-consumer limit.
+
+        Args:
+            messages: Frames to send, in order.
+            replaces_pending: Discard everything still queued, live or
+                catch-up; a resume resends all of it. Keeps repeated
+                resumes from stacking one backlog each.
+
+        Returns:
+            False if the client is closed.
+        """
+        if self.closed:
+            return False
+        if replaces_pending:
+            self._queue.clear()
+            self._catch_up.clear()
+        self._catch_up.extend(messages)
+        self.high_water = max(self.high_water, self.queued)
+        self._ready.set()
+        return True
+
+    async def _sender(self) -> None:
+        try:
+            while not self.closed:
+                if self._catch_up:
+                    message = self._catch_up.popleft()
+                elif self._queue:
+                    _, message = self._queue.popleft()
+                else:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                # A consumer that stops reading fills its TCP buffer and blocks
+                # send forever; give up on it rather than holding the task.
+                if isinstance(message, bytes):
+                    send = self.websocket.send_bytes(message)
+                else:
+                    send = self.websocket.send_text(message)
+                await asyncio.wait_for(send, timeout=self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.close("send timeout")
+        except Exception as e:
+            self.close(f"send failed: {e}")
+
+    def close(self, reason: str = "closed") -> None:
+        """Stop sending and close the socket in the background."""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self._queue.clear()
+        self._catch_up.clear()
+        self._ready.set()
+
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+        if reason != "closed":
+            asyncio.ensure_future(self._close_socket())
+
+        if self.on_close:
+            self.on_close(self)
+
+    async def _close_socket(self) -> None:
+        try:
+            await self.websocket.close(code=CLOSE_SLOW_CONSUMER)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "encoding": self.encoding,
+            "topics": sorted(self.topics),
+            "queued": self.queued,
+            "high_water": self.high_water,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "closed": self.closed,
+            "close_reason": self.close_reason,
+        }
+
+
+class EncodeStats:
+    """Frame sizes and encode times for one encoding."""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.encode_ms = Histogram()
+        self.size = Histogram(buckets=FRAME_SIZE_BUCKETS)
+
+    def record(self, size: int, elapsed_ms: float) -> None:
+        self.frames += 1
+        self.bytes += size
+        self.encode_ms.observe(elapsed_ms)
+        self.size.observe(size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        size = self.size.snapshot()
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "mean_bytes": size["mean"],
+            "max_bytes": size["max"],
+            "encode_ms": self.encode_ms.snapshot(),
+        }
+
+
+def topic_matches(subscription: str, topic: str) -> bool:
+    """Match a subscription against a topic ("*" matches everything)."""
+    return (
+        subscription == "*"
+        or topic == subscription
+        or topic.startswith(subscription + ":")
+    )
+
+
+def parse_topics(value: Any) -> List[str]:
+    """Normalize a topic list from a subscribe message or query string."""
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [t.strip() for t in value if isinstance(t, str) and t.strip()]
+
+
+def encode_frame(payload: Any, encoding: str) -> Union[str, bytes]:
+    """Serialize a broadcast payload for the given client encoding."""
+    if encoding == "packed":
+        return pack(payload)
+    return json.dumps(payload, default=str)
+
+
+class ReplayBuffer:
+    """Ring buffer of recent published events, plus the latest per topic."""
+
+    def __init__(self, size: int = 256):
+        self.events: deque = deque(maxlen=max(1, size))
+        self.latest: Dict[Optional[str], tuple] = {}
+        self.seq = 0
+        # Distinguishes sequence numbers from a previous server run
+        self.epoch = f"{time.time_ns() // 1_000_000:x}"
+
+    def record(self, topic: Optional[str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp a payload with the next sequence number and keep it."""
+        self.seq += 1
+        stamped = {**payload, "seq": self.seq}
+        event = (self.seq, topic, stamped)
+        self.events.append(event)
+        self.latest[topic] = event
+        return stamped
+
+    def since(self, last_seq: int) -> Optional[List[tuple]]:
+        """
+        Events after `last_seq`, or None if some have already been evicted
+        (or `last_seq` is from the future, i.e. another epoch).
+        """
+        if last_seq > self.seq:
+            return None
+        oldest = self.events[0][0] if self.events else self.seq + 1
+        if last_seq + 1 < oldest:
+            return None
+        return [event for event in self.events if event[0] > last_seq]
+
+    def snapshot(self) -> List[tuple]:
+        """The most recent event for every topic, oldest first."""
+        return sorted(self.latest.values(), key=lambda event: event[0])
+
+
+class ConnectionManager:
+    """Tracks dashboard WebSocket clients and fans broadcasts out to them."""
+
+    def __init__(
+        self,
+        max_queue: int = 100,
+        policy: str = "drop_oldest",
+        send_timeout: float = 10.0,
+        replay_size: int = 256,
+    ):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(
+                f"Unknown slow-consumer policy '{policy}' (expected one of {', '.join(SLOW_CONSUMER_POLICIES)})"
+            )
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.clients: Dict[Any, ClientConnection] = {}
+        self.encode_stats = {encoding: EncodeStats() for encoding in ENCODINGS}
+        self.replay = ReplayBuffer(replay_size)
+
+        self.broadcasts = 0
+        self.total_dropped = 0
+        self.slow_disconnects = 0
+        self.resumes = {"replay": 0, "snapshot": 0}
+
+    @property
+    def active_connections(self) -> list:
+        return list(self.clients)
+
+    async def connect(
+        self,
+        websocket: Any,
+        encoding: str = "json",
+        topics: Optional[Iterable[str]] = None,
+        last_seq: Optional[int] = None,
+        epoch: Optional[str] = None,
+    ) -> ClientConnection:
+        if encoding not in ENCODINGS:
+            encoding = "json"
+        await websocket.accept()
+        client = ClientConnection(
+            websocket,
+            max_queue=self.max_queue,
+            policy=self.policy,
+            send_timeout=self.send_timeout,
+            on_close=self._on_client_closed,
+            encoding=encoding,
+            topics=topics or None,
+        )
+        self.clients[websocket] = client
+        if last_seq is None:
+            self._send(
+                client,
+                {"type": "hello", "epoch": self.replay.epoch, "seq": self.replay.seq},
+            )
+        else:
+            self.resume(client, last_seq, epoch)
+        client.start()
+        return client
+
+    def resume(
+        self, client: ClientConnection, last_seq: int, epoch: Optional[str] = None
+    ) -> str:
+        """
+        Catch a reconnecting client up from `last_seq`.
+
+        Returns:
+            "replay" if only the missed events were sent, "snapshot" if the
+            latest payload of every subscribed topic was sent instead.
+        """
+        events = None
+        if epoch in (None, self.replay.epoch):
+            events = self.replay.since(last_seq)
+
+        mode = "replay"
+        # A long backlog costs more to replay than the latest state does
+        if events is None or len(events) >= client.max_queue:
+            mode = "snapshot"
+            events = self.replay.snapshot()
+
+        frames = [
+            self.encode(payload, client.encoding)
+            for _, topic, payload in events
+            if client.subscribed(topic)
+        ]
+        replayed = len(frames)
+        frames.append(
+            self.encode(
+                {
+                    "type": "resumed",
+                    "mode": mode,
+                    "epoch": self.replay.epoch,
+                    "seq": self.replay.seq,
+                    "replayed": replayed,
+                },
+                client.encoding,
+            )
+        )
+        # Exempt from the slow-consumer policy: all of it or the client
+        # can't trust its state. Anything still queued, including an
+        # earlier resume's catch-up, is covered.
+        client.enqueue_catch_up(frames, replaces_pending=True)
+
+        self.resumes[mode] += 1
+        return mode
+
+    def _send(self, client: ClientConnection, payload: Dict[str, Any]) -> None:
+        """Queue a control message for a single client."""
+        client.enqueue_catch_up([self.encode(payload, client.encoding)])
+
+    def disconnect(self, websocket: Any) -> None:
+        client = self.clients.get(websocket)
+        if client:
+            client.close()
+
+    def handle_message(self, websocket: Any, text: str) -> None:
+        """Apply a control message (subscribe/unsubscribe) sent by a client."""
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        kind = message.get("type")
+        if kind == "resume":
+            last_seq = message.get("last_seq")
+            if isinstance(last_seq, int):
+                self.resume(client, last_seq, message.get("epoch"))
+            return
+
+        topics = parse_topics(message.get("topics"))
+        if kind == "subscribe":
+            client.topics |= set(topics)
+        elif kind == "unsubscribe":
+            client.topics -= set(topics)
+        else:
+            return
+
+        self._send(client, {"type": "subscribed", "topics": sorted(client.topics)})
+
+    def _on_client_closed(self, client: ClientConnection) -> None:
+        if self.clients.get(client.websocket) is client:
+            del self.clients[client.websocket]
+        self.total_dropped += client.dropped
+        if client.close_reason != "closed":
+            self.slow_disconnects += 1
+
+    def encode(self, payload: Any, encoding: str) -> Union[str, bytes]:
+        """Encode a payload and record its size and encode time."""
+        start = time.perf_counter()
+        frame = encode_frame(payload, encoding)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        size = len(frame) if isinstance(frame, bytes) else len(frame.encode("utf-8"))
+        self.encode_stats[encoding].record(size, elapsed_ms)
+        return frame
+
+    async def broadcast(
+        self,
+        message: Union[str, Dict[str, Any]],
+        key: Optional[str] = None,
+        topic: Optional[str] = None,
+    ) -> int:
+        """
+        Queue a message for every client subscribed to `topic`.
+
+        Never waits on a client's socket: each sender task drains its own
+        queue concurrently, so one slow tab cannot delay the others.
+
+        Args:
+            message: A payload dict, stamped with a sequence number, kept for
+                replay and encoded once per client encoding in use; or a
+                pre-serialized JSON string sent to every client as-is.
+            key: Identifies what the message supersedes (for the "latest"
+                policy); defaults to the topic.
+            topic: Topic the message is published on; None sends to everyone.
+
+        Returns:
+            Number of clients the message was queued for.
+        """
+        self.broadcasts += 1
+        key = key if key is not None else topic
+        if not isinstance(message, str):
+            message = self.replay.record(topic, message)
+        frames: Dict[str, Union[str, bytes]] = {}
+        queued = 0
+        for client in list(self.clients.values()):
+            if not client.subscribed(topic):
+                continue
+            if isinstance(message, str):
+                frame = message
+            else:
+                frame = frames.get(client.encoding)
+                if frame is None:
+                    frame = frames[client.encoding] = self.encode(
+                        message, client.encoding
+                    )
+            if client.enqueue(frame, key):
+                queued += 1
+        return queued
+
+    async def publish(self, messages: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Broadcast several topic payloads, e.g. the slices of one reload.
+
+        Args:
+            messages: Mapping of topic to payload.
+
+        Returns:
+            Total number of messages queued across clients and topics.
+        """
+        queued = 0
+        for topic, payload in messages.items():
+            queued += await self.broadcast(payload, topic=topic)
+        return queued
+
+    def stats(self) -> Dict[str, Any]:
+        clients = [c.stats() for c in self.clients.values()]
+        return {
+            "clients": len(clients),
+            "policy": self.policy,
+            "max_queue": self.max_queue,
+            "broadcasts": self.broadcasts,
+            "queued": sum(c["queued"] for c in clients),
+            "dropped": self.total_dropped + sum(c["dropped"] for c in clients),
+            "slow_disconnects": self.slow_disconnects,
+            "seq": self.replay.seq,
+            "replay_buffered": len(self.replay.events),
+            "resumes": dict(self.resumes),
+            "encodings": {
+                name: stats.snapshot() for name, stats in self.encode_stats.items()
+            },
+            "per_client": clients,
+        }
@@ -0,0 +1,362 @@
+"""
+Warm daemon for the mech CLI.
+
+Every `mech call` is a fresh process that rebuilds config, command
+registration, API definitions and analysis caches from scratch.
+`mech daemon start` keeps one process alive with all of that warm,
+listening on a Unix domain socket (a named pipe on Windows); `mech call`
+forwards to it when it's running and runs in-process otherwise.
+
+A request is only served when the caller's working directory,
+environment (MECHANIC_* and the other variables commands read) and
+config and .env files match the daemon's, so relative paths and
+settings resolve exactly as they would in-process. Once a config or
+.env file changes under it the daemon can never match again: it refuses
+the call and shuts down, and the next `mech daemon start` reads the new
+settings.
+
+This module is imported on every `mech call`: keep its imports light
+(no pydantic, no command modules) outside the daemon-side code.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import ENV_FILES, get_config_paths, get_data_dir
+
+# Shut down after this long without requests
+DEFAULT_IDLE_TIMEOUT_MIN = 30
+
+# AF_UNIX socket paths are limited to ~104 bytes on macOS
+MAX_SOCKET_PATH = 100
+
+# Non-MECHANIC_ variables that commands read
+SHARED_ENV = ("GEMINI_API_KEY", "XDG_CONFIG_HOME")
+
+KEY_FILENAME = "daemon.key"
+LOG_FILENAME = "daemon.log"
+
+
+def daemon_address() -> Tuple[str, str]:
+    """(address, family) the daemon listens on for this data directory."""
+    data_dir = get_data_dir()
+    tag = hashlib.blake2b(str(data_dir).encode(), digest_size=6).hexdigest()
+    if sys.platform == "win32":
+        return rf"\\.\pipe\mechanic-{tag}", "AF_PIPE"
+    path = str(data_dir / "daemon.sock")
+    if len(path) > MAX_SOCKET_PATH:
+        import tempfile
+
+        path = os.path.join(tempfile.gettempdir(), f"mechanic-{tag}.sock")
+    return path, "AF_UNIX"
+
+
+def caller_context() -> Dict[str, Any]:
+    """What a request must share with the daemon to be served by it."""
+    return {
+        "cwd": os.getcwd(),
+        "env": {
+            k: v
+            for k, v in os.environ.items()
+            if k.startswith("MECHANIC_") or k in SHARED_ENV
+        },
+        "files": _file_stamps([*get_config_paths(), *ENV_FILES]),
+    }
+
+
+def _file_stamps(paths: List[Any]) -> Dict[str, Optional[Tuple[int, int]]]:
+    """(mtime, size) of each file, None for files that don't exist."""
+    stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[str(path)] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamps[str(path)] = None
+    return stamps
+
+
+def _read_key() -> Optional[bytes]:
+    try:
+        return (get_data_dir() / KEY_FILENAME).read_bytes()
+    except OSError:
+        return None
+
+
+def _write_key() -> bytes:
+    """Create a fresh auth key readable only by the current user."""
+    key = os.urandom(32)
+    path = get_data_dir() / KEY_FILENAME
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLIENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class RemoteResult:
+    """A CommandResult returned by the daemon, without importing pydantic.
+
+    Has the attributes the CLI reads; model_dump() returns the original dict.
+    """
+
+    def __init__(self, result: Dict[str, Any]):
+        self._result = result
+        self.success = result.get("success", False)
+        self.data = result.get("data")
+        self.reasoning = result.get("reasoning")
+        error = result.get("error")
+        self.error = SimpleNamespace(**error) if error else None
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        return self._result
+
+
+def request(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send one message to the daemon.
+
+    Returns:
+        The daemon's response, or None if no daemon could be reached (the
+        message was not delivered).
+    """
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+
+    address, family = daemon_address()
+    if not os.path.exists(address):
+        return None
+    authkey = _read_key()
+    if authkey is None:
+        return None
+
+    try:
+        conn = Client(address, family, authkey=authkey)
+    except (OSError, EOFError, AuthenticationError):
+        return None  # Stale socket or a daemon from another key
+
+    with conn:
+        try:
+            conn.send(message)
+            return conn.recv()
+        except (OSError, EOFError) as e:
+            # Delivered but no answer: the command may have run, so don't
+            # let the caller silently run it a second time
+            return {
+                "status": "ok",
+                "result": {
+                    "success": False,
+                    "error": {
+                        "code": "DAEMON_DISCONNECTED",
+                        "message": f"Lost connection to the mech daemon: {e}",
+                        "suggestion": "Check `mech daemon status`, or retry with --no-daemon",
+                    },
+                },
+            }
+
+
+def call_daemon(command: str, input: Any) -> Optional[RemoteResult]:
+    """Run a command in the daemon.
+
+    Returns:
+        The result, or None if no daemon is running or it can't serve this
+        caller (different directory, environment or config files); run
+        in-process then.
+    """
+    if os.environ.get("MECHANIC_NO_DAEMON"):
+        return None
+    response = request(
+        {"op": "call", "command": command, "input": input, **caller_context()}
+    )
+    if response is None or response.get("status") != "ok":
+        return None
+    result = response["result"]
+    if isinstance(result, bytes):
+        result = json.loads(result)
+    return RemoteResult(result)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DAEMON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class Daemon:
+    """Serves command calls from `mech call` out of one warm process."""
+
+    def __init__(self, idle_timeout_min: float = DEFAULT_IDLE_TIMEOUT_MIN):
+        self.idle_timeout_s = idle_timeout_min * 60
+        self.context = caller_context()
+        self.started_at = time.time()
+        self.served = 0
+        self.active = 0
+        # Config or .env files changed since start; stop once calls finish
+        self.stale = False
+        self.last_activity = time.monotonic()
+        self._server = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "served": self.served,
+            "active": self.active,
+            "cwd": self.context["cwd"],
+            "commands": len(self._server.list_commands()) if self._server else 0,
+        }
+
+    async def serve(self, ready: Optional[threading.Event] = None) -> None:
+        """Listen until shut down or idle for idle_timeout_min.
+
+        Raises:
+            RuntimeError: If another daemon is already serving this data directory.
+        """
+        from multiprocessing.connection import Listener
+
+        from .commands.core import get_server
+        from .metrics import start_loop_monitor
+
+        address, family = daemon_address()
+        # Off the loop: a daemon in this same process answers from the loop
+        if await asyncio.to_thread(request, {"op": "ping"}) is not None:
+            raise RuntimeError(f"A mech daemon is already running at {address}")
+        if family == "AF_UNIX" and os.path.exists(address):
+            os.unlink(address)  # Left behind by a daemon that crashed
+
+        # Warm everything up front so the first call is as fast as the rest
+        self._server = get_server()
+        self._server.list_commands()
+
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        start_loop_monitor()
+
+        listener = Listener(address, family, authkey=_write_key())
+        threading.Thread(
+            target=self._accept, args=(listener,), name="mech-daemon", daemon=True
+        ).start()
+        if ready is not None:
+            ready.set()
+
+        try:
+            while not self._stop.is_set():
+                idle = time.monotonic() - self.last_activity
+                if not self.active and idle >= self.idle_timeout_s:
+                    break
+                try:
+                    await asyncio.wait_for(
+                        self._stop.wait(), max(1.0, self.idle_timeout_s - idle)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            listener.close()
+            try:
+                (get_data_dir() / KEY_FILENAME).unlink()
+            except OSError:
+                pass
+
+    def _accept(self, listener) -> None:
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError:
+                return  # Listener closed
+            except Exception:
+                continue  # Failed authentication or handshake
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn) -> None:
+        with conn:
+            try:
+                message = conn.recv()
+            except (OSError, EOFError):
+                return
+            future = asyncio.run_coroutine_threadsafe(
+                self._respond(message), self._loop
+            )
+            try:
+                conn.send(future.result())
+            except (OSError, EOFError):
+                pass
+
+    async def _respond(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message.get("op")
+        if op == "ping":
+            return {"status": "ok", **self.status()}
+        if op == "shutdown":
+            self._stop.set()
+            return {"status": "ok", **self.status()}
+        if op != "call":
+            return {"status": "error", "message": f"Unknown op '{op}'"}
+
+        if any(message.get(k) != self.context[k] for k in ("cwd", "env")):
+            return {"status": "mismatch", "cwd": self.context["cwd"]}
+        if self.stale or message.get("files") != self.context["files"]:
+            self.stale = True
+            if not self.active:
+                self._stop.set()
+            return {"status": "stale", "cwd": self.context["cwd"]}
+
+        self.active += 1
+        self.last_activity = time.monotonic()
+        try:
+            result = await self._server.execute(
+                message["command"], message.get("input") or {}
+            )
+        finally:
+            self.active -= 1
+            self.served += 1
+            self.last_activity = time.monotonic()
+            if self.stale and not self.active:
+                self._stop.set()
+        return {"status": "ok", "result": result.to_json_bytes()}
+
+
+def start_background(idle_timeout_min: float, wait_s: float = 15.0) -> bool:
+    """Start a detached daemon process and wait for it to answer.
+
+    Returns:
+        True once the daemon responds to a ping.
+    """
+    import subprocess
+
+    log = open(get_data_dir() / LOG_FILENAME, "ab")
+    args = [
+        sys.executable,
+        "-m",
+        "mechanic.cli",
+        "daemon",
+        "start",
+        "--idle-timeout",
+        str(idle_timeout_min),
+    ]
+    kwargs: Dict[str, Any] = {"stdout": log, "stderr": log, "stdin": subprocess.DEVNULL}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(args, cwd=os.getcwd(), **kwargs)
+    log.close()
+
+    deadline = time.monotonic() + wait_s
+    while time.monotonic() < deadline:
+        if request({"op": "ping"}) is not None:
+            return True
+        time.sleep(0.1)
+    return False
@@ -0,0 +1,160 @@
+"""
+HTTP caching helpers for the Mechanic Desktop API and dashboard.
+
+- Conditional JSON responses: endpoints compute a cheap version string
+  (e.g. the last row id) before doing any real work; if it matches the
+  client's If-None-Match, they answer 304 Not Modified with no body.
+- DashboardStaticFiles: serves the dashboard with cache headers and an
+  in-memory gzip copy of each compressible file, so repeat loads cost a
+  revalidation round trip and first loads transfer ~5x less.
+- SelectiveGZipMiddleware: app-wide gzip for API responses, except for
+  streaming routes, which older Starlette releases would buffer whole.
+"""
+
+import gzip
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+# Responses smaller than this aren't worth compressing
+GZIP_MINIMUM_SIZE = 1024
+
+# Non-HTML dashboard assets; HTML is always revalidated so upgrades show up
+ASSET_MAX_AGE = 7 * 24 * 3600
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from version components (row ids, counts...)."""
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison
+        if candidate.removeprefix("W/") == etag.removeprefix("W/"):
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this version."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+    return None
+
+
+def conditional_json(content: Any, etag: str) -> JSONResponse:
+    """JSON response carrying an ETag that clients must revalidate."""
+    return JSONResponse(content, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+class SelectiveGZipMiddleware:
+    """GZipMiddleware for every path except ``exclude_paths``.
+
+    Starlette only learned to leave text/event-stream uncompressed in
+    recent releases; before that, gzip held back every Server-Sent Event
+    until the stream ended. Streaming routes are excluded by path so
+    progress reaches clients as it happens on any supported version.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = GZIP_MINIMUM_SIZE,
+        exclude_paths: Iterable[str] = (),
+    ):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+class DashboardStaticFiles(StaticFiles):
+    """StaticFiles with cache headers and precompressed gzip variants."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # path -> (mtime_ns, size, gzipped bytes)
+        self._gzip_cache: Dict[str, Tuple[int, int, bytes]] = {}
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code not in (200, 304):
+            return response
+
+        content_type = response.headers.get("content-type", "")
+        if content_type.startswith("text/html"):
+            cache_control = "no-cache"
+        else:
+            cache_control = f"public, max-age={ASSET_MAX_AGE}"
+        response.headers["Cache-Control"] = cache_control
+
+        request_headers = Headers(scope=scope)
+        if (
+            response.status_code != 200
+            or scope.get("method") != "GET"
+            or not isinstance(response, FileResponse)
+            or "gzip" not in request_headers.get("accept-encoding", "")
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+            or response.stat_result.st_size < GZIP_MINIMUM_SIZE
+        ):
+            return response
+
+        # The gzip variant is a different representation, so it gets its own ETag
+        etag = response.headers.get("etag", "")
+        gzip_etag = etag[:-1] + '-gz"' if etag.endswith('"') else etag
+        headers = {
+            "Content-Type": content_type,
+            "Cache-Control": cache_control,
+            "ETag": gzip_etag,
+            "Last-Modified": response.headers.get("last-modified", ""),
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request_headers.get("if-none-match"), gzip_etag):
+            return Response(status_code=304, headers=headers)
+
+        body = self._compressed(str(response.path), response.stat_result)
+        headers["Content-Encoding"] = "gzip"
+        return Response(body, status_code=200, headers=headers)
+
+    def _compressed(self, file_path: str, stat_result) -> bytes:
+        cached = self._gzip_cache.get(file_path)
+        if (
+            cached
+            and cached[0] == stat_result.st_mtime_ns
+            and cached[1] == stat_result.st_size
+        ):
+            return cached[2]
+        with open(file_path, "rb") as f:
+            body = gzip.compress(f.read(), compresslevel=9)
+        self._gzip_cache[file_path] = (
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+            body,
+        )
+        return body
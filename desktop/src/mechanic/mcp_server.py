@@ -24,6 +24,10 @@ TOOL_CATEGORIES = {
     "reload": "Reload - Trigger in-game reloads",
     "server": "Server - Control the Mechanic server",
     "dashboard": "Dashboard - Metrics and monitoring",
+    "watcher": "Watcher - SavedVariables ingest pipeline diagnostics",
+    "ws": "WebSocket - Dashboard client connection diagnostics",
+    "cache": "Cache - Command result cache diagnostics",
+    "batch": "Batch - Run several commands in one call",
     # Development Tools
     "addon": "Addon - Validate, lint, format, and test addons",
     "libs": "Libraries - Manage addon dependencies",
@@ -66,6 +70,10 @@ TOOL_ANNOTATIONS = {
     "sv.parse": {"readOnly": True, "idempotent": True},
     "sv.discover": {"readOnly": True, "idempotent": True},
     "dashboard.metrics": {"readOnly": True, "idempotent": True},
+    "watcher.stats": {"readOnly": True, "idempotent": True},
+    "ws.stats": {"readOnly": True, "idempotent": True},
+    "cache.stats": {"readOnly": True, "idempotent": True},
+    "server.diagnostics": {"readOnly": True, "idempotent": True},
     "addon.validate": {"readOnly": True, "idempotent": True},
     "addon.lint": {"readOnly": True, "idempotent": True},
     "addon.deprecations": {"readOnly": True, "idempotent": True},
@@ -117,6 +125,7 @@ TOOL_TITLES = {
     "addon.deadcode": "Detect Dead Code",
     "addon.security": "Security Analysis",
     "addon.complexity": "Complexity Analysis",
+    "batch.run": "Run Commands in Batch",
     "docs.stale": "Detect Stale Docs",
     "addon.create": "Create New Addon",
     "addon.sync": "Sync to WoW Clients",
@@ -157,6 +166,7 @@ TOOL_INTENTS = {
     "addon.deadcode": "Use this to find unused functions, orphaned files, dead exports, and other dead code in addon source.",
     "addon.security": "Use this to find security issues like combat lockdown violations, secret value leaks, taint risks, and unsafe eval patterns.",
     "addon.complexity": "Use this to find code complexity issues like deep nesting, long functions, magic numbers, and duplicate code.",
+    "batch.run": "Use this to run several checks (validate, lint, deadcode, security...) in one call instead of one round trip each.",
     "docs.stale": "Use this to find stale, outdated, or broken documentation including dead links, old version references, and docs not updated with code.",
     "libs.check": "Use this to verify which libraries are installed and if updates are available.",
     "libs.sync": "Use this to download and update addon dependencies.",
@@ -183,6 +193,11 @@ TOOL_EXAMPLES = {
     "sv.discover": "{}",
     "dashboard.metrics": "{}",
     "server.shutdown": "{}",
+    "watcher.stats": "{}",
+    "ws.stats": "{}",
+    "cache.stats": "{}",
+    "server.diagnostics": "{}",
+    "batch.run": '{"steps": [{"command": "addon.validate", "input": {"addon": "MyAddon"}}, {"command": "addon.lint", "input": {"addon": "MyAddon"}, "depends_on": ["addon.validate"]}]}',
     # Addon Development
     "addon.validate": '{"addon": "Weekly"}',
     "addon.lint": '{"addon": "Weekly"}',
@@ -455,10 +470,13 @@ def _summarize_list(items: List[Any], max_show: int = 3) -> str:
     return f"[{count} items]"
 
 
-def format_result_for_agent(result: Dict[str, Any]) -> str:
+def format_result_for_agent(
+    result: Dict[str, Any], full_json: Optional[str] = None
+) -> str:
     """Format a CommandResult dict for agent consumption.
 
-    Returns a clean summary followed by JSON data.
+    Returns a clean summary followed by JSON data (``full_json`` when
+    given, e.g. the result's cached bytes, otherwise ``result`` indented).
     Format:
       SUCCESS/FAILED
       Summary: <reasoning>
@@ -559,7 +577,7 @@ def format_result_for_agent(result: Dict[str, Any]) -> str:
 
     lines.append("")
     lines.append("--- Full Response ---")
-    lines.append(json.dumps(result, indent=2, default=str))
+    lines.append(full_json or json.dumps(result, indent=2, default=str))
 
     return "\n".join(lines)
 
@@ -679,6 +697,8 @@ def _register_enhanced_tool(mcp_server, afd_server, cmd):
     import sys
     import traceback
 
+    from .metrics import start_loop_monitor
+
     # Store original name for AFD execution
     afd_name = cmd.name
     # Use dashes instead of dots for Cursor compatibility
@@ -721,13 +741,17 @@ def _register_enhanced_tool(mcp_server, afd_server, cmd):
                     except json.JSONDecodeError:
                         params = {}
 
+            start_loop_monitor()
+
             # Execute the command using original AFD name (dot notation)
             result = await afd_server.execute(afd_name, params)
 
-            result_dict = result.model_dump()
-
-            # Return formatted output
-            formatted = format_result_for_agent(result_dict)
+            # Summarize from the parsed JSON and reuse the bytes for the
+            # full response, rather than dumping the model twice
+            payload = result.to_json_bytes()
+            formatted = format_result_for_agent(
+                json.loads(payload), full_json=payload.decode("utf-8")
+            )
 
             return formatted
 
@@ -0,0 +1,300 @@
+"""
+Runtime metrics for Mechanic Desktop.
+
+Tracks where time goes in the SavedVariables ingest path, from the moment
+WoW writes a file until the dashboard receives the WebSocket broadcast:
+
+    write -> fs_event -> debounce -> read -> parse -> storage -> broadcast
+
+Each reload carries an IngestTrace through the pipeline; completed traces
+are folded into per-stage histograms exposed by `watcher.stats`.
+
+`render_prometheus` gathers these together with command, WebSocket,
+SQLite and cache statistics for the `/metrics` endpoint.
+
+`loop_monitor` watches the server's event loop for stalls caused by
+blocking code in command handlers (reported by `server.diagnostics`).
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from afd.core.metrics import Histogram, PrometheusWriter
+from afd.core.monitor import LoopMonitor
+
+# Pipeline stages in order. Each stage's duration is measured from the
+# previous stage's mark; "fs_event" is measured from the file's mtime.
+INGEST_STAGES = ("fs_event", "debounce", "read", "parse", "storage", "broadcast")
+
+
+@dataclass
+class IngestTrace:
+    """Timestamps for a single SavedVariables file as it moves through ingest."""
+
+    file_path: str
+    # Wall-clock time the watcher saw the change (comparable with file mtime)
+    detected_at: float = field(default_factory=time.time)
+    marks: Dict[str, float] = field(default_factory=dict)
+    write_lag_ms: Optional[float] = None
+
+    def __post_init__(self):
+        self.marks.setdefault("fs_event", time.perf_counter())
+        try:
+            mtime = os.stat(self.file_path).st_mtime
+            self.write_lag_ms = max(0.0, (self.detected_at - mtime) * 1000)
+        except OSError:
+            self.write_lag_ms = None
+
+    def mark(self, stage: str) -> None:
+        """Record that a stage has completed."""
+        self.marks[stage] = time.perf_counter()
+
+    @property
+    def complete(self) -> bool:
+        """Whether the trace reached the broadcast stage."""
+        return "broadcast" in self.marks
+
+    def durations(self) -> Dict[str, float]:
+        """Per-stage durations in milliseconds for the stages that were reached."""
+        result: Dict[str, float] = {}
+        if self.write_lag_ms is not None:
+            result["fs_event"] = self.write_lag_ms
+
+        previous = self.marks["fs_event"]
+        for stage in INGEST_STAGES[1:]:
+            if stage not in self.marks:
+                break
+            result[stage] = (self.marks[stage] - previous) * 1000
+            previous = self.marks[stage]
+        return result
+
+    def total_ms(self) -> float:
+        """Milliseconds from the filesystem event to the last recorded stage."""
+        return (max(self.marks.values()) - self.marks["fs_event"]) * 1000
+
+
+class IngestStats:
+    """Aggregated stage histograms for the ingest pipeline."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.stages = {stage: Histogram() for stage in INGEST_STAGES}
+        self.total = Histogram()
+        self.completed = 0
+        self.skipped = 0
+        self.last: Optional[Dict[str, Any]] = None
+
+    def record(self, trace: IngestTrace) -> None:
+        """Fold a finished (or abandoned) trace into the histograms."""
+        durations = trace.durations()
+        for stage, ms in durations.items():
+            self.stages[stage].observe(ms)
+
+        if trace.complete:
+            self.completed += 1
+            self.total.observe(trace.total_ms())
+        else:
+            self.skipped += 1
+
+        self.last = {
+            "file": os.path.basename(trace.file_path),
+            "detected_at": trace.detected_at,
+            "complete": trace.complete,
+            "total_ms": round(trace.total_ms(), 3),
+            "stages": {k: round(v, 3) for k, v in durations.items()},
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "stages": {name: h.snapshot() for name, h in self.stages.items()},
+            "total": self.total.snapshot(),
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "last": self.last,
+        }
+
+
+# Process-wide ingest statistics shared by the watcher, server and commands
+ingest_stats = IngestStats()
+
+# Process-wide event-loop monitor, started by the dashboard and MCP servers
+loop_monitor = LoopMonitor()
+
+
+def start_loop_monitor() -> None:
+    """Start watching the running event loop, if enabled in config.
+
+    Safe to call repeatedly; stalls are attributed to commands through the
+    AFD server's registry.
+    """
+    from .commands.core import get_server
+    from .config import get_config
+
+    settings = get_config().loop_monitor
+    if not settings["enabled"]:
+        return
+    loop_monitor.interval_ms = settings["interval_ms"]
+    loop_monitor.threshold_ms = settings["stall_threshold_ms"]
+    loop_monitor.resolve = get_server().registry.command_for_task
+    loop_monitor.start()
+
+
+def render_prometheus(afd_server: Any, manager: Any, storage: Any) -> str:
+    """Render every runtime metric in Prometheus text exposition format.
+
+    Args:
+        afd_server: The AFD server (command registry and result cache).
+        manager: The WebSocket ConnectionManager.
+        storage: The SQLite Storage.
+    """
+    out = PrometheusWriter()
+    registry = afd_server.registry
+
+    # Commands
+    commands = registry.stats.snapshot()
+    for name, stats in commands.items():
+        out.counter(
+            "mechanic_command_executions_total",
+            "Command executions, including cached and coalesced results",
+            stats["calls"],
+            {"command": name},
+        )
+    for name, stats in commands.items():
+        out.counter(
+            "mechanic_command_errors_total",
+            "Command executions that returned an error",
+            stats["errors"],
+            {"command": name},
+        )
+    for name in commands:
+        out.histogram(
+            "mechanic_command_duration_seconds",
+            "Command latency as seen by the caller",
+            registry.stats.latency[name],
+            {"command": name},
+        )
+    for name, count in sorted(registry.coalesced.items()):
+        out.counter(
+            "mechanic_command_coalesced_total",
+            "Calls that shared an identical execution already in flight",
+            count,
+            {"command": name},
+        )
+
+    # Concurrency limits
+    limits = afd_server.limits.snapshot()
+    for gate, stats in limits.items():
+        out.gauge(
+            "mechanic_command_queue_depth",
+            "Executions waiting for a concurrency slot",
+            stats["waiting"],
+            {"gate": gate},
+        )
+    for gate, stats in limits.items():
+        out.gauge(
+            "mechanic_command_concurrency",
+            "Executions holding a concurrency slot",
+            stats["running"],
+            {"gate": gate},
+        )
+    for gate, stats in limits.items():
+        out.counter(
+            "mechanic_command_queued_total",
+            "Executions that had to wait for a concurrency slot",
+            stats["queued"],
+            {"gate": gate},
+        )
+
+    # Result cache
+    cache = afd_server.cache.stats()
+    out.gauge("mechanic_cache_entries", "Cached command results", cache["entries"])
+    out.counter("mechanic_cache_hits_total", "Result cache hits", cache["hits"])
+    out.counter("mechanic_cache_misses_total", "Result cache misses", cache["misses"])
+    out.counter(
+        "mechanic_cache_evictions_total",
+        "Results evicted from the cache",
+        cache["evictions"],
+    )
+    out.gauge("mechanic_cache_hit_ratio", "Result cache hit ratio", cache["hit_ratio"])
+    for name, counts in cache["commands"].items():
+        out.gauge(
+            "mechanic_cache_command_hit_ratio",
+            "Result cache hit ratio per command",
+            counts["hit_ratio"],
+            {"command": name},
+        )
+
+    # SavedVariables ingest
+    for stage, histogram in ingest_stats.stages.items():
+        out.histogram(
+            "mechanic_ingest_stage_duration_seconds",
+            "Time spent in each SavedVariables ingest stage",
+            histogram,
+            {"stage": stage},
+        )
+    out.histogram(
+        "mechanic_ingest_duration_seconds",
+        "Time from filesystem event to dashboard broadcast",
+        ingest_stats.total,
+    )
+    for outcome, count in (
+        ("completed", ingest_stats.completed),
+        ("skipped", ingest_stats.skipped),
+    ):
+        out.counter(
+            "mechanic_ingest_reloads_total",
+            "SavedVariables changes processed",
+            count,
+            {"outcome": outcome},
+        )
+
+    # WebSocket clients
+    ws = manager.stats()
+    depths = [client["queued"] for client in ws["per_client"]]
+    out.gauge("mechanic_ws_clients", "Connected WebSocket clients", ws["clients"])
+    out.gauge(
+        "mechanic_ws_queue_depth", "Messages queued across all clients", ws["queued"]
+    )
+    out.gauge(
+        "mechanic_ws_queue_depth_max",
+        "Deepest queue of any single client",
+        max(depths, default=0),
+    )
+    out.counter("mechanic_ws_broadcasts_total", "Messages broadcast", ws["broadcasts"])
+    out.counter(
+        "mechanic_ws_dropped_total", "Messages dropped for slow clients", ws["dropped"]
+    )
+    out.counter(
+        "mechanic_ws_slow_disconnects_total",
+        "Clients disconnected for falling behind",
+        ws["slow_disconnects"],
+    )
+
+    # Event loop
+    out.histogram(
+        "mechanic_event_loop_lag_seconds",
+        "Delay before the event loop ran a scheduled callback",
+        loop_monitor.lag,
+    )
+    for offender in loop_monitor.snapshot()["offenders"]:
+        out.counter(
+            "mechanic_event_loop_stalls_total",
+            "Event loop stalls, by the command or task that was running",
+            offender["stalls"],
+            {"source": offender["source"]},
+        )
+
+    # SQLite
+    for operation, histogram in sorted(storage.write_latency.items()):
+        out.histogram(
+            "mechanic_sqlite_write_duration_seconds",
+            "SQLite write latency, including commit",
+            histogram,
+            {"operation": operation},
+        )
+
+    return out.render()
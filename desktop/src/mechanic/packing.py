@@ -0,0 +1,216 @@
+"""
+Compact binary encoding for dashboard WebSocket frames.
+
+Reload payloads repeat the same strings many times (test names, log
+categories, addon names, table keys in every console entry). The "packed"
+encoding stores each distinct string once per frame in a string table and
+refers to it by index everywhere else, then optionally zlib-compresses the
+result.
+
+Frame layout:
+
+    magic "MP" | version (1 byte) | flags (1 byte) | body
+
+    flags bit 0: body is zlib-compressed
+
+    body = varint string_count, string_count x (varint byte_length, utf-8),
+           value
+
+Values are tagged with a single byte:
+
+    0x00 null      0x01 false     0x02 true
+    0x03 int       zigzag varint
+    0x04 float     IEEE 754 double, big-endian
+    0x05 string    varint index into the string table
+    0x06 array     varint length, then each value
+    0x07 object    varint length, then (varint key index, value) pairs
+
+Dict keys are coerced to strings, matching json.dumps. Anything else that
+JSON can't represent is encoded via str(), like json.dumps(default=str).
+The dashboard ships a matching decoder (decodePacked in index.html).
+"""
+
+import struct
+import zlib
+from typing import Any, Dict, List, Tuple
+
+MAGIC = b"MP"
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+# Bodies smaller than this aren't worth compressing
+COMPRESS_THRESHOLD = 1024
+
+_NULL, _FALSE, _TRUE, _INT, _FLOAT, _STR, _ARRAY, _OBJECT = range(8)
+_DOUBLE = struct.Struct(">d")
+
+
+class PackError(ValueError):
+    """Raised when a frame cannot be decoded."""
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise PackError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Packer:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.out = bytearray()
+
+    def _ref(self, text: str) -> int:
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def write(self, value: Any) -> None:
+        out = self.out
+        if value is None:
+            out.append(_NULL)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_varint(out, self._ref(value))
+        elif isinstance(value, (list, tuple)):
+            out.append(_ARRAY)
+            _write_varint(out, len(value))
+            for item in value:
+                self.write(item)
+        elif isinstance(value, dict):
+            out.append(_OBJECT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_varint(out, self._ref(key if isinstance(key, str) else str(key)))
+                self.write(item)
+        else:
+            self.write(str(value))
+
+    def body(self) -> bytes:
+        header = bytearray()
+        _write_varint(header, len(self.strings))
+        for text in self.strings:
+            encoded = text.encode("utf-8")
+            _write_varint(header, len(encoded))
+            header += encoded
+        return bytes(header + self.out)
+
+
+def pack(value: Any, compress_threshold: int = COMPRESS_THRESHOLD) -> bytes:
+    """
+    Encode a JSON-compatible value as a packed frame.
+
+    Args:
+        value: Payload to encode (dicts, lists, str, int, float, bool, None).
+        compress_threshold: zlib-compress bodies at least this large;
+            pass 0 to always compress, or a negative number to never compress.
+
+    Returns:
+        The encoded frame.
+    """
+    packer = _Packer()
+    packer.write(value)
+    body = packer.body()
+
+    flags = 0
+    if 0 <= compress_threshold <= len(body):
+        compressed = zlib.compress(body, 6)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= FLAG_ZLIB
+
+    return MAGIC + bytes((VERSION, flags)) + body
+
+
+def unpack(frame: bytes) -> Any:
+    """
+    Decode a packed frame.
+
+    Raises:
+        PackError: If the frame is malformed or uses an unknown version.
+    """
+    if frame[:2] != MAGIC or len(frame) < 4:
+        raise PackError("Not a packed frame")
+    if frame[2] != VERSION:
+        raise PackError(f"Unsupported packed frame version {frame[2]}")
+
+    body = frame[4:]
+    if frame[3] & FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise PackError(f"Corrupt compressed body: {e}") from e
+
+    count, pos = _read_varint(body, 0)
+    strings: List[str] = []
+    for _ in range(count):
+        length, pos = _read_varint(body, pos)
+        strings.append(body[pos : pos + length].decode("utf-8"))
+        pos += length
+
+    value, _ = _read_value(body, pos, strings)
+    return value
+
+
+def _read_value(data: bytes, pos: int, strings: List[str]) -> Tuple[Any, int]:
+    if pos >= len(data):
+        raise PackError("Truncated frame")
+    tag = data[pos]
+    pos += 1
+
+    if tag == _NULL:
+        return None, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _INT:
+        raw, pos = _read_varint(data, pos)
+        return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    if tag == _STR:
+        index, pos = _read_varint(data, pos)
+        return strings[index], pos
+    if tag == _ARRAY:
+        length, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(length):
+            item, pos = _read_value(data, pos, strings)
+            items.append(item)
+        return items, pos
+    if tag == _OBJECT:
+        length, pos = _read_varint(data, pos)
+        obj = {}
+        for _ in range(length):
+            index, pos = _read_varint(data, pos)
+            obj[strings[index]], pos = _read_value(data, pos, strings)
+        return obj, pos
+
+    raise PackError(f"Unknown value tag 0x{tag:02x} at offset {pos - 1}")
@@ -1,13 +1,30 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from pathlib import Path
-from typing import Optional
-import json
+from typing import Any, Dict, Optional
 import asyncio
+import json
 from .storage import Storage
 from .config import get_config
+from .connections import ConnectionManager, parse_topics
+from .http_cache import (
+    GZIP_MINIMUM_SIZE,
+    DashboardStaticFiles,
+    SelectiveGZipMiddleware,
+    conditional_json,
+    make_etag,
+    not_modified,
+)
+
+# Server-Sent Events routes; compressing them would hold events back
+STREAM_PATHS = ("/api/execute/stream",)
 
 app = FastAPI(title="Mechanic Desktop")
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=GZIP_MINIMUM_SIZE,
+    exclude_paths=STREAM_PATHS,
+)
 
 # Initialize storage using centralized config
 config = get_config()
@@ -16,28 +33,19 @@ storage = Storage(config.data_dir / "mechanic.db")
 # Mount dashboard folder
 dashboard_path = Path(__file__).parent.parent.parent / "dashboard"
 app.mount(
-    "/dashboard", StaticFiles(directory=dashboard_path, html=True), name="dashboard"
+    "/dashboard",
+    DashboardStaticFiles(directory=dashboard_path, html=True),
+    name="dashboard",
 )
 
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
-
-manager = ConnectionManager()
+ws_settings = config.websocket
+manager = ConnectionManager(
+    max_queue=ws_settings["max_queue"],
+    policy=ws_settings["slow_consumer"],
+    send_timeout=ws_settings["send_timeout_ms"] / 1000,
+    replay_size=ws_settings["replay_buffer"],
+)
 
 
 @app.get("/")
@@ -51,6 +59,39 @@ async def health():
     return {"status": "healthy"}
 
 
+# Internal/polling commands that don't belong in the history
+HISTORY_SKIP_COMMANDS = {
+    "sv.discover",
+    "tools.status",
+    "dashboard.metrics",
+    "server.shutdown",
+    "watcher.stats",
+    "ws.stats",
+    "cache.stats",
+    "server.diagnostics",
+}
+
+
+def _record_history(name: Optional[str], input_data: dict, result: Any) -> None:
+    """Persist a command result to history."""
+    if name and name not in HISTORY_SKIP_COMMANDS:
+        storage.save_command_result(name, result, input_data.get("addon"))
+
+
+def _json_response(result: Any) -> Response:
+    """Send a CommandResult using its cached JSON bytes."""
+    return Response(content=result.to_json_bytes(), media_type="application/json")
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message (data may be JSON bytes)."""
+    if isinstance(data, bytes):
+        payload = data.decode("utf-8")
+    else:
+        payload = json.dumps(data, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
 @app.post("/api/execute")
 async def execute_command(req: dict):
     """Bridge between FastAPI and AFD Server. Persists results to history."""
@@ -61,29 +102,133 @@ async def execute_command(req: dict):
     input_data = req.get("input", {})
 
     result = await server.execute(name, input_data)
+    _record_history(name, input_data, result)
+    return _json_response(result)
 
-    # Convert result to dict for storage
-    result_dict = result.model_dump() if hasattr(result, "model_dump") else dict(result)
 
-    # Save to history (skip internal commands like sv.discover, tools.status)
-    skip_commands = {
-        "sv.discover",
-        "tools.status",
-        "dashboard.metrics",
-        "server.shutdown",
-    }
-    if name and name not in skip_commands:
-        addon = input_data.get("addon")
-        storage.save_command_result(name, result_dict, addon)
+@app.post("/api/execute/batch")
+async def execute_batch(req: dict):
+    """
+    Run several commands in one request (see batch.run).
 
-    return result
+    Body: {"steps": [{"command", "input", "id"?, "depends_on"?}, ...],
+    "max_concurrency"?, "stop_on_error"?}. Each step's result is saved to
+    history under its own command.
+    """
+    from .commands.core import get_server
+
+    server = get_server()
+    result = await server.execute("batch.run", req)
+    if result.success:
+        # Results come back in request order
+        for step, outcome in zip(req["steps"], result.data.results):
+            if outcome.status != "skipped":
+                _record_history(outcome.command, step.get("input", {}), outcome.result)
+    return _json_response(result)
+
+
+@app.post("/api/execute/stream")
+async def execute_command_stream(req: dict):
+    """
+    Execute a command, streaming its progress as Server-Sent Events.
+
+    Takes the same body as /api/execute. Emits ``progress`` events (and
+    ``partial`` events when the handler reports partial results) while the
+    command runs, then a single ``result`` event with the CommandResult.
+    """
+    from afd.core import CommandContext
+
+    from .commands.core import get_server
+
+    server = get_server()
+    name = req.get("command")
+    input_data = req.get("input", {})
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: Dict[str, Any]) -> None:
+        # Handlers may report from worker threads (asyncio.to_thread)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            events.put_nowait(event)
+        else:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+    async def stream():
+        task = asyncio.create_task(
+            server.execute(name, input_data, CommandContext(on_progress=emit))
+        )
+        done = asyncio.create_task(events.get())
+        try:
+            while True:
+                finished, _ = await asyncio.wait(
+                    {task, done}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if done in finished:
+                    event = done.result()
+                    yield _sse("partial" if "partial" in event else "progress", event)
+                    done = asyncio.create_task(events.get())
+                elif task in finished:
+                    break
+            done.cancel()
+            # Flush anything reported just before the handler returned
+            while not events.empty():
+                event = events.get_nowait()
+                yield _sse("partial" if "partial" in event else "progress", event)
+            result = task.result()
+            _record_history(name, input_data, result)
+            yield _sse("result", result.to_json_bytes())
+        finally:
+            # Client went away: stop waiting on the queue, let the command finish
+            done.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/history")
-async def get_history(command: Optional[str] = None, limit: int = 50):
-    """Get command execution history."""
+async def get_history(request: Request, command: Optional[str] = None, limit: int = 50):
+    """Get command execution history. Supports If-None-Match."""
+    last_id, count = storage.get_command_history_version(command)
+    etag = make_etag("history", last_id, count)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     history = storage.get_command_history(command, limit)
-    return {"history": history}
+    return conditional_json({"history": history}, etag)
+
+
+@app.get("/api/metrics")
+async def get_metrics(request: Request):
+    """Get the most recent reload's data. Supports If-None-Match."""
+    etag = make_etag("reload", storage.get_latest_reload_id() or 0)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    return conditional_json({"metrics": storage.get_latest_metrics()}, etag)
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Runtime metrics in Prometheus text exposition format."""
+    from afd.core import PrometheusWriter
+
+    from .commands.core import get_server
+    from .metrics import render_prometheus
+
+    return Response(
+        render_prometheus(get_server(), manager, storage),
+        media_type=PrometheusWriter.CONTENT_TYPE,
+    )
 
 
 @app.post("/api/history/clear")
@@ -96,29 +241,80 @@ async def clear_history(req: dict = None):
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    # Clients opt into binary frames with /ws?encoding=packed, pick topics
+    # with /ws?topics=errors:Weekly,tests and resume with /ws?last_seq=N&epoch=E
+    # (see connections.py)
+    params = websocket.query_params
+    last_seq = params.get("last_seq")
+    await manager.connect(
+        websocket,
+        encoding=params.get("encoding", "json"),
+        topics=parse_topics(params.get("topics", "")),
+        last_seq=int(last_seq) if last_seq and last_seq.isdigit() else None,
+        epoch=params.get("epoch"),
+    )
     try:
         while True:
-            await websocket.receive_text()
+            manager.handle_message(websocket, await websocket.receive_text())
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
+def reload_topics(addon: str, timestamp: float, data: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a reload into per-topic payloads.
+
+    "addon:<name>" carries the full SavedVariables data; the other topics
+    carry only their slice, so a client watching one addon's errors never
+    receives the rest of the database.
+    """
+    topics = {
+        f"addon:{addon}": {
+            "type": "reload",
+            "addon": addon,
+            "timestamp": timestamp,
+            "data": data,
+        }
+    }
+    if not isinstance(data, dict):
+        return topics
+
+    slices = {
+        "tests": {"tests": data.get("tests")},
+        "console": {"consoleBuffer": data.get("consoleBuffer")},
+        "errors": {"healthLog": data.get("healthLog")},
+        "perf": {"perf": data.get("perf")},
+    }
+    for kind, slice_data in slices.items():
+        if any(slice_data.values()):
+            topics[f"{kind}:{addon}"] = {
+                "type": kind,
+                "addon": addon,
+                "timestamp": timestamp,
+                "data": slice_data,
+            }
+    return topics
+
+
 async def notify_reload(update_info: dict):
     """
     Broadcaster for file watcher to call.
-    update_info = {"addon": str, "timestamp": float, "data": dict}
+    update_info = {"addon": str, "timestamp": float, "data": dict, "trace": IngestTrace?}
     """
     # Save to SQLite
     addon = update_info.get("addon")
     data = update_info.get("data")
     timestamp = update_info.get("timestamp")
+    trace = update_info.get("trace")
 
     # Storage expects dict of addon_name -> data
     storage.save_reload(timestamp, {addon: data})
+    if trace:
+        trace.mark("storage")
 
-    # Broadcast to UI
-    payload = json.dumps(
-        {"type": "reload", "addon": addon, "timestamp": timestamp, "data": data}
-    )
-    await manager.broadcast(payload)
+    # Broadcast to UI, one message per topic
+    await manager.publish(reload_topics(addon, timestamp, data))
+    if trace:
+        trace.mark("broadcast")
@@ -1,15 +1,32 @@
 import sqlite3
 import json
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+from afd.core.metrics import Histogram
+
 
 class Storage:
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        # Write latency (including commit) per operation, for /metrics
+        self.write_latency: Dict[str, Histogram] = {}
         self._init_db()
 
+    @contextmanager
+    def _write(self, operation: str):
+        """Connection for a write transaction, timed until it commits."""
+        start = time.perf_counter()
+        with sqlite3.connect(self.db_path) as conn:
+            yield conn
+        histogram = self.write_latency.get(operation)
+        if histogram is None:
+            histogram = self.write_latency[operation] = Histogram()
+        histogram.observe((time.perf_counter() - start) * 1000)
+
     def _init_db(self):
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("""
@@ -62,7 +79,7 @@ class Storage:
     def save_reload(
         self, timestamp: float, addons_data: dict, session_id: str = "default"
     ):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write("save_reload") as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO reload_history (timestamp, session_id, addons_data) VALUES (?, ?, ?)",
@@ -94,6 +111,12 @@ class Storage:
                     )
             return reload_id
 
+    def get_latest_reload_id(self) -> Optional[int]:
+        """Id of the most recent reload, used as a cache validator."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT MAX(id) FROM reload_history").fetchone()
+            return row[0] if row else None
+
     def get_latest_metrics(self):
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
@@ -115,10 +138,21 @@ class Storage:
     # ═══════════════════════════════════════════════════════════════════════════
 
     def save_command_result(
-        self, command: str, result: Dict[str, Any], addon: Optional[str] = None
+        self, command: str, result: Any, addon: Optional[str] = None
     ) -> int:
-        """Save a command execution result to the database."""
-        with sqlite3.connect(self.db_path) as conn:
+        """
+        Save a command execution result to the database.
+
+        ``result`` is a CommandResult (its cached JSON is stored as-is) or
+        a result dict.
+        """
+        if hasattr(result, "to_json_bytes"):
+            success = result.success
+            result_json = result.to_json_bytes().decode("utf-8")
+        else:
+            success = result.get("success", False)
+            result_json = json.dumps(result)
+        with self._write("save_command_result") as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO command_results (command, addon, timestamp, success, result_json) VALUES (?, ?, ?, ?, ?)",
@@ -126,12 +160,31 @@ class Storage:
                     command,
                     addon,
                     datetime.now().isoformat(),
-                    result.get("success", False),
-                    json.dumps(result),
+                    success,
+                    result_json,
                 ),
             )
             return cursor.lastrowid
 
+    def get_command_history_version(self, command: Optional[str] = None) -> tuple:
+        """
+        (last row id, row count) for the command history, optionally filtered.
+
+        Changes whenever a result is added or history is cleared, so it can
+        serve as a cache validator without loading any result JSON.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            if command:
+                row = conn.execute(
+                    "SELECT MAX(id), COUNT(*) FROM command_results WHERE command = ?",
+                    (command,),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT MAX(id), COUNT(*) FROM command_results"
+                ).fetchone()
+            return (row[0] or 0, row[1])
+
     def get_command_history(
         self, command: Optional[str] = None, limit: int = 50
     ) -> List[Dict[str, Any]]:
@@ -165,7 +218,7 @@ class Storage:
 
     def clear_command_history(self, command: Optional[str] = None) -> int:
         """Clear command history, optionally for a specific command only."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write("clear_command_history") as conn:
             if command:
                 cursor = conn.execute(
                     "DELETE FROM command_results WHERE command = ?", (command,)
@@ -1,11 +1,120 @@
 import asyncio
-from watchfiles import awatch, watch
+from watchfiles import awatch, watch, Change
 from pathlib import Path
 from .server import notify_reload
 from .parsers import parse_savedvariables
+from .metrics import IngestTrace, ingest_stats
 import os
 import time
 
+WATCHER_BACKENDS = ("native", "polling")
+
+
+class SVPoller:
+    """
+    Adaptive stat-based change detection for SavedVariables folders.
+
+    Native change notifications are unreliable on SMB shares and VM shared
+    folders, so this polls with os.stat instead. Only the known *.lua files
+    in each SavedVariables folder are stat'ed on each tick; the folders
+    themselves are re-listed occasionally to pick up new addons.
+
+    The poll interval drops to `min_interval` as soon as a write is seen
+    (WoW writes every SV file in a burst on /reload) and backs off
+    exponentially towards `max_interval` while nothing changes.
+    """
+
+    # Seconds between directory listings (new SV files are rare)
+    RESCAN_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        sv_paths: list[Path],
+        min_interval: float = 0.1,
+        max_interval: float = 2.0,
+        backoff: float = 2.0,
+    ):
+        self.sv_paths = sv_paths
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.interval = min_interval
+        self._known: dict[str, tuple[int, int]] = {}
+        self._last_rescan: float | None = None
+
+    def _list_files(self) -> list[str]:
+        files = []
+        for sv_path in self.sv_paths:
+            try:
+                with os.scandir(sv_path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".lua") and entry.is_file():
+                            files.append(entry.path)
+            except OSError:
+                continue
+        return files
+
+    def poll(self) -> set[tuple[Change, str]]:
+        """Stat the known file set once and return what changed since last poll."""
+        changes: set[tuple[Change, str]] = set()
+
+        now = time.monotonic()
+        first_scan = self._last_rescan is None
+        if first_scan or now - self._last_rescan >= self.RESCAN_INTERVAL:
+            self._last_rescan = now
+            for path in self._list_files():
+                if path in self._known:
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                self._known[path] = (st.st_mtime_ns, st.st_size)
+                if not first_scan:
+                    changes.add((Change.added, path))
+
+        for path, signature in list(self._known.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                # Deleted (or share unavailable) - rediscovered on next rescan
+                del self._known[path]
+                continue
+            current = (st.st_mtime_ns, st.st_size)
+            if current != signature:
+                self._known[path] = current
+                changes.add((Change.modified, path))
+
+        return changes
+
+    def next_interval(self, changed: bool) -> float:
+        """Speed up after activity, back off exponentially while idle."""
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return self.interval
+
+    async def changes(self, stop_event: asyncio.Event = None):
+        """Yield sets of (Change, path) tuples, like watchfiles.awatch."""
+        stop_event = stop_event or asyncio.Event()
+
+        # Prime the known set so existing files don't register as changes
+        await asyncio.to_thread(self.poll)
+
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            # Stat calls can block on network drives; keep them off the loop
+            changed = await asyncio.to_thread(self.poll)
+            self.next_interval(bool(changed))
+            if changed:
+                yield changed
+
 
 class SVWatcher:
     def __init__(
@@ -14,6 +123,9 @@ class SVWatcher:
         src_paths: list[Path] = None,
         auto_reload: bool = False,
         reload_key: str = "^+r",
+        backend: str = "native",
+        poll_min_ms: int = 100,
+        poll_max_ms: int = 2000,
     ):
         # Keep original for diagnostics
         self.raw_watch = watch_paths
@@ -23,8 +135,16 @@ class SVWatcher:
         self.watch_paths = [p for p in watch_paths if p.exists()]
         self.src_paths = [p for p in (src_paths or []) if p.exists()]
 
+        if backend not in WATCHER_BACKENDS:
+            raise ValueError(
+                f"Unknown watcher backend '{backend}' (expected one of {', '.join(WATCHER_BACKENDS)})"
+            )
+
         self.auto_reload = auto_reload
         self.reload_key = reload_key
+        self.backend = backend
+        self.poll_min_ms = poll_min_ms
+        self.poll_max_ms = poll_max_ms
         self.running = False
         self.last_parsed = {}
 
@@ -49,104 +169,142 @@ class SVWatcher:
             return
 
         print(
-            f"Watcher started on {len(self.watch_paths)} SV paths and {len(self.src_paths)} src paths..."
+            f"Watcher started on {len(self.watch_paths)} SV paths and {len(self.src_paths)} src paths ({self.backend} backend)..."
         )
         for p in self.watch_paths:
             print(f"   📂 Watching SV: {p}")
 
         try:
-            async for changes in awatch(*all_watch_paths, stop_event=stop_event):
+            if self.backend == "polling":
+                await self._run_polling(stop_event)
+            else:
+                async for changes in awatch(*all_watch_paths, stop_event=stop_event):
+                    if not self.running:
+                        break
+                    await self._handle_changes(changes)
+        except Exception as e:
+            if self.running:  # Only print if we didn't expect to stop
+                print(f"Watcher loop error: {e}")
+
+    async def _run_polling(self, stop_event: asyncio.Event = None):
+        """Stat-poll SavedVariables; source folders keep native notifications."""
+        src_task = None
+        if self.src_paths:
+            src_task = asyncio.create_task(self._watch_src(stop_event))
+
+        poller = SVPoller(
+            self.watch_paths,
+            min_interval=self.poll_min_ms / 1000,
+            max_interval=self.poll_max_ms / 1000,
+        )
+        try:
+            async for changes in poller.changes(stop_event):
                 if not self.running:
                     break
+                await self._handle_changes(changes)
+        finally:
+            if src_task:
+                src_task.cancel()
 
-                # Debug: Log all detected changes
-                print(f"🔍 Watcher detected {len(changes)} file change(s)")
+    async def _watch_src(self, stop_event: asyncio.Event = None):
+        async for changes in awatch(*self.src_paths, stop_event=stop_event):
+            if not self.running:
+                break
+            await self._handle_changes(changes)
 
-                for change, file_path in changes:
-                    print(f"   -> {change}: {file_path}")
-                    file_path_obj = Path(file_path)
+    async def _handle_changes(self, changes):
+        # Stage timing starts the moment the batch is delivered
+        event_wall = time.time()
+        event_perf = time.perf_counter()
 
-                    # Case 1: Source code change (Hot Reload)
-                    is_src_change = any(
-                        file_path_obj.is_relative_to(src_p) for src_p in self.src_paths
+        # Debug: Log all detected changes
+        print(f"🔍 Watcher detected {len(changes)} file change(s)")
+
+        for change, file_path in changes:
+            print(f"   -> {change}: {file_path}")
+            file_path_obj = Path(file_path)
+
+            # Case 1: Source code change (Hot Reload)
+            is_src_change = any(
+                file_path_obj.is_relative_to(src_p) for src_p in self.src_paths
+            )
+            if is_src_change and file_path.endswith(".lua"):
+                if self.auto_reload:
+                    from .utils import trigger_wow_reload
+
+                    print(
+                        f"Source change detected: {file_path_obj.name}. Triggering reload..."
                     )
-                    if is_src_change and file_path.endswith(".lua"):
-                        if self.auto_reload:
-                            from .utils import trigger_wow_reload
+                    trigger_wow_reload(self.reload_key)
+                continue
 
-                            print(
-                                f"Source change detected: {file_path_obj.name}. Triggering reload..."
-                            )
-                            trigger_wow_reload(self.reload_key)
-                        continue
+            # Case 2: SavedVariables change (Broadcast to UI)
+            if file_path.endswith(".lua"):
+                # Ignore Blizzard internal variables immediately
+                if file_path_obj.stem.startswith("Blizzard_"):
+                    continue
 
-                    # Case 2: SavedVariables change (Broadcast to UI)
-                    if file_path.endswith(".lua"):
-                        # Ignore Blizzard internal variables immediately
-                        if file_path_obj.stem.startswith("Blizzard_"):
-                            continue
+                trace = IngestTrace(
+                    str(file_path_obj),
+                    detected_at=event_wall,
+                    marks={"fs_event": event_perf},
+                )
+
+                # Small delay to ensure file is finished writing
+                await asyncio.sleep(0.1)
+                trace.mark("debounce")
 
-                        # Small delay to ensure file is finished writing
-                        await asyncio.sleep(0.1)
+                try:
+                    from afd.core import CommandContext
+                    from .commands.core import get_server
 
-                        try:
-                            from .commands.core import get_server
+                    server = get_server()
 
-                            server = get_server()
+                    result = await server.execute(
+                        "sv.parse",
+                        {"file_path": str(file_path_obj)},
+                        CommandContext(extra={"ingest_trace": trace}),
+                    )
 
-                            result = await server.execute(
-                                "sv.parse", {"file_path": str(file_path_obj)}
+                    if result.success and result.data:
+                        var_name = file_path_obj.stem
+                        addon_data = result.data.addons.get(var_name)
+
+                        if addon_data:
+                            # Check for actionable data (Tests, Health Log, Console Buffer)
+                            # or if it's explicitly the !Mechanic addon
+                            has_tests = "tests" in addon_data and addon_data["tests"]
+                            has_logs = (
+                                "healthLog" in addon_data and addon_data["healthLog"]
+                            )
+                            has_console = (
+                                "consoleBuffer" in addon_data
+                                and addon_data["consoleBuffer"]
                             )
+                            is_mechanic = var_name == "!Mechanic"
 
-                            if result.success and result.data:
-                                var_name = file_path_obj.stem
-                                addon_data = result.data.addons.get(var_name)
-
-                                if addon_data:
-                                    # Check for actionable data (Tests, Health Log, Console Buffer)
-                                    # or if it's explicitly the !Mechanic addon
-                                    has_tests = (
-                                        "tests" in addon_data and addon_data["tests"]
-                                    )
-                                    has_logs = (
-                                        "healthLog" in addon_data
-                                        and addon_data["healthLog"]
-                                    )
-                                    has_console = (
-                                        "consoleBuffer" in addon_data
-                                        and addon_data["consoleBuffer"]
-                                    )
-                                    is_mechanic = var_name == "!Mechanic"
-
-                                    if (
-                                        has_tests
-                                        or has_logs
-                                        or has_console
-                                        or is_mechanic
-                                    ):
-                                        print(
-                                            f"📡 Actionable update in {var_name} (tests={bool(has_tests)}, logs={bool(has_logs)}, console={bool(has_console)})"
-                                        )
-                                        await notify_reload(
-                                            {
-                                                "addon": var_name,
-                                                "timestamp": time.time(),
-                                                "data": addon_data,
-                                            }
-                                        )
-                                    else:
-                                        print(
-                                            f"⏭️ Skipped {var_name}: no actionable data"
-                                        )
-                                else:
-                                    print(
-                                        f"⏭️ Skipped {file_path_obj.name}: no addon_data found for {var_name}"
-                                    )
-                        except Exception as e:
-                            print(f"Error triggering AFD parse for {file_path}: {e}")
-        except Exception as e:
-            if self.running:  # Only print if we didn't expect to stop
-                print(f"Watcher loop error: {e}")
+                            if has_tests or has_logs or has_console or is_mechanic:
+                                print(
+                                    f"📡 Actionable update in {var_name} (tests={bool(has_tests)}, logs={bool(has_logs)}, console={bool(has_console)})"
+                                )
+                                await notify_reload(
+                                    {
+                                        "addon": var_name,
+                                        "timestamp": time.time(),
+                                        "data": addon_data,
+                                        "trace": trace,
+                                    }
+                                )
+                            else:
+                                print(f"⏭️ Skipped {var_name}: no actionable data")
+                        else:
+                            print(
+                                f"⏭️ Skipped {file_path_obj.name}: no addon_data found for {var_name}"
+                            )
+                except Exception as e:
+                    print(f"Error triggering AFD parse for {file_path}: {e}")
+                finally:
+                    ingest_stats.record(trace)
 
     def stop(self):
         self.running = False
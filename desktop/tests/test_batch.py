@@ -0,0 +1,157 @@
+"""
+Batch Execution Tests for Mechanic Desktop.
+
+Tests verify batch.run:
+- Independent steps run concurrently, up to the concurrency cap
+- Dependencies run in order; failures skip their dependents
+- Invalid plans (unknown ids, cycles) are rejected before running anything
+"""
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from afd import error, success
+from afd.core import BatchError, BatchStep, run_batch
+from afd.core.batch import plan_batch
+from afd.server import create_server
+from afd.testing.assertions import assert_success
+from mechanic.commands.core import get_server
+
+
+class SleepInput(BaseModel):
+    ms: int = 0
+    fail: bool = False
+
+
+def _timeline_server():
+    """A server whose command sleeps and records start/finish order."""
+    server = create_server("batch-test")
+    events = []
+    running = {"now": 0, "peak": 0}
+
+    @server.command(name="sleep", description="Sleep", input_schema=SleepInput)
+    async def sleep(input: SleepInput):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        events.append(("start", input.ms))
+        await asyncio.sleep(input.ms / 1000)
+        events.append(("end", input.ms))
+        running["now"] -= 1
+        if input.fail:
+            return error(code="FAILED", message="failed on purpose")
+        return success({"slept": input.ms})
+
+    return server, events, running
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Planning
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_plan_rejects_invalid_graphs():
+    """Test duplicate ids, unknown dependencies and cycles are rejected."""
+    with pytest.raises(BatchError, match="Duplicate"):
+        plan_batch([BatchStep(command="a"), BatchStep(command="a")])
+    with pytest.raises(BatchError, match="unknown"):
+        plan_batch([BatchStep(command="a", depends_on=["b"])])
+    with pytest.raises(BatchError, match="cycle"):
+        plan_batch(
+            [
+                BatchStep(command="a", depends_on=["b"]),
+                BatchStep(command="b", depends_on=["a"]),
+            ]
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Execution
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently_within_cap():
+    """Test independent steps overlap but never exceed max_concurrency."""
+    server, _, running = _timeline_server()
+    # Distinct inputs, so single-flight doesn't merge them
+    steps = [
+        BatchStep(id=f"s{i}", command="sleep", input={"ms": 30 + i}) for i in range(6)
+    ]
+
+    results = await run_batch(server.execute, steps, max_concurrency=3)
+
+    assert [r.status for r in results] == ["success"] * 6
+    assert running["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_dependencies_order_and_failure_skips_dependents():
+    """Test a step waits for its dependencies and is skipped if one fails."""
+    server, events, _ = _timeline_server()
+    steps = [
+        BatchStep(id="first", command="sleep", input={"ms": 20}),
+        BatchStep(id="second", command="sleep", input={"ms": 1}, depends_on=["first"]),
+        BatchStep(id="broken", command="sleep", input={"ms": 2, "fail": True}),
+        BatchStep(id="after", command="sleep", depends_on=["broken"]),
+    ]
+
+    results = {r.id: r for r in await run_batch(server.execute, steps)}
+
+    assert events.index(("end", 20)) < events.index(("start", 1))
+    assert results["broken"].status == "failure"
+    assert results["after"].status == "skipped"
+    assert results["after"].result.error.code == "DEPENDENCY_FAILED"
+
+
+@pytest.mark.asyncio
+async def test_stop_on_error_skips_pending_steps():
+    """Test stop_on_error skips steps that had not started yet."""
+    server, _, _ = _timeline_server()
+    steps = [
+        BatchStep(id="broken", command="sleep", input={"fail": True}),
+        BatchStep(id="later", command="sleep", input={"ms": 1}),
+    ]
+
+    results = await run_batch(
+        server.execute, steps, max_concurrency=1, stop_on_error=True
+    )
+
+    assert [r.status for r in results] == ["failure", "skipped"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# batch.run
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_batch_run_command():
+    """Test batch.run returns every step's result and per-status counts."""
+    server = get_server()
+    result = await server.execute(
+        "batch.run",
+        {
+            "steps": [
+                {"command": "ws.stats"},
+                {"command": "cache.stats", "depends_on": ["ws.stats"]},
+                {"command": "no.such.command"},
+            ]
+        },
+    )
+
+    data = assert_success(result)
+    assert [r.id for r in data.results] == ["ws.stats", "cache.stats", "no.such.command"]
+    assert (data.succeeded, data.failed, data.skipped) == (2, 1, 0)
+    assert data.results[2].result.error.code == "COMMAND_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_batch_run_rejects_cycles():
+    """Test batch.run reports an invalid plan as an error."""
+    server = get_server()
+    result = await server.execute(
+        "batch.run",
+        {"steps": [{"command": "ws.stats", "depends_on": ["ws.stats"]}]},
+    )
+
+    assert not result.success
+    assert result.error.code == "INVALID_BATCH"
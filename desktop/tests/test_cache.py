@@ -0,0 +1,301 @@
+"""
+Result Cache Tests for Mechanic Desktop.
+
+Tests verify duplicate work is avoided for read-only commands:
+- LRU eviction and hit/miss accounting
+- Fingerprint changes invalidate cached results
+- Mutations and failures are never cached
+- Identical concurrent calls share one execution (single flight), opt-in
+- cache.stats reporting
+"""
+
+import asyncio
+import os
+
+import pytest
+from pydantic import BaseModel
+
+from afd import error, success
+from afd.core import CommandContext, ResultCache, file_fingerprint, tree_fingerprint
+from afd.server import create_server
+from afd.testing.assertions import assert_success
+from mechanic.commands.core import get_server
+
+
+class EchoInput(BaseModel):
+    value: str = "x"
+
+
+def _counting_server(path, mutation: bool = False):
+    """A server with one command that counts how often it really runs."""
+    server = create_server("cache-test")
+    calls = []
+
+    @server.command(
+        name="echo",
+        description="Echo the input",
+        input_schema=EchoInput,
+        mutation=mutation,
+        fingerprint=lambda input: file_fingerprint(path),
+    )
+    async def echo(input: EchoInput):
+        calls.append(input.value)
+        if input.value == "fail":
+            return error(code="FAILED", message="failed on purpose")
+        return success({"value": input.value})
+
+    return server, calls
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ResultCache
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_lru_eviction_and_stats():
+    """Test the least recently used entry is evicted and hits are counted."""
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.set("cmd", key, success({"key": key}))
+    assert cache.get("cmd", "a") is not None  # "b" is now least recent
+    cache.set("cmd", "c", success({"key": "c"}))
+
+    assert cache.get("cmd", "b") is None
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["commands"]["cmd"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_tree_fingerprint_tracks_changes(tmp_path):
+    """Test tree fingerprints change on edits and ignore hidden directories."""
+    (tmp_path / "Core.lua").write_text("-- v1")
+    (tmp_path / ".git").mkdir()
+    before = tree_fingerprint(tmp_path, (".lua",))
+
+    (tmp_path / ".git" / "index.lua").write_text("ignored")
+    (tmp_path / "notes.txt").write_text("ignored")
+    assert tree_fingerprint(tmp_path, (".lua",)) == before
+
+    (tmp_path / "Core.lua").write_text("-- version 2")
+    assert tree_fingerprint(tmp_path, (".lua",)) != before
+    assert tree_fingerprint(tmp_path / "missing") is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Registry
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_repeated_call_is_served_from_cache(tmp_path):
+    """Test identical calls run once until the fingerprinted file changes."""
+    data = tmp_path / "data.json"
+    data.write_text("{}")
+    server, calls = _counting_server(data)
+
+    first = await server.execute("echo", {"value": "a"})
+    second = await server.execute("echo", EchoInput(value="a"))
+    assert second is first
+    assert calls == ["a"]
+
+    await server.execute("echo", {"value": "b"})
+    assert calls == ["a", "b"]
+
+    stat = data.stat()
+    os.utime(data, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    await server.execute("echo", {"value": "a"})
+    assert calls == ["a", "b", "a"]
+    assert server.cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_equivalent_inputs_share_entry_and_flight(tmp_path):
+    """Test inputs that validate to the same model share one cache entry and one flight."""
+    server, calls = _counting_server(tmp_path / "data.json")
+
+    first = await server.execute("echo", {})
+    assert await server.execute("echo", {"value": "x"}) is first
+    assert await server.execute("echo", {"value": "x", "unused": None}) is first
+    assert calls == ["x"]
+    assert server.cache.stats()["entries"] == 1
+
+    server, gate, calls = _gated_server(coalesce=True)
+    pending = [
+        asyncio.ensure_future(server.execute("slow", input))
+        for input in ({}, {"value": "x"}, EchoInput())
+    ]
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(*pending)
+    assert calls == ["x"]
+
+
+@pytest.mark.asyncio
+async def test_failures_and_mutations_are_not_cached(tmp_path):
+    """Test errors are re-run and mutation commands bypass the cache."""
+    server, calls = _counting_server(tmp_path / "data.json")
+    await server.execute("echo", {"value": "fail"})
+    await server.execute("echo", {"value": "fail"})
+    assert calls == ["fail", "fail"]
+
+    mutating, calls = _counting_server(tmp_path / "data.json", mutation=True)
+    await mutating.execute("echo", {})
+    await mutating.execute("echo", {})
+    assert calls == ["x", "x"]
+    assert mutating.cache.stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_runs(tmp_path):
+    """Test a disabled cache stores nothing."""
+    server, calls = _counting_server(tmp_path / "data.json")
+    server.cache.enabled = False
+    await server.execute("echo", {})
+    await server.execute("echo", {})
+    assert calls == ["x", "x"]
+    assert server.cache.stats()["entries"] == 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Single Flight
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _gated_server(mutation: bool = False, coalesce=None):
+    """A server whose command blocks until the returned gate is set."""
+    server = create_server("coalesce-test")
+    gate = asyncio.Event()
+    calls = []
+
+    @server.command(
+        name="slow",
+        description="Wait for the gate",
+        input_schema=EchoInput,
+        mutation=mutation,
+        coalesce=coalesce,
+    )
+    async def slow(input: EchoInput):
+        calls.append(input.value)
+        await gate.wait()
+        return success({"value": input.value})
+
+    return server, gate, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    """Test concurrent identical calls run once and all get the result."""
+    server, gate, calls = _gated_server(coalesce=True)
+    pending = [
+        asyncio.ensure_future(server.execute("slow", {"value": "a"})) for _ in range(3)
+    ]
+    other = asyncio.ensure_future(server.execute("slow", {"value": "b"}))
+    await asyncio.sleep(0.01)
+    gate.set()
+
+    results = await asyncio.gather(*pending)
+    await other
+    assert calls == ["a", "b"]
+    assert all(r is results[0] for r in results)
+    assert server.registry.coalesced == {"slow": 2}
+
+    # Once finished, the next call runs again
+    await server.execute("slow", {"value": "a"})
+    assert calls == ["a", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_is_opt_in():
+    """Test commands run per call by default, and share only when coalesce=True."""
+    for mutation, coalesce, expected in (
+        (False, None, 2),
+        (True, None, 2),
+        (True, True, 1),
+    ):
+        server, gate, calls = _gated_server(mutation=mutation, coalesce=coalesce)
+        pending = [asyncio.ensure_future(server.execute("slow", {})) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(*pending)
+        assert len(calls) == expected
+
+
+@pytest.mark.asyncio
+async def test_callers_needing_their_context_do_not_join():
+    """Test progress listeners and callers with extra context get their own run."""
+    server, gate, calls = _gated_server(coalesce=True)
+    events = []
+    pending = [
+        asyncio.ensure_future(server.execute("slow", {})),
+        asyncio.ensure_future(
+            server.execute("slow", {}, CommandContext(on_progress=events.append))
+        ),
+        asyncio.ensure_future(
+            server.execute("slow", {}, CommandContext(extra={"ingest_trace": 1}))
+        ),
+    ]
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(*pending)
+
+    assert calls == ["x", "x", "x"]
+    assert server.registry.coalesced == {}
+
+
+def test_interactive_and_subprocess_commands_not_coalesced():
+    """Test only pure reads opt into single flight among mechanic's commands."""
+    registry = get_server().registry
+
+    for name in ("system.pick_file", "sandbox.exec", "addon.test", "addon.lint", "sv.parse"):
+        assert not registry.get(name).coalesce
+    for name in ("api.search", "addon.output", "addon.deadcode"):
+        assert registry.get(name).coalesce
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    """Test one caller giving up leaves the execution running for the others."""
+    server, gate, calls = _gated_server(coalesce=True)
+    first = asyncio.ensure_future(server.execute("slow", {}))
+    second = asyncio.ensure_future(server.execute("slow", {}))
+    await asyncio.sleep(0.01)
+
+    first.cancel()
+    await asyncio.sleep(0.01)
+    gate.set()
+
+    result = await second
+    assert result.success
+    assert calls == ["x"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Mechanic Commands
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_deadcode_cached_until_addon_changes(tmp_path):
+    """Test addon.deadcode results are reused until an addon file changes."""
+    addon = tmp_path / "CacheAddon"
+    addon.mkdir()
+    (addon / "CacheAddon.toc").write_text("## Title: CacheAddon\nCore.lua\n")
+    (addon / "Core.lua").write_text("local function unused() end\n")
+
+    server = get_server()
+    input = {"addon": "CacheAddon", "path": str(addon)}
+    first = await server.execute("addon.deadcode", input)
+    assert_success(first)
+    assert await server.execute("addon.deadcode", input) is first
+
+    (addon / "Core.lua").write_text("local function unused() end\nprint(1)\n")
+    assert await server.execute("addon.deadcode", input) is not first
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_command():
+    """Test cache.stats reports hit rates and can clear the cache."""
+    server = get_server()
+    result = await server.execute("cache.stats", {"clear": True})
+
+    data = assert_success(result)
+    assert data.hits >= 0
+    assert 0.0 <= data.hit_ratio <= 1.0
+    assert server.cache.stats()["entries"] == 0
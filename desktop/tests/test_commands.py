@@ -141,7 +141,7 @@ async def test_addon_lint_uses_luacheckrc_when_present(monkeypatch, tmp_path):
 
     captured = {}
 
-    def fake_run(cmd, capture_output, text, timeout):
+    async def fake_run(cmd, timeout):
         captured["cmd"] = cmd
         return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
 
@@ -149,7 +149,7 @@ async def test_addon_lint_uses_luacheckrc_when_present(monkeypatch, tmp_path):
     monkeypatch.setattr(
         mechanic_setup, "find_tool", lambda name: Path("C:/fake/luacheck.exe")
     )
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(dev_commands, "run_process", fake_run)
 
     server = get_server()
     result = await server.execute("addon.lint", {"addon": "MyAddon"})
@@ -171,7 +171,7 @@ async def test_addon_lint_omits_luacheckrc_when_missing(monkeypatch, tmp_path):
 
     captured = {}
 
-    def fake_run(cmd, capture_output, text, timeout):
+    async def fake_run(cmd, timeout):
         captured["cmd"] = cmd
         return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
 
@@ -179,7 +179,7 @@ async def test_addon_lint_omits_luacheckrc_when_missing(monkeypatch, tmp_path):
     monkeypatch.setattr(
         mechanic_setup, "find_tool", lambda name: Path("C:/fake/luacheck.exe")
     )
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(dev_commands, "run_process", fake_run)
 
     server = get_server()
     result = await server.execute("addon.lint", {"addon": "MyAddonNoConfig"})
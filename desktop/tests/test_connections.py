@@ -0,0 +1,452 @@
+"""
+WebSocket Connection Tests for Mechanic Desktop.
+
+Tests verify dashboard fan-out:
+- Broadcasts never wait on a slow client
+- Slow-consumer policies (drop_oldest, latest, disconnect)
+- Packed binary frame encoding
+- Topic subscriptions
+- Sequence numbers and replay on reconnect
+- Catch-up on reconnect is exempt from the slow-consumer policy, and a new
+  resume replaces unsent catch-up
+- ws.stats reporting
+"""
+
+import asyncio
+
+import pytest
+
+from afd.testing.assertions import assert_success
+from mechanic.commands.core import get_server
+from mechanic.connections import ClientConnection, ConnectionManager, topic_matches
+from mechanic.packing import PackError, pack, unpack
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, block: bool = False, fail: bool = False):
+        self.sent: list[str] = []
+        self.block = block
+        self.fail = fail
+        self.closed_with = None
+        self.unblock = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        if self.block:
+            await self.unblock.wait()
+        self.sent.append(message)
+
+    async def send_bytes(self, message: bytes):
+        await self.send_text(message)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def _drain():
+    """Let sender tasks run until they block."""
+    await asyncio.sleep(0.05)
+
+
+def _received(ws: FakeWebSocket) -> list:
+    """Messages a client received, minus the hello sent on connect."""
+    return [m for m in ws.sent if '"type": "hello"' not in str(m)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Fan-out
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others():
+    """Test a stuck client doesn't delay delivery to healthy clients."""
+    manager = ConnectionManager(max_queue=10)
+    stuck = FakeWebSocket(block=True)
+    healthy = FakeWebSocket()
+    await manager.connect(stuck)
+    await manager.connect(healthy)
+
+    for i in range(3):
+        assert await manager.broadcast(f"msg{i}") == 2
+    await _drain()
+
+    assert _received(healthy) == ["msg0", "msg1", "msg2"]
+    assert _received(stuck) == []
+
+    stuck.unblock.set()
+    await _drain()
+    assert _received(stuck) == ["msg0", "msg1", "msg2"]
+
+    manager.disconnect(stuck)
+    manager.disconnect(healthy)
+    assert manager.stats()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_send_removes_client():
+    """Test a client whose socket errors is dropped without affecting broadcast."""
+    manager = ConnectionManager()
+    broken = FakeWebSocket(fail=True)
+    await manager.connect(broken)
+
+    await manager.broadcast("hello")
+    await _drain()
+
+    assert broken not in manager.active_connections
+    assert manager.stats()["slow_disconnects"] == 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Slow-consumer Policies
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy():
+    """Test a full queue discards its oldest message."""
+    client = ClientConnection(FakeWebSocket(), max_queue=2, policy="drop_oldest")
+    for i in range(3):
+        assert client.enqueue(f"msg{i}")
+
+    assert [m for _, m in client._queue] == ["msg1", "msg2"]
+    assert client.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_latest_policy_replaces_superseded_updates():
+    """Test the latest policy keeps only the newest message per key."""
+    client = ClientConnection(FakeWebSocket(), max_queue=2, policy="latest")
+    client.enqueue("a1", key="reload:A")
+    client.enqueue("b1", key="reload:B")
+    client.enqueue("a2", key="reload:A")
+
+    assert [m for _, m in client._queue] == ["b1", "a2"]
+    assert client.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_closes_slow_client():
+    """Test the disconnect policy closes a client whose queue overflows."""
+    manager = ConnectionManager(max_queue=1, policy="disconnect")
+    ws = FakeWebSocket(block=True)
+    await manager.connect(ws)
+    await _drain()  # hello is now in flight, queue empty
+
+    assert await manager.broadcast("msg0") == 1
+    assert await manager.broadcast("msg1") == 0
+    await _drain()
+
+    assert ws.closed_with == 1013
+    assert manager.stats()["clients"] == 0
+    assert manager.stats()["slow_disconnects"] == 1
+
+
+def test_unknown_policy_rejected():
+    """Test ConnectionManager validates the policy name."""
+    with pytest.raises(ValueError):
+        ConnectionManager(policy="block")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Packed Encoding
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_pack_round_trip():
+    """Test packed frames decode to the original JSON-compatible value."""
+    payload = {
+        "type": "reload",
+        "numbers": [0, 1, -1, -300, 2**40, 3.25],
+        "flags": [True, False, None],
+        "text": "héllo ✓",
+        "nested": {"1": {"a": []}},
+    }
+    assert unpack(pack(payload)) == payload
+    assert unpack(pack(payload, compress_threshold=0)) == payload
+
+
+def test_pack_dedupes_repeated_strings():
+    """Test repeated strings are stored once, making frames smaller than JSON."""
+    import json
+
+    payload = {
+        "tests": [{"name": "Core.Loads", "status": "passed", "category": "core"}] * 200
+    }
+    frame = pack(payload, compress_threshold=-1)
+
+    assert frame.count(b"Core.Loads") == 1
+    assert len(frame) < len(json.dumps(payload)) / 4
+
+
+def test_unpack_rejects_garbage():
+    """Test malformed frames raise PackError."""
+    with pytest.raises(PackError):
+        unpack(b"{}")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_once_per_encoding():
+    """Test JSON and packed clients each get their own encoding, encoded once."""
+    manager = ConnectionManager()
+    json_clients = [FakeWebSocket(), FakeWebSocket()]
+    packed_client = FakeWebSocket()
+    for ws in json_clients:
+        await manager.connect(ws)
+    await manager.connect(packed_client, encoding="packed")
+
+    before = manager.stats()["encodings"]
+    payload = {"type": "reload", "addon": "Test", "data": {"ok": True}}
+    assert await manager.broadcast(payload) == 3
+    await _drain()
+
+    assert _received(json_clients[0]) == [
+        '{"type": "reload", "addon": "Test", "data": {"ok": true}, "seq": 1}'
+    ]
+    assert unpack(packed_client.sent[-1]) == {**payload, "seq": 1}
+
+    encodings = manager.stats()["encodings"]
+    assert encodings["json"]["frames"] - before["json"]["frames"] == 1
+    assert encodings["packed"]["frames"] - before["packed"]["frames"] == 1
+
+    for ws in json_clients + [packed_client]:
+        manager.disconnect(ws)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Topics
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_topic_matching():
+    """Test subscriptions match exact topics and ':' prefixes."""
+    assert topic_matches("errors", "errors:Weekly")
+    assert topic_matches("errors:Weekly", "errors:Weekly")
+    assert topic_matches("*", "perf:Weekly")
+    assert not topic_matches("errors:Weekly", "errors:Other")
+    assert not topic_matches("addon", "addons:Weekly")
+
+
+def test_reload_topics_slices_payload():
+    """Test a reload is split into a full addon topic and per-kind slices."""
+    from mechanic.server import reload_topics
+
+    data = {"tests": [{"name": "t", "passed": True}], "healthLog": ["err"], "big": "x" * 100}
+    topics = reload_topics("Weekly", 1.0, data)
+
+    assert set(topics) == {"addon:Weekly", "tests:Weekly", "errors:Weekly"}
+    assert topics["addon:Weekly"]["data"] is data
+    assert topics["errors:Weekly"]["data"] == {"healthLog": ["err"]}
+
+
+@pytest.mark.asyncio
+async def test_publish_sends_only_to_subscribers():
+    """Test each client only receives topics it subscribed to."""
+    import json
+
+    manager = ConnectionManager()
+    dashboard = FakeWebSocket()
+    agent = FakeWebSocket()
+    await manager.connect(dashboard)
+    await manager.connect(agent, topics=["errors:Weekly"])
+
+    await manager.publish(
+        {
+            "addon:Weekly": {"type": "reload", "addon": "Weekly"},
+            "errors:Weekly": {"type": "errors", "addon": "Weekly"},
+            "errors:Other": {"type": "errors", "addon": "Other"},
+        }
+    )
+    await _drain()
+
+    assert [json.loads(m)["type"] for m in _received(dashboard)] == ["reload"]
+    assert [json.loads(m)["addon"] for m in _received(agent)] == ["Weekly"]
+
+    manager.disconnect(dashboard)
+    manager.disconnect(agent)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_message_updates_topics():
+    """Test subscribe/unsubscribe control messages and their acknowledgement."""
+    import json
+
+    manager = ConnectionManager()
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+
+    manager.handle_message(ws, '{"type": "subscribe", "topics": ["tests"]}')
+    manager.handle_message(ws, '{"type": "unsubscribe", "topics": ["addon"]}')
+    manager.handle_message(ws, "not json")
+    await _drain()
+
+    assert manager.clients[ws].topics == {"tests"}
+    assert json.loads(ws.sent[-1]) == {"type": "subscribed", "topics": ["tests"]}
+
+    manager.disconnect(ws)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Replay
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_only_missed_events():
+    """Test a client resuming from a seq receives just the events after it."""
+    import json
+
+    manager = ConnectionManager()
+    for i in range(5):
+        await manager.broadcast({"type": "reload", "n": i}, topic="addon:A")
+
+    ws = FakeWebSocket()
+    await manager.connect(ws, last_seq=3, epoch=manager.replay.epoch)
+    await _drain()
+
+    messages = [json.loads(m) for m in ws.sent]
+    assert [m["seq"] for m in messages[:-1]] == [4, 5]
+    assert messages[-1]["type"] == "resumed"
+    assert messages[-1]["mode"] == "replay"
+    assert messages[-1]["seq"] == 5
+
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_reconnect_outside_window_gets_snapshot():
+    """Test a client that fell out of the buffer gets the latest payload per topic."""
+    import json
+
+    manager = ConnectionManager(replay_size=3)
+    for i in range(6):
+        addon = "A" if i % 2 else "B"
+        await manager.broadcast({"type": "reload", "n": i}, topic=f"addon:{addon}")
+
+    ws = FakeWebSocket()
+    await manager.connect(ws, last_seq=1)
+    await _drain()
+
+    messages = [json.loads(m) for m in ws.sent]
+    assert [m["n"] for m in messages[:-1]] == [4, 5]
+    assert messages[-1]["mode"] == "snapshot"
+    assert manager.stats()["resumes"]["snapshot"] == 1
+
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_resume_from_other_epoch_gets_snapshot():
+    """Test sequence numbers from a previous server run aren't trusted."""
+    manager = ConnectionManager()
+    await manager.broadcast({"type": "reload"}, topic="addon:A")
+
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+    manager.handle_message(ws, '{"type": "resume", "last_seq": 0, "epoch": "old"}')
+    await _drain()
+
+    assert '"mode": "snapshot"' in ws.sent[-1]
+
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["drop_oldest", "latest", "disconnect"])
+async def test_catch_up_exempt_from_slow_consumer_policy(policy):
+    """Test a snapshot larger than max_queue arrives whole; live traffic stays limited."""
+    import json
+
+    manager = ConnectionManager(max_queue=5, policy=policy)
+    for i in range(12):
+        await manager.broadcast({"type": "reload", "n": i}, topic=f"addon:A{i}")
+
+    ws = FakeWebSocket(block=True)
+    client = await manager.connect(ws, last_seq=0, epoch="old")
+    await _drain()
+
+    assert not client.closed
+    assert client.dropped == 0
+    assert client.queued == 12  # 13 frames, one blocked in send
+
+    for i in range(6):
+        await manager.broadcast({"type": "live", "n": i}, topic=f"addon:A{i}")
+    if policy == "disconnect":
+        assert client.closed
+    else:
+        assert client.dropped == 1
+
+    ws.block = False
+    ws.unblock.set()
+    await _drain()
+    if policy != "disconnect":
+        messages = [json.loads(m) for m in ws.sent]
+        assert [m.get("n") for m in messages[:12]] == list(range(12))
+        assert messages[12]["type"] == "resumed"
+        assert messages[12]["mode"] == "snapshot"
+        assert messages[12]["replayed"] == 12
+
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_replay_with_control_frames_does_not_disconnect():
+    """Test max_queue - 1 replayed events plus the resumed frame don't trip 'disconnect'."""
+    manager = ConnectionManager(max_queue=5, policy="disconnect")
+    for i in range(4):
+        await manager.broadcast({"type": "reload", "n": i}, topic="addon:A")
+
+    ws = FakeWebSocket(block=True)
+    client = await manager.connect(ws, last_seq=0, epoch=manager.replay.epoch)
+    manager.handle_message(ws, '{"type": "subscribe", "topics": ["tests"]}')
+    await _drain()
+
+    assert not client.closed
+    assert client.queued == 5  # 4 events + resumed + subscribed, one in flight
+
+    manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_back_to_back_resumes_replace_pending_catch_up():
+    """Test a second resume replaces the first one's unsent catch-up instead of stacking."""
+    import json
+
+    manager = ConnectionManager(max_queue=5)
+    for i in range(12):
+        await manager.broadcast({"type": "reload", "n": i}, topic=f"addon:A{i}")
+
+    ws = FakeWebSocket(block=True)
+    client = await manager.connect(ws, last_seq=0, epoch="old")
+    await _drain()
+    assert client.queued == 12  # 13 frames, one blocked in send
+
+    for _ in range(3):
+        manager.handle_message(ws, '{"type": "resume", "last_seq": 0, "epoch": "old"}')
+    await _drain()
+    assert client.queued == 13
+
+    ws.block = False
+    ws.unblock.set()
+    await _drain()
+    resumed = [m for m in map(json.loads, ws.sent) if m["type"] == "resumed"]
+    assert len(ws.sent) == 1 + 13
+    assert len(resumed) == 1
+
+    manager.disconnect(ws)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ws.stats
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_ws_stats_command():
+    """Test ws.stats reports the server's connection manager."""
+    server = get_server()
+    result = await server.execute("ws.stats", {})
+
+    data = assert_success(result)
+    assert data.clients >= 0
+    assert data.policy in ("drop_oldest", "latest", "disconnect")
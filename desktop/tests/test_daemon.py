@@ -0,0 +1,151 @@
+"""
+Daemon Tests for Mechanic Desktop.
+
+Tests verify `mech call` forwarding to the warm daemon:
+- Calls from the daemon's directory and environment run in the daemon
+- Other callers, or no daemon at all, fall back to in-process execution
+- Editing a config file while the daemon runs stops it serving stale settings
+- Ping and shutdown, and cleanup of the socket and key
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from mechanic.daemon import KEY_FILENAME, Daemon, call_daemon, daemon_address, request
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the daemon at a fresh data directory."""
+    monkeypatch.setenv("MECHANIC_DATA_DIR", str(tmp_path))
+    monkeypatch.delenv("MECHANIC_NO_DAEMON", raising=False)
+    return tmp_path
+
+
+async def _start(idle_timeout_min: float = 5):
+    """Serve a Daemon on this loop; returns (daemon, serving task)."""
+    daemon = Daemon(idle_timeout_min)
+    task = asyncio.ensure_future(daemon.serve())
+    for _ in range(100):
+        if await asyncio.to_thread(request, {"op": "ping"}) is not None:
+            return daemon, task
+        await asyncio.sleep(0.05)
+    task.cancel()
+    raise AssertionError("daemon did not start")
+
+
+async def _stop(task):
+    await asyncio.to_thread(request, {"op": "shutdown"})
+    await asyncio.wait_for(task, 5)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Forwarding
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_call_runs_in_daemon(data_dir):
+    """Test a call from the daemon's directory is served by it."""
+    daemon, task = await _start()
+    try:
+        result = await asyncio.to_thread(call_daemon, "cache.stats", {})
+        missing = await asyncio.to_thread(call_daemon, "no.such.command", {})
+    finally:
+        await _stop(task)
+
+    assert result.success
+    assert "hit_ratio" in result.data
+    assert result.model_dump()["success"] is True
+    assert not missing.success
+    assert missing.error.code == "COMMAND_NOT_FOUND"
+    assert daemon.served == 2
+
+
+@pytest.mark.asyncio
+async def test_other_directory_falls_back(data_dir, tmp_path_factory, monkeypatch):
+    """Test callers with a different cwd or MECHANIC_* env aren't served."""
+    daemon, task = await _start()
+    try:
+        monkeypatch.setenv("MECHANIC_EXTRA", "1")
+        assert await asyncio.to_thread(call_daemon, "cache.stats", {}) is None
+        monkeypatch.delenv("MECHANIC_EXTRA")
+
+        monkeypatch.chdir(tmp_path_factory.mktemp("elsewhere"))
+        assert await asyncio.to_thread(call_daemon, "cache.stats", {}) is None
+    finally:
+        await _stop(task)
+
+    assert daemon.served == 0
+
+
+@pytest.mark.asyncio
+async def test_other_environment_falls_back(data_dir, monkeypatch):
+    """Test a caller with a different GEMINI_API_KEY isn't served."""
+    monkeypatch.setenv("GEMINI_API_KEY", "daemon-key")
+    daemon, task = await _start()
+    try:
+        monkeypatch.setenv("GEMINI_API_KEY", "caller-key")
+        assert await asyncio.to_thread(call_daemon, "cache.stats", {}) is None
+    finally:
+        await _stop(task)
+
+    assert daemon.served == 0
+
+
+@pytest.mark.asyncio
+async def test_config_edit_stops_daemon(data_dir, monkeypatch):
+    """Test a config file written while the daemon runs isn't read from stale state."""
+    monkeypatch.chdir(data_dir)
+    daemon, task = await _start()
+    assert await asyncio.to_thread(call_daemon, "cache.stats", {}) is not None
+
+    # What `mech config set` does from another process
+    (data_dir / "mechanic.config.json").write_text('{"dev_path": "/elsewhere"}')
+    refused = await asyncio.to_thread(call_daemon, "cache.stats", {})
+    await asyncio.wait_for(task, 5)
+
+    assert refused is None
+    assert daemon.stale
+    assert daemon.served == 1
+    assert await asyncio.to_thread(request, {"op": "ping"}) is None
+
+
+def test_no_daemon_falls_back(data_dir, monkeypatch):
+    """Test calls return None when no daemon is running or it's disabled."""
+    assert call_daemon("cache.stats", {}) is None
+    assert request({"op": "ping"}) is None
+
+    monkeypatch.setenv("MECHANIC_NO_DAEMON", "1")
+    assert call_daemon("cache.stats", {}) is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Lifecycle
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_shutdown_cleans_up(data_dir):
+    """Test shutdown stops serving and removes the socket and auth key."""
+    daemon, task = await _start()
+    info = await asyncio.to_thread(request, {"op": "ping"})
+    assert info["pid"] == os.getpid()
+    assert info["commands"] > 50
+
+    await _stop(task)
+
+    address, _ = daemon_address()
+    assert not os.path.exists(address)
+    assert not (data_dir / KEY_FILENAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_second_daemon_refuses_to_start(data_dir):
+    """Test starting a daemon while one is serving raises."""
+    _, task = await _start()
+    try:
+        with pytest.raises(RuntimeError, match="already running"):
+            await Daemon().serve()
+    finally:
+        await _stop(task)
@@ -14,7 +14,8 @@ from mechanic.lua_analyzer import (
 from mechanic.commands.deadcode import (
     find_orphaned_files, find_unused_functions, find_unused_locals,
     find_unreachable_code, find_commented_code_blocks, find_unused_locale_strings,
-    get_loaded_files, get_all_lua_files, DeadCodeCategory, DeadCodeInput
+    get_loaded_files, get_all_lua_files, DeadCodeCategory, DeadCodeInput,
+    analyze_addon
 )
 
 
@@ -438,5 +439,33 @@ local result = _G[funcName]()
             assert unused[0][1] == Confidence.SUSPICIOUS
 
 
+class TestProgress:
+    """Tests for progress reporting during analysis."""
+
+    def test_progress_reports_files_and_partial_issues(self, tmp_path):
+        """Test analyze_addon reports each file, then each detector's issues."""
+        addon_path = tmp_path / "TestAddon"
+        addon_path.mkdir()
+        (addon_path / "TestAddon.toc").write_text("## Title: TestAddon\nCore.lua\n")
+        (addon_path / "Core.lua").write_text("-- Core")
+        (addon_path / "Orphan.lua").write_text("-- Orphaned")
+
+        events = []
+        input = DeadCodeInput(
+            addon="TestAddon", categories=[DeadCodeCategory.ORPHANED_FILE.value]
+        )
+        result = analyze_addon(
+            addon_path, "TestAddon", input, progress=lambda **e: events.append(e)
+        )
+
+        parsing = [e for e in events if "partial" not in e]
+        assert len(parsing) == result.files_analyzed
+        assert parsing[0]["total"] == result.files_analyzed
+
+        partials = [e["partial"] for e in events if "partial" in e]
+        assert [p["category"] for p in partials] == ["orphaned_file"]
+        assert len(partials[0]["issues"]) == result.summary.total
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+"""
+Event-Loop Diagnostics Tests for Mechanic Desktop.
+
+Tests verify the loop monitor:
+- Blocking calls in a handler are recorded as stalls of that command
+- Stalls outside any command are attributed to the running task
+- server.diagnostics reporting
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from afd import success
+from afd.core import LoopMonitor
+from afd.server import create_server
+from afd.testing.assertions import assert_success
+from mechanic.commands.core import get_server
+
+
+async def _settle():
+    """Give the watchdog thread time to see the loop recover."""
+    await asyncio.sleep(0.1)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LoopMonitor
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_blocking_handler_is_attributed_to_its_command():
+    """Test a handler that blocks the loop shows up as an offender with its stack."""
+    server = create_server("monitor-test")
+
+    @server.command(name="slow.sync", description="Blocks the loop")
+    async def slow_sync(input):
+        time.sleep(0.2)
+        return success({})
+
+    @server.command(name="fast.async", description="Yields to the loop")
+    async def fast_async(input):
+        await asyncio.sleep(0.2)
+        return success({})
+
+    monitor = LoopMonitor(
+        interval_ms=10, threshold_ms=50, resolve=server.registry.command_for_task
+    )
+    monitor.start()
+    try:
+        await _settle()
+        await server.execute("fast.async", {})
+        await server.execute("slow.sync", {})
+        await _settle()
+    finally:
+        monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert [o["source"] for o in snapshot["offenders"]] == ["slow.sync"]
+    offender = snapshot["offenders"][0]
+    assert offender["command"] is True
+    assert offender["max_ms"] >= 150
+    assert any("slow_sync" in frame for frame in offender["last_stack"])
+    assert snapshot["lag"]["count"] > 1
+
+
+@pytest.mark.asyncio
+async def test_stall_outside_commands_names_the_task():
+    """Test blocking code that isn't a command is reported by coroutine name."""
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=50)
+    monitor.start()
+
+    async def blocking_broadcast():
+        time.sleep(0.15)
+
+    try:
+        await _settle()
+        await asyncio.ensure_future(blocking_broadcast())
+        await _settle()
+    finally:
+        monitor.stop()
+
+    (offender,) = monitor.snapshot()["offenders"]
+    assert offender["command"] is False
+    assert "blocking_broadcast" in offender["source"]
+    assert not monitor.running
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# server.diagnostics
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_server_diagnostics_command():
+    """Test server.diagnostics reports lag and offenders from the shared monitor."""
+    from mechanic.metrics import loop_monitor, start_loop_monitor
+
+    start_loop_monitor()
+    try:
+        await asyncio.sleep(0.3)
+        result = await get_server().execute("server.diagnostics", {"reset": True})
+    finally:
+        loop_monitor.stop()
+
+    data = assert_success(result)
+    assert data.running is True
+    assert data.lag["count"] >= 3
+    assert loop_monitor.snapshot()["lag"]["count"] < data.lag["count"]
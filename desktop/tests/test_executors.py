@@ -0,0 +1,104 @@
+"""
+Executor Offload Tests for Mechanic Desktop.
+
+Tests verify commands declaring an execution mode:
+- Thread commands run off the event loop, which stays responsive
+- Process commands run in a worker process and return the same result
+- Process commands fall back to threads when no server_ref is set
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from afd import success
+from afd.server import create_server
+from afd.testing.assertions import assert_success
+from mechanic.commands.core import get_server
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Thread
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_thread_command_keeps_loop_responsive():
+    """Test a blocking thread-mode handler doesn't stall concurrent work."""
+    server = create_server("executor-test")
+
+    @server.command(name="block", description="Blocks", execution="thread")
+    async def block(input, context=None):
+        time.sleep(0.2)
+        return success({"thread": threading.get_ident()})
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    result, _ = await asyncio.gather(server.execute("block", {}), ticker())
+
+    assert result.data["thread"] != threading.get_ident()
+    assert ticks == 10
+    assert server.executors.completed["thread"] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_without_server_ref_uses_threads():
+    """Test process commands run in the thread pool when no server_ref is set."""
+    server = create_server("executor-fallback-test")
+
+    @server.command(name="cpu", description="CPU work", execution="process")
+    async def cpu(input, context=None):
+        return success({"pid": os.getpid()})
+
+    result = await server.execute("cpu", {})
+
+    assert result.data["pid"] == os.getpid()
+    assert server.executors.mode_for("process") == "thread"
+    assert server.executors.completed == {"inline": 0, "thread": 1, "process": 0}
+
+
+def test_invalid_execution_mode_rejected():
+    """Test define_command rejects unknown execution modes."""
+    server = create_server("executor-invalid-test")
+
+    with pytest.raises(ValueError, match="execution"):
+
+        @server.command(name="bad", description="Bad", execution="gpu")
+        async def bad(input, context=None):
+            return success({})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Process
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_complexity_runs_in_worker_process(tmp_path):
+    """Test addon.complexity runs in a worker process and returns its model."""
+    addon = tmp_path / "Busy"
+    addon.mkdir()
+    (addon / "Busy.toc").write_text("## Title: Busy\nCore.lua\n", encoding="utf-8")
+    (addon / "Core.lua").write_text(
+        "local function f(a)\n  if a then\n    return 1\n  end\n  return 2\nend\n",
+        encoding="utf-8",
+    )
+
+    server = get_server()
+    assert server.registry.get("addon.complexity").execution == "process"
+    before = server.executors.completed["process"]
+
+    result = await server.execute(
+        "addon.complexity", {"addon": "Busy", "path": str(addon)}
+    )
+
+    data = assert_success(result)
+    assert data.files_analyzed == 1
+    assert server.executors.completed["process"] == before + 1
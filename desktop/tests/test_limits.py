@@ -0,0 +1,212 @@
+"""
+Concurrency Limit Tests for Mechanic Desktop.
+
+Tests verify per-command and per-tag concurrency limits:
+- max_concurrency caps executions and starts queued calls in arrival order
+- Tag limits are shared by every command carrying the tag
+- Queue depth and wait metrics are reported
+- Nested calls and cancelled waiters don't deadlock or leak slots
+- Subprocess-heavy mechanic commands are limited by config
+"""
+
+import asyncio
+
+import pytest
+
+from afd import success
+from afd.core import CommandContext, FairSemaphore
+from afd.server import create_server
+from mechanic.commands.core import get_server
+
+
+def _tracking_server(**command_options):
+    """Server with a 'work' command that records start order and peak concurrency."""
+    server = create_server("limits-test")
+    state = {"running": 0, "peak": 0, "order": []}
+
+    @server.command(name="work", description="Work", mutation=True, **command_options)
+    async def work(input, context=None):
+        state["order"].append(input["n"])
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(input.get("ms", 20) / 1000)
+        state["running"] -= 1
+        return success({"n": input["n"]})
+
+    return server, state
+
+
+async def _staggered(server, name, count):
+    """Start calls one loop turn apart so their arrival order is fixed."""
+    tasks = []
+    for n in range(count):
+        tasks.append(asyncio.ensure_future(server.execute(name, {"n": n})))
+        await asyncio.sleep(0)
+    return await asyncio.gather(*tasks)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Limits
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_max_concurrency_queues_in_arrival_order():
+    """Test no more than max_concurrency run at once and queued calls start FIFO."""
+    server, state = _tracking_server(max_concurrency=2)
+
+    results = await _staggered(server, "work", 6)
+
+    assert all(r.success for r in results)
+    assert state["peak"] == 2
+    assert state["order"] == [0, 1, 2, 3, 4, 5]
+    stats = server.limits.snapshot()["command:work"]
+    assert stats["limit"] == 2
+    assert stats["queued"] == 4
+    assert stats["peak_waiting"] == 4
+    assert stats["waiting"] == 0 and stats["running"] == 0
+    assert stats["wait_ms"]["count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_tag_limit_shared_across_commands():
+    """Test a tag limit caps the combined concurrency of its commands."""
+    server = create_server("limits-tag-test")
+    server.limits.set_tag_limit("heavy", 1)
+    running = peak = 0
+
+    async def body():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return success({})
+
+    @server.command(name="a", description="A", tags=["heavy"], mutation=True)
+    async def a(input, context=None):
+        return await body()
+
+    @server.command(name="b", description="B", tags=["heavy"], mutation=True)
+    async def b(input, context=None):
+        return await body()
+
+    await asyncio.gather(*(server.execute(n, {}) for n in ("a", "b", "a", "b")))
+
+    assert peak == 1
+    assert server.limits.snapshot()["tag:heavy"]["queued"] == 3
+
+    server.limits.set_tag_limit("heavy", None)
+    assert server.limits.gates_for(server.registry.get("a")) == []
+
+
+def test_invalid_limits_rejected():
+    """Test limits below one are rejected."""
+    server = create_server("limits-invalid-test")
+
+    with pytest.raises(ValueError, match="max_concurrency"):
+
+        @server.command(name="bad", description="Bad", max_concurrency=0)
+        async def bad(input, context=None):
+            return success({})
+
+    with pytest.raises(ValueError):
+        server.limits.set_tag_limit("heavy", 0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Safety
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_nested_call_does_not_requeue_on_held_gate():
+    """Test a command calling another with the same tag doesn't deadlock."""
+    server = create_server("limits-nested-test")
+    server.limits.set_tag_limit("heavy", 1)
+
+    @server.command(name="inner", description="Inner", tags=["heavy"])
+    async def inner(input, context=None):
+        return success({"inner": True})
+
+    @server.command(name="outer", description="Outer", tags=["heavy"])
+    async def outer(input, context=None):
+        return await server.execute("inner", {})
+
+    result = await asyncio.wait_for(server.execute("outer", {}), 1)
+
+    assert result.data == {"inner": True}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_leaves_queue():
+    """Test a call whose deadline passes while queued frees its place."""
+    server, state = _tracking_server(max_concurrency=1)
+
+    first, second, third = await asyncio.gather(
+        server.execute("work", {"n": 0, "ms": 100}),
+        server.execute("work", {"n": 1}, CommandContext(timeout=20)),
+        server.execute("work", {"n": 2}),
+    )
+
+    assert first.success and third.success
+    assert second.error.code == "TIMEOUT"
+    assert state["order"] == [0, 2]
+    stats = server.limits.snapshot()["command:work"]
+    assert stats["waiting"] == 0 and stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fair_semaphore_hands_slot_to_longest_waiter():
+    """Test a newcomer can't take a released slot ahead of queued callers."""
+    semaphore = FairSemaphore(1)
+    await semaphore.acquire()
+    order = []
+
+    async def waiter(n):
+        await semaphore.acquire()
+        order.append(n)
+
+    first = asyncio.ensure_future(waiter(1))
+    await asyncio.sleep(0)
+    semaphore.release()
+    # Arrives after the release but before the queued waiter resumes
+    second = asyncio.ensure_future(waiter(2))
+    await asyncio.sleep(0)
+    semaphore.release()
+    await asyncio.gather(first, second)
+
+    assert order == [1, 2]
+    assert semaphore.running == 1 and semaphore.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_fair_semaphore_acquire_timeout():
+    """Test a timed-out acquire leaves the queue, and a slot granted first is kept."""
+    semaphore = FairSemaphore(1)
+    assert await semaphore.acquire(timeout=0.01)
+
+    assert await semaphore.acquire(timeout=0.01) is False
+    assert semaphore.running == 1 and semaphore.waiting == 0
+
+    # Granted in the same turn the deadline would have passed
+    pending = asyncio.ensure_future(semaphore.acquire(timeout=0.02))
+    await asyncio.sleep(0)
+    semaphore.release()
+    await asyncio.sleep(0.03)
+    assert pending.result() is True
+
+    semaphore.release()
+    assert semaphore.running == 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Mechanic Commands
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_subprocess_commands_limited():
+    """Test tool-spawning commands carry the limited 'subprocess' tag."""
+    server = get_server()
+
+    for name in ("addon.lint", "addon.format", "addon.test", "sandbox.exec", "sandbox.test"):
+        assert "tag:subprocess" in server.limits.gates_for(server.registry.get(name))
+    assert server.limits.tags["subprocess"] == 4
+    assert server.registry.get("addon.test").max_concurrency == 2
@@ -0,0 +1,212 @@
+"""
+Memoization Tests for Mechanic Desktop.
+
+Tests verify the dependency-tracking memoize decorator:
+- Results are reused until a file the computation read changes
+- Missing files and listed directories invalidate when they appear/change
+- Nested memoized calls pass their dependencies to the caller
+- LRU eviction, hash checking and hit statistics
+- Mechanic loaders (TOC parsing, APIDefs) are memoized and not mutated by callers
+"""
+
+import os
+
+import pytest
+
+from afd.core.memo import (
+    memo_stats,
+    memoize,
+    track_path,
+    tracked_read_text,
+)
+
+
+def _touch(path, content):
+    """Rewrite a file and move its mtime forward, past filesystem granularity."""
+    path.write_text(content, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Invalidation
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_reuses_until_file_changes(tmp_path):
+    """Test a memoized reader runs again only after its file changes."""
+    source = tmp_path / "a.txt"
+    source.write_text("one", encoding="utf-8")
+    calls = []
+
+    @memoize
+    def load(path):
+        calls.append(path)
+        return tracked_read_text(path).upper()
+
+    assert load(source) == "ONE"
+    assert load(source) == "ONE"
+    assert len(calls) == 1
+
+    _touch(source, "two")
+    assert load(source) == "TWO"
+    assert len(calls) == 2
+    stats = load.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+    assert stats["files"] == 1
+
+
+def test_missing_file_and_directory_tracked(tmp_path):
+    """Test creating a checked-for file or adding to a listed directory invalidates."""
+    optional = tmp_path / "optional.json"
+
+    @memoize
+    def load(root):
+        track_path(root, optional)
+        names = sorted(p.name for p in root.glob("*.lua"))
+        return names, optional.exists()
+
+    assert load(tmp_path) == ([], False)
+    (tmp_path / "a.lua").write_text("", encoding="utf-8")
+    os.utime(tmp_path, ns=(0, tmp_path.stat().st_mtime_ns + 10_000_000))
+    assert load(tmp_path)[0] == ["a.lua"]
+    optional.write_text("{}", encoding="utf-8")
+    assert load(tmp_path)[1] is True
+
+
+def test_nested_dependencies_reach_caller(tmp_path):
+    """Test an outer memo is invalidated by a file an inner memo hit read."""
+    source = tmp_path / "a.txt"
+    source.write_text("x", encoding="utf-8")
+
+    @memoize
+    def inner(path):
+        return tracked_read_text(path)
+
+    @memoize
+    def outer(path):
+        return inner(path) * 2
+
+    inner(source)
+    assert outer(source) == "xx"
+    _touch(source, "y")
+    assert outer(source) == "yy"
+
+
+def test_hash_check_survives_touch(tmp_path):
+    """Test check='hash' keeps the value when only the mtime changed."""
+    source = tmp_path / "a.txt"
+    source.write_text("same", encoding="utf-8")
+    calls = []
+
+    @memoize(check="hash")
+    def load(path):
+        calls.append(1)
+        return tracked_read_text(path)
+
+    load(source)
+    _touch(source, "same")
+    load(source)
+    _touch(source, "new!")
+
+    assert load(source) == "new!"
+    assert len(calls) == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Limits and Statistics
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_lru_eviction_and_registry():
+    """Test the least recently used entry is evicted and stats are registered."""
+
+    @memoize(max_entries=2)
+    def square(n):
+        return n * n
+
+    square(1)
+    square(2)
+    square(1)
+    square(3)  # evicts 2
+
+    assert square.stats()["evictions"] == 1
+    square(2)
+    assert square.stats()["misses"] == 4
+    assert f"{__name__}.test_lru_eviction_and_registry.<locals>.square" in memo_stats()
+
+
+def test_unhashable_arguments_not_cached():
+    """Test calls with unhashable arguments run every time."""
+    calls = []
+
+    @memoize
+    def total(values):
+        calls.append(1)
+        return sum(values)
+
+    assert total([1, 2]) == 3
+    assert total([1, 2]) == 3
+    assert len(calls) == 2
+
+
+def test_invalid_check_mode():
+    """Test unknown check modes are rejected."""
+    with pytest.raises(ValueError):
+        memoize(check="sha")(lambda: None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Mechanic Loaders
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_parse_toc_file_memoized(tmp_path):
+    """Test TOC parsing is cached per file and refreshed on edit."""
+    from mechanic.commands.development import parse_toc_file
+
+    toc = tmp_path / "Demo.toc"
+    toc.write_text("## Title: Demo\n## Interface: 110002\nCore.lua\n", encoding="utf-8")
+
+    first = parse_toc_file(toc)
+    assert parse_toc_file(toc) is first
+
+    _touch(toc, "## Title: Demo\n## Interface: 110002\nCore.lua\nUI.lua\n")
+    assert [f["path"] for f in parse_toc_file(toc)["files"]] == ["Core.lua", "UI.lua"]
+
+
+def test_apidefs_memoized(tmp_path, monkeypatch):
+    """Test APIDefs are parsed once and a new definition file is picked up."""
+    from mechanic.commands import api
+
+    (tmp_path / "Unit.lua").write_text(
+        'APIDefs["UnitName"] = {\n  name = "UnitName",\n}\n', encoding="utf-8"
+    )
+    monkeypatch.setattr(api, "get_apidefs_path", lambda: tmp_path)
+
+    first = api.load_all_apis()
+    assert "UnitName" in first
+    assert api.load_all_apis() is first
+
+    (tmp_path / "Spell.lua").write_text(
+        'APIDefs["GetSpellInfo"] = {\n  name = "GetSpellInfo",\n}\n', encoding="utf-8"
+    )
+    os.utime(tmp_path, ns=(0, tmp_path.stat().st_mtime_ns + 10_000_000))
+    assert set(api.load_all_apis()) == {"UnitName", "GetSpellInfo"}
+
+
+@pytest.mark.asyncio
+async def test_api_info_leaves_cached_definitions_unchanged(tmp_path, monkeypatch):
+    """Test api.info enriches a copy, not the memoized APIDefs entry."""
+    from afd.server import create_server
+    from mechanic.commands import api
+
+    (tmp_path / "Unit.lua").write_text(
+        'APIDefs["UnitName"] = {\n  name = "UnitName",\n}\n', encoding="utf-8"
+    )
+    monkeypatch.setattr(api, "get_apidefs_path", lambda: tmp_path)
+    server = create_server("memo-api-info-test")
+    api.register_commands(server)
+    before = {key: dict(entry) for key, entry in api.load_all_apis().items()}
+
+    result = await server.execute("api.info", {"api_name": "UnitName"})
+
+    assert result.data.api["signature"]
+    assert api.load_all_apis() == before
@@ -0,0 +1,337 @@
+"""
+Middleware Tests for Mechanic Desktop.
+
+Tests verify the command execution chain:
+- Middleware runs in registration order and can rewrite calls
+- Cache hits are served before registered middleware
+- Stock tracing, logging, timeout and concurrency-limit middleware
+- Command deadlines (timeout_ms) and child processes killed on cancellation,
+  without blocking the event loop
+"""
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from afd import success
+from afd.core import (
+    CommandContext,
+    ConcurrencyLimitMiddleware,
+    LoggingMiddleware,
+    TimeoutMiddleware,
+    TracingMiddleware,
+    run_process,
+)
+from afd.server import create_server
+
+
+def _server():
+    server = create_server("middleware-test")
+
+    @server.command(name="echo", description="Echo the input")
+    async def echo(input, context=None):
+        return success(dict(input))
+
+    @server.command(name="sleep", description="Sleep for input ms")
+    async def sleep(input, context=None):
+        await asyncio.sleep(input["ms"] / 1000)
+        return success({"slept": input["ms"]})
+
+    return server
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Chain
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_middleware_runs_in_order_and_can_rewrite_input():
+    """Test middleware wraps in registration order and sees the final result."""
+    server = _server()
+    seen = []
+
+    @server.use
+    async def outer(call, call_next):
+        seen.append("outer")
+        call.input = {**call.input, "outer": True}
+        result = await call_next(call)
+        seen.append("outer done")
+        return result
+
+    @server.use
+    async def inner(call, call_next):
+        seen.append(f"inner {call.name}")
+        return await call_next(call)
+
+    result = await server.execute("echo", {"x": 1})
+
+    assert result.data == {"x": 1, "outer": True}
+    assert seen == ["outer", "inner echo", "outer done"]
+    assert server.registry.stats.snapshot()["echo"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_skip_registered_middleware():
+    """Test a cached result is returned without passing through middleware."""
+    server = create_server("middleware-cache-test")
+    calls = []
+
+    @server.command(name="read", description="Cached read", fingerprint=lambda i: 1)
+    async def read(input, context=None):
+        return success({"ok": True})
+
+    @server.use
+    async def count(call, call_next):
+        calls.append(call.name)
+        return await call_next(call)
+
+    await server.execute("read", {})
+    await server.execute("read", {})
+
+    assert calls == ["read"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_command_bypasses_chain():
+    """Test COMMAND_NOT_FOUND is returned without running middleware."""
+    server = _server()
+    calls = []
+
+    @server.use
+    async def count(call, call_next):
+        calls.append(call.name)
+        return await call_next(call)
+
+    result = await server.execute("missing", {})
+
+    assert result.error.code == "COMMAND_NOT_FOUND"
+    assert calls == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Stock Middleware
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_tracing_links_nested_calls():
+    """Test nested executions record the outer call's trace id as parent."""
+    server = _server()
+    tracing = server.use(TracingMiddleware())
+
+    @server.command(name="outer", description="Calls echo")
+    async def outer(input, context=None):
+        assert context.trace_id
+        return await server.execute("echo", {"n": 1})
+
+    await server.execute("outer", {}, CommandContext(trace_id="root"))
+
+    spans = tracing.trace("root")
+    assert [s["command"] for s in spans] == ["outer", "echo"]
+    assert spans[1]["parent_id"] == "root"
+    assert all(s["success"] for s in spans)
+
+
+@pytest.mark.asyncio
+async def test_timeout_middleware_default():
+    """Test the default deadline applies only to commands without their own."""
+    server = _server()
+    server.use(TimeoutMiddleware(default_ms=50))
+
+    @server.command(name="patient", description="Own timeout", timeout_ms=1000)
+    async def patient(input, context=None):
+        await asyncio.sleep(0.1)
+        return success({})
+
+    slow = await server.execute("sleep", {"ms": 500})
+    allowed = await server.execute("sleep", {"ms": 100}, CommandContext(timeout=1000))
+
+    assert slow.error.code == "TIMEOUT"
+    assert slow.error.retryable
+    assert allowed.success
+    assert (await server.execute("patient", {})).success
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_middleware():
+    """Test no more than `limit` executions run at once."""
+    server = _server()
+    server.use(ConcurrencyLimitMiddleware(2))
+    running = peak = 0
+
+    @server.command(name="track", description="Track concurrency", mutation=True)
+    async def track(input, context=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return success({})
+
+    results = await asyncio.gather(*(server.execute("track", {}) for _ in range(6)))
+
+    assert all(r.success for r in results)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_wait_timeout():
+    """Test callers that can't get a slot in time fail with RATE_LIMITED."""
+    server = _server()
+    server.use(ConcurrencyLimitMiddleware(1, wait_ms=20))
+
+    first, second = await asyncio.gather(
+        server.execute("sleep", {"ms": 200}),
+        server.execute("sleep", {"ms": 201}),
+    )
+
+    assert first.success
+    assert second.error.code == "RATE_LIMITED"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_timeouts_never_leak_slots():
+    """Test slots freed right around callers' wait deadlines all come back."""
+    server = _server()
+    limit = ConcurrencyLimitMiddleware(2, wait_ms=10)
+    server.use(limit)
+
+    results = await asyncio.gather(
+        *(server.execute("sleep", {"ms": 8 + n % 5}) for n in range(40))
+    )
+
+    assert any(r.success for r in results)
+    assert any(not r.success for r in results)
+    assert limit._semaphore().running == 0
+    assert limit._semaphore().waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_logging_middleware(caplog):
+    """Test failures and slow calls are logged as warnings."""
+    server = _server()
+    server.use(LoggingMiddleware(slow_ms=30))
+
+    with caplog.at_level(logging.DEBUG, logger="afd.commands"):
+        await server.execute("echo", {})
+        await server.execute("sleep", {"ms": 60})
+        await server.execute("sleep", {})
+
+    levels = [(r.levelname, r.getMessage().split()[0]) for r in caplog.records]
+    assert levels == [("DEBUG", "echo"), ("WARNING", "sleep"), ("WARNING", "sleep")]
+    assert "failed" in caplog.records[2].getMessage()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Deadlines
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _alive(pid: int) -> bool:
+    """Whether a process exists and isn't a zombie (Linux)."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+@pytest.mark.asyncio
+async def test_command_timeout_ms():
+    """Test timeout_ms fails slow calls with timeout_error; context overrides it."""
+    server = create_server("deadline-test")
+
+    @server.command(name="slow", description="Slow", timeout_ms=50)
+    async def slow(input, context=None):
+        await asyncio.sleep(0.2)
+        return success({})
+
+    timed_out = await server.execute("slow", {})
+    extended = await server.execute("slow", {}, CommandContext(timeout=1000))
+
+    assert timed_out.error.code == "TIMEOUT"
+    assert timed_out.error.message == "Operation 'slow' timed out after 50ms"
+    assert timed_out.error.details["timeout_ms"] == 50
+    assert extended.success
+    assert server.registry.get("slow").timeout_ms == 50
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+async def test_deadline_kills_child_processes(tmp_path):
+    """Test a timed-out handler's child process and its children are killed."""
+    server = create_server("deadline-process-test")
+    pid_file = tmp_path / "pids"
+    script = (
+        "import os, subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(f'{{os.getpid()}} {{child.pid}}')\n"
+        "time.sleep(30)\n"
+    )
+
+    @server.command(name="hang", description="Hangs", timeout_ms=1000)
+    async def hang(input, context=None):
+        await run_process([sys.executable, "-c", script])
+        return success({})
+
+    result = await server.execute("hang", {})
+
+    assert result.error.code == "TIMEOUT"
+    pids = [int(p) for p in pid_file.read_text().split()]
+    for _ in range(50):
+        if not any(_alive(pid) for pid in pids):
+            break
+        await asyncio.sleep(0.02)
+    assert not any(_alive(pid) for pid in pids)
+
+
+@pytest.mark.asyncio
+async def test_run_process_output_and_timeout():
+    """Test run_process mirrors subprocess.run's result and TimeoutExpired."""
+    result = await run_process(
+        [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"],
+        input="hello",
+    )
+    assert result.returncode == 0
+    assert result.stdout.strip() == "HELLO"
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        await run_process(
+            [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform == "win32", reason="stands in a shell script for taskkill")
+async def test_windows_tree_kill_keeps_loop_responsive(tmp_path, monkeypatch):
+    """Test the Windows taskkill path is awaited rather than blocking the loop."""
+    from afd.core import process
+
+    taskkill = tmp_path / "taskkill"
+    taskkill.write_text('#!/bin/sh\nsleep 0.3\nkill -9 "$4"\n')
+    taskkill.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(process, "sys", SimpleNamespace(platform="win32"))
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", "import time; time.sleep(30)"
+    )
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(tick())
+    try:
+        await process._kill(proc)
+    finally:
+        ticker.cancel()
+
+    assert proc.returncode is not None
+    assert ticks >= 10
@@ -0,0 +1,233 @@
+"""
+Mock Transport Tests for Mechanic Desktop.
+
+Tests verify the simulated network conditions in MockTransport:
+- Latency distributions and jitter, reproducible with a seed
+- Throughput caps queue calls per tool or across all tools
+- Injected failures (error results or exceptions) and timeouts
+- Client-side retry and load behavior under those conditions
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from afd.testing import run_load
+from afd.transports import MockTransport, ToolConditions, TransportError
+from afd.transports.base import TimeoutError as TransportTimeoutError
+
+
+def _transport(seed=0):
+    """Transport with a 'ping' canned response and an 'echo' handler."""
+    transport = MockTransport(seed=seed)
+    transport.add_mock_response("ping", {"success": True, "data": "pong"})
+
+    async def echo(args):
+        return {"success": True, "data": args}
+
+    transport.register_tool("echo", echo)
+    return transport
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Latency
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_latency_applied_and_recorded():
+    """Test a call waits its simulated latency and records how long it took."""
+    transport = _transport()
+    transport.set_conditions("ping", latency_ms=20)
+
+    start = time.perf_counter()
+    result = await transport.call_tool("ping")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert result["data"] == "pong"
+    assert elapsed_ms >= 19
+    assert transport.last_call("ping").latency_ms >= 19
+    await transport.call_tool("echo", {"x": 1})
+    assert transport.last_call("echo").latency_ms == 0.0
+
+
+def test_latency_distributions():
+    """Test jitter follows the chosen distribution and never goes negative."""
+    rng = random.Random(1)
+
+    jittered = ToolConditions(latency_ms=10, jitter_ms=5)
+    uniform = [jittered.sample_latency(rng) for _ in range(500)]
+    assert 5 <= min(uniform) and max(uniform) <= 15
+
+    tail = ToolConditions(latency_ms=10, jitter_ms=20, distribution="exponential")
+    samples = [tail.sample_latency(rng) for _ in range(2000)]
+    assert min(samples) >= 10
+    assert 25 < sum(samples) / len(samples) < 35
+
+    normal = ToolConditions(latency_ms=1, jitter_ms=10, distribution="normal")
+    assert min(normal.sample_latency(rng) for _ in range(500)) == 0.0
+
+    custom = ToolConditions(distribution=lambda r: 42.0)
+    assert custom.sample_latency(rng) == 42.0
+
+
+def test_seed_makes_runs_reproducible():
+    """Test two transports with the same seed draw the same latencies."""
+    conditions = ToolConditions(latency_ms=10, jitter_ms=5)
+
+    first = [conditions.sample_latency(MockTransport(seed=3)._rng) for _ in range(3)]
+    second = [conditions.sample_latency(MockTransport(seed=3)._rng) for _ in range(3)]
+
+    assert first == second
+
+
+def test_invalid_conditions_rejected():
+    """Test out-of-range rates, caps and unknown modes are rejected."""
+    transport = _transport()
+
+    for options in (
+        {"failure_rate": 1.5},
+        {"timeout_rate": -0.1},
+        {"max_per_second": 0},
+        {"distribution": "pareto"},
+        {"failure_mode": "crash"},
+    ):
+        with pytest.raises(ValueError):
+            transport.set_conditions("ping", **options)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Throughput
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_throughput_cap_queues_concurrent_calls():
+    """Test calls over the cap are spaced out rather than run at once."""
+    transport = _transport()
+    transport.set_conditions("ping", max_per_second=100)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(transport.call_tool("ping") for _ in range(10)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert elapsed_ms >= 85
+    waits = sorted(call.latency_ms for call in transport.get_calls("ping"))
+    assert waits[0] < 5 and waits[-1] >= 85
+
+
+@pytest.mark.asyncio
+async def test_default_conditions_shared_and_overridden():
+    """Test default conditions cover tools without their own and share one cap."""
+    transport = _transport()
+    transport.set_conditions(max_per_second=50)
+    transport.set_conditions("echo", latency_ms=0)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(transport.call_tool(name) for name in ("ping", "ping", "echo", "echo"))
+    )
+    await transport.call_tool("ping")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # Three pings share the 50/s cap; echo has its own, uncapped conditions
+    assert elapsed_ms >= 35
+    assert max(c.latency_ms for c in transport.get_calls("echo")) < 5
+
+    transport.clear_conditions()
+    transport.clear_conditions("echo")
+    start = time.perf_counter()
+    await asyncio.gather(*(transport.call_tool("ping") for _ in range(5)))
+    assert (time.perf_counter() - start) * 1000 < 20
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Faults
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_injected_failure_modes():
+    """Test failures come back as retryable error results or raised TransportErrors."""
+    transport = _transport()
+    transport.set_conditions("ping", failure_rate=1.0, failure_code="UNAVAILABLE")
+
+    result = await transport.call_tool("ping")
+
+    assert not result.success
+    assert result.error.code == "UNAVAILABLE"
+    assert result.error.retryable is True
+    assert transport.last_call("ping").fault == "failure"
+
+    transport.set_conditions("ping", failure_rate=1.0, failure_mode="raise")
+    with pytest.raises(TransportError):
+        await transport.call_tool("ping")
+    assert transport.call_count("ping") == 2
+
+
+@pytest.mark.asyncio
+async def test_injected_timeout():
+    """Test a timed-out call hangs for timeout_ms and then raises."""
+    transport = _transport()
+    transport.set_conditions("ping", timeout_rate=1.0, timeout_ms=30)
+
+    start = time.perf_counter()
+    with pytest.raises(TransportTimeoutError):
+        await transport.call_tool("ping")
+
+    assert (time.perf_counter() - start) * 1000 >= 29
+    assert transport.last_call("ping").fault == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_not_delayed():
+    """Test an unregistered tool fails immediately, before any simulated wait."""
+    transport = _transport()
+    transport.set_conditions(latency_ms=1000)
+
+    start = time.perf_counter()
+    with pytest.raises(TransportError):
+        await transport.call_tool("missing")
+
+    assert time.perf_counter() - start < 0.5
+    assert transport.call_count() == 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Client Behavior
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_retry_loop_recovers_from_flaky_tool():
+    """Test a simple client retry loop succeeds through injected failures."""
+    transport = _transport(seed=11)
+    transport.set_conditions("ping", latency_ms=1, failure_rate=0.5)
+
+    async def call_with_retry(attempts=10):
+        for _ in range(attempts):
+            result = await transport.call_tool("ping")
+            if isinstance(result, dict) or result.success:
+                return result
+        raise AssertionError("retries exhausted")
+
+    results = [await call_with_retry() for _ in range(10)]
+
+    assert all(r["data"] == "pong" for r in results)
+    failures = [c for c in transport.get_calls("ping") if c.fault == "failure"]
+    assert transport.call_count("ping") == 10 + len(failures)
+    assert failures
+
+
+@pytest.mark.asyncio
+async def test_load_against_degraded_transport():
+    """Test run_load reports the latency and errors the transport simulates."""
+    transport = _transport(seed=5)
+    transport.set_conditions(
+        "ping", latency_ms=5, jitter_ms=2, failure_rate=0.2, failure_code="BUSY"
+    )
+
+    report = await run_load(transport, [("ping", {})], concurrency=8, total=100, seed=5)
+
+    assert report.calls == 100
+    assert 5 < report.errors < 40
+    assert report.error_codes == {"BUSY": report.errors}
+    assert report.latency.p50 >= 3
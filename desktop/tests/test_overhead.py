@@ -0,0 +1,188 @@
+"""
+Framework Overhead Tests for Mechanic Desktop.
+
+Tests verify the per-call fast paths in the command wrapper:
+- Input validators are built once per schema and reused
+- Already-validated models are passed through without revalidation
+- Schema-less commands get their input unchanged
+- MCP tool calls reach context-accepting handlers with a CommandContext
+- Results serialize to JSON once and reuse the bytes until changed
+- measure_overhead reports time at the handler, wrapper and execute layers
+"""
+
+import json
+import pickle
+from datetime import datetime
+
+import pytest
+from pydantic import BaseModel
+
+from afd import success
+from afd.core import CommandContext
+from afd.server import create_server
+from afd.server.decorators import input_validator
+from afd.testing import measure_overhead
+
+
+class PingInput(BaseModel):
+    target: str
+    count: int = 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Validation
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_validated_model_passes_through():
+    """Test a model input reaches the handler as the same object."""
+    server = create_server("overhead-test")
+    seen = []
+
+    @server.command(name="ping", description="Ping", input_schema=PingInput)
+    async def ping(input: PingInput, context=None):
+        seen.append(input)
+        return success({"target": input.target, "count": input.count})
+
+    model = PingInput(target="a")
+    await server.execute("ping", model)
+    result = await server.execute("ping", {"target": "b", "count": "3"})
+
+    assert seen[0] is model
+    assert result.data == {"target": "b", "count": 3}
+    assert input_validator(PingInput) is input_validator(PingInput)
+
+
+@pytest.mark.asyncio
+async def test_invalid_input_still_rejected():
+    """Test the cached validator raises for bad input like model_validate."""
+    server = create_server("overhead-invalid-test")
+
+    @server.command(name="ping", description="Ping", input_schema=PingInput)
+    async def ping(input: PingInput):
+        return success({})
+
+    result = await server.execute("ping", {"count": "many"})
+
+    assert not result.success
+    assert "target" in result.error.message
+
+
+@pytest.mark.asyncio
+async def test_schemaless_input_unchanged():
+    """Test commands without a schema get the raw input, with or without context."""
+    server = create_server("overhead-schemaless-test")
+
+    @server.command(name="raw", description="Raw input")
+    async def raw(input):
+        return success({"same": input is payload})
+
+    payload = {"x": [1, 2]}
+    result = await server.execute("raw", payload)
+
+    assert result.data == {"same": True}
+
+
+@pytest.mark.asyncio
+async def test_foreign_context_object_tolerated():
+    """Test a transport's own context object doesn't break the registry chain."""
+    server = create_server("overhead-foreign-context-test")
+
+    @server.command(
+        name="ping", description="Ping", input_schema=PingInput, coalesce=True
+    )
+    async def ping(input: PingInput, context=None):
+        return success({"target": input.target})
+
+    result = await server.execute("ping", {"target": "a"}, PingInput(target="ctx"))
+
+    assert result.success
+
+
+@pytest.mark.asyncio
+async def test_mcp_tool_passes_command_context():
+    """Test an MCP tool call reaches a context-accepting handler with a CommandContext."""
+    pytest.importorskip("mcp.server.fastmcp")
+    server = create_server("overhead-mcp-test")
+    seen = []
+
+    @server.command(name="ping", description="Ping", input_schema=PingInput)
+    async def ping(input: PingInput, context=None):
+        seen.append(context)
+        return success({"target": input.target})
+
+    mcp = server._create_mcp_server()
+    await mcp.call_tool("ping", {"target": "a"})
+
+    assert isinstance(seen[0], CommandContext)
+    assert "mcp_context" in seen[0].extra
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Serialization
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_result_json_bytes_cached_until_assignment():
+    """Test to_json_bytes serializes once and is reset when a field is set."""
+    result = success({"when": datetime(2026, 1, 2), "input": PingInput(target="a")})
+
+    first = result.to_json_bytes()
+    assert result.to_json_bytes() is first
+    assert json.loads(first)["data"] == {
+        "when": "2026-01-02T00:00:00",
+        "input": {"target": "a", "count": 1},
+    }
+
+    result.reasoning = "changed"
+    assert json.loads(result.to_json_bytes())["reasoning"] == "changed"
+
+
+def test_result_json_bytes_not_part_of_identity():
+    """Test cached bytes don't affect equality, copies or pickles."""
+    result = success({"n": 1})
+    result.to_json_bytes()
+
+    assert result == success({"n": 1})
+    assert pickle.loads(pickle.dumps(result)) == result
+    copied = result.model_copy(update={"data": {"n": 2}})
+    assert json.loads(copied.to_json_bytes())["data"] == {"n": 2}
+
+
+def test_result_json_bytes_unknown_types():
+    """Test values JSON can't represent are written via str()."""
+
+    class Opaque:
+        def __str__(self):
+            return "opaque"
+
+    assert json.loads(success({"x": Opaque()}).to_json_bytes())["data"] == {
+        "x": "opaque"
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Benchmark
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_measure_overhead_layers():
+    """Test the benchmark times every layer and registers each execute call."""
+    server = create_server("overhead-bench-test")
+
+    @server.command(name="ping", description="Ping", input_schema=PingInput)
+    async def ping(input: PingInput, context=None):
+        return success({"target": input.target})
+
+    report = await measure_overhead(
+        server, "ping", {"target": "a"}, iterations=20, repeat=2
+    )
+
+    assert report.command == "ping"
+    assert 0 < report.handler_us < report.execute_us
+    assert report.overhead_us == report.execute_us - report.handler_us
+    assert "ping: execute" in report.summary()
+    # 10 warm-up calls plus 2 rounds of 20
+    assert server.registry.stats.snapshot()["ping"]["calls"] == 50
+
+    with pytest.raises(KeyError):
+        await measure_overhead(server, "missing")
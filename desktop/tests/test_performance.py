@@ -0,0 +1,204 @@
+"""
+Performance Tests for Mechanic Desktop.
+
+Tests verify the latency assertions and load generator in afd.testing:
+- measure() collects samples and Timings reports exact percentiles
+- assert_latency_under enforces a budget at a percentile
+- run_load drives servers and MockTransport with weighted call mixes,
+  honours its concurrency and counts errors
+- Offline API lookups stay within their latency budgets under load
+"""
+
+import asyncio
+
+import pytest
+
+from afd import error, success
+from afd.server import create_server
+from afd.testing import (
+    LoadCall,
+    Timings,
+    assert_latency_under,
+    measure,
+    run_load,
+)
+from afd.transports import MockTransport
+
+
+def _apidefs(root, count=400):
+    """Write a synthetic APIDefs folder with ``count`` APIs over four files."""
+    for part in range(4):
+        entries = []
+        for n in range(part, count, 4):
+            entries.append(
+                f'APIDefs["C_Test.Get{n}"] = {{\n'
+                f'  name = "Get{n}",\n'
+                f'  category = "test",\n'
+                f"}}\n"
+            )
+        (root / f"Part{part}.lua").write_text("".join(entries), encoding="utf-8")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Timings and Assertions
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_timings_percentiles():
+    """Test percentiles interpolate between sorted samples."""
+    timings = Timings([4.0, 1.0, 3.0, 2.0, 5.0])
+
+    assert timings.p50 == 3.0
+    assert timings.percentile(0.25) == 2.0
+    assert timings.percentile(1.0) == 5.0
+    assert timings.p95 == pytest.approx(4.8)
+    assert timings.snapshot()["count"] == 5
+    assert Timings().p99 is None
+
+
+@pytest.mark.asyncio
+async def test_measure_records_each_block():
+    """Test measure() adds one sample per block, even when the block raises."""
+    timings = Timings()
+
+    for _ in range(3):
+        with measure(timings):
+            await asyncio.sleep(0.005)
+    with pytest.raises(RuntimeError):
+        with measure(timings):
+            raise RuntimeError("boom")
+
+    assert timings.count == 4
+    assert timings.max >= 5
+    with measure() as single:
+        pass
+    assert single.count == 1
+
+
+def test_assert_latency_under():
+    """Test the budget is checked at the requested percentile."""
+    timings = Timings([1.0] * 98 + [50.0, 60.0])
+
+    assert assert_latency_under(timings, 2) == 1.0
+    assert_latency_under([1.0, 2.0], 2, percentile=1.0)
+    with pytest.raises(AssertionError, match="p99 latency under 10ms"):
+        assert_latency_under(timings, 10, percentile=0.99)
+    with pytest.raises(AssertionError, match="none were recorded"):
+        assert_latency_under(Timings(), 10)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Load Generation
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_run_load_mix_concurrency_and_errors():
+    """Test run_load follows the mix weights, keeps N calls in flight and counts errors."""
+    server = create_server("load-test")
+    running = peak = 0
+
+    @server.command(name="work", description="Work", mutation=True)
+    async def work(input, context=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.002)
+        running -= 1
+        return success({})
+
+    @server.command(name="fail", description="Fail")
+    async def fail(input, context=None):
+        return error(code="BROKEN", message="always fails")
+
+    report = await run_load(
+        server,
+        [LoadCall("work", {}, weight=3), ("fail", {})],
+        concurrency=5,
+        total=200,
+        seed=7,
+    )
+
+    assert report.calls == 200
+    assert peak == 5
+    assert report.errors == report.by_command["fail"].count
+    assert 20 < report.errors < 80
+    assert report.error_codes == {"BROKEN": report.errors}
+    assert report.to_dict()["by_command"]["work"]["count"] == 200 - report.errors
+    assert "200 calls" in report.summary()
+
+
+@pytest.mark.asyncio
+async def test_run_load_against_mock_transport():
+    """Test run_load calls transport tools and counts raised exceptions."""
+    transport = MockTransport()
+    transport.add_mock_response("ping", {"success": True, "data": "pong"})
+    await transport.connect()
+
+    report = await run_load(
+        transport, [("ping", {}), ("missing", {})], total=40, seed=1
+    )
+
+    assert report.calls == 40
+    assert transport.call_count("ping") == report.by_command["ping"].count
+    assert report.error_codes == {"ToolNotFoundError": report.by_command["missing"].count}
+
+
+@pytest.mark.asyncio
+async def test_run_load_for_duration():
+    """Test a duration-bounded run stops on time."""
+    server = create_server("load-duration-test")
+
+    @server.command(name="nap", description="Nap")
+    async def nap(input, context=None):
+        await asyncio.sleep(0.005)
+        return success({})
+
+    report = await run_load(server, [("nap", {})], concurrency=2, duration=0.1)
+
+    assert 0.1 <= report.elapsed_s < 0.5
+    assert report.calls > 4
+    assert report.errors == 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Budgets
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def api_server(tmp_path, monkeypatch):
+    """Server with the api.* commands over a synthetic APIDefs folder, uncached."""
+    from mechanic.commands import api
+
+    _apidefs(tmp_path)
+    monkeypatch.setattr(api, "get_apidefs_path", lambda: tmp_path)
+    server = create_server("budget-test")
+    server.cache.enabled = False
+    api.register_commands(server)
+    return server
+
+
+@pytest.mark.asyncio
+async def test_api_lookups_within_budget(api_server):
+    """Test api.info and api.search stay within budget with parsed definitions reused."""
+    timings = Timings()
+    for n in range(100):
+        with measure(timings):
+            await api_server.execute("api.info", {"api_name": f"C_Test.Get{n}"})
+
+    assert_latency_under(timings, 10, percentile=0.95)
+
+    report = await run_load(
+        api_server,
+        [
+            ("api.search", {"query": "Get1*"}, 3),
+            ("api.info", {"api_name": "C_Test.Get7"}),
+            ("api.list", {"namespace": "C_Test"}),
+        ],
+        concurrency=4,
+        total=200,
+        warmup=1,
+        seed=3,
+    )
+
+    assert report.errors == 0
+    assert_latency_under(report, 50, percentile=0.95)
+    assert_latency_under(report.by_command["api.search"], 50, percentile=0.99)
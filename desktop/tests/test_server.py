@@ -0,0 +1,369 @@
+"""
+HTTP Server Tests for Mechanic Desktop.
+
+Tests verify HTTP caching behavior:
+- ETag validators and 304 Not Modified for history/metrics
+- Precompressed, cache-controlled dashboard assets
+- Server-Sent Events streaming of command progress, never held back by gzip
+- Batch execution
+- Result bytes shared between the response and history
+- Prometheus /metrics exposition
+"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from mechanic.http_cache import DashboardStaticFiles, etag_matches, make_etag
+from mechanic.storage import Storage
+
+
+async def _get(app, path: str, headers: dict = None):
+    """Issue a GET straight against an ASGI app; returns (status, headers, body)."""
+    return await _request(app, "GET", path, headers)
+
+
+async def _post_json(app, path: str, payload: dict, headers: dict = None, on_message=None):
+    """Issue a JSON POST straight against an ASGI app."""
+    body = json.dumps(payload).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(body)),
+        **(headers or {}),
+    }
+    return await _request(app, "POST", path, headers, body, on_message)
+
+
+async def _request(
+    app,
+    method: str,
+    path: str,
+    headers: dict = None,
+    body: bytes = b"",
+    on_message=None,
+):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 3100),
+    }
+    messages = []
+    requested = asyncio.Event()
+
+    async def receive():
+        # First call delivers the body; later calls wait for a disconnect
+        # that never comes, like a connected client
+        if requested.is_set():
+            await asyncio.Event().wait()
+        requested.set()
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+        if on_message is not None:
+            on_message(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], response_headers, body
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Validators
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_etag_matching():
+    """Test If-None-Match parsing (lists, weak prefix, wildcard)."""
+    etag = make_etag("history", 12, 3)
+    assert etag == '"history-12-3"'
+    assert etag_matches('"history-12-3"', etag)
+    assert etag_matches('"other", W/"history-12-3"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"history-11-3"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_history_version_changes_with_rows(tmp_path):
+    """Test the history validator changes on insert and clear."""
+    storage = Storage(tmp_path / "test.db")
+    empty = storage.get_command_history_version()
+
+    storage.save_command_result("addon.lint", {"success": True})
+    after_insert = storage.get_command_history_version()
+    assert after_insert != empty
+    assert storage.get_command_history_version("addon.lint") == after_insert
+    assert storage.get_command_history_version("addon.test") == (0, 0)
+
+    storage.clear_command_history()
+    assert storage.get_command_history_version() != after_insert
+
+
+@pytest.mark.asyncio
+async def test_history_endpoint_returns_304_when_unchanged():
+    """Test /api/history answers 304 for a matching If-None-Match."""
+    from mechanic.server import app
+
+    status, headers, _ = await _get(app, "/api/history")
+    assert status == 200
+    etag = headers["etag"]
+
+    status, headers, body = await _get(app, "/api/history", {"If-None-Match": etag})
+    assert status == 304
+    assert body == b""
+    assert headers["etag"] == etag
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Dashboard Assets
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.asyncio
+async def test_dashboard_served_precompressed(tmp_path):
+    """Test static files are gzipped for capable clients and revalidate to 304."""
+    page = b"<html><body>" + b"<p>Mechanic</p>" * 500 + b"</body></html>"
+    (tmp_path / "index.html").write_bytes(page)
+    files = DashboardStaticFiles(directory=tmp_path, html=True)
+
+    status, headers, body = await _get(
+        files, "/index.html", {"Accept-Encoding": "gzip, deflate"}
+    )
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["cache-control"] == "no-cache"
+    assert gzip.decompress(body) == page
+
+    status, _, body = await _get(
+        files,
+        "/index.html",
+        {"Accept-Encoding": "gzip", "If-None-Match": headers["etag"]},
+    )
+    assert status == 304
+    assert body == b""
+
+
+@pytest.mark.asyncio
+async def test_dashboard_identity_for_plain_clients(tmp_path):
+    """Test clients without gzip support get the file as-is with cache headers."""
+    (tmp_path / "app.css").write_text("body { color: red; }" * 100)
+    files = DashboardStaticFiles(directory=tmp_path)
+
+    status, headers, body = await _get(files, "/app.css")
+    assert status == 200
+    assert "content-encoding" not in headers
+    assert headers["cache-control"].startswith("public, max-age=")
+    assert body.startswith(b"body")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Streaming and Batch Execution
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _parse_sse(body: bytes) -> list:
+    """Split an event stream into (event, data) pairs."""
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_report_progress_without_listener_is_noop():
+    """Test handlers can report progress whether or not anyone is listening."""
+    from afd.core import CommandContext, report_progress
+
+    report_progress(None, "ignored")
+    report_progress(object(), "ignored")
+    CommandContext().report_progress("ignored")
+
+    events = []
+    report_progress(
+        CommandContext(on_progress=events.append), "Scanning", current=1, total=4
+    )
+    assert events == [{"message": "Scanning", "current": 1, "total": 4, "percent": 25.0}]
+
+
+@pytest.mark.asyncio
+async def test_execute_stream_emits_progress_then_result(tmp_path, monkeypatch):
+    """Test /api/execute/stream sends progress events and the final result."""
+    import mechanic.server as server_module
+
+    monkeypatch.setattr(server_module, "storage", Storage(tmp_path / "test.db"))
+    addons = tmp_path / "source" / "Interface" / "AddOns" / "Blizzard_Test"
+    addons.mkdir(parents=True)
+    (addons / "Test.xml").write_text('<Texture atlas="test-icon"/>')
+
+    status, headers, body = await _post_json(
+        server_module.app,
+        "/api/execute/stream",
+        {
+            "command": "atlas.scan",
+            "input": {
+                "source_path": str(tmp_path / "source"),
+                "output_path": str(tmp_path / "atlas_index.json"),
+            },
+        },
+    )
+
+    assert status == 200
+    assert headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in headers
+
+    events = _parse_sse(body)
+    assert events[0][0] == "progress"
+    assert events[0][1]["total"] == 1
+    kind, result = events[-1]
+    assert kind == "result"
+    assert result["success"] is True
+    assert server_module.storage.get_command_history("atlas.scan")
+
+
+@pytest.mark.asyncio
+async def test_execute_stream_not_buffered_by_gzip(tmp_path, monkeypatch):
+    """Test progress reaches a gzip-accepting client while the command still runs."""
+    import mechanic.commands.core as core
+    import mechanic.server as server_module
+    from afd import success
+    from afd.core import report_progress
+    from afd.server import create_server
+
+    monkeypatch.setattr(server_module, "storage", Storage(tmp_path / "test.db"))
+    server = create_server("stream-gzip-test")
+    monkeypatch.setattr(core, "get_server", lambda: server)
+    delivered = asyncio.Event()
+    chunks = []
+
+    @server.command(name="slow.report", description="Report, then wait")
+    async def slow_report(input, context=None):
+        report_progress(context, "Working", current=1, total=2)
+        await asyncio.wait_for(delivered.wait(), 5)
+        return success({"done": True})
+
+    def on_message(message):
+        body = message.get("body", b"")
+        if body:
+            chunks.append((delivered.is_set(), body))
+        if b"event: progress" in body:
+            delivered.set()
+
+    status, headers, body = await _post_json(
+        server_module.app,
+        "/api/execute/stream",
+        {"command": "slow.report", "input": {}},
+        headers={"Accept-Encoding": "gzip"},
+        on_message=on_message,
+    )
+
+    assert status == 200
+    assert "content-encoding" not in headers
+    assert chunks[0][0] is False
+    assert chunks[0][1].startswith(b"event: progress")
+    assert [kind for kind, _ in _parse_sse(body)] == ["progress", "result"]
+    assert _parse_sse(body)[-1][1]["data"] == {"done": True}
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_records_each_step(tmp_path, monkeypatch):
+    """Test /api/execute/batch returns all results and saves each to history."""
+    import mechanic.server as server_module
+
+    monkeypatch.setattr(server_module, "storage", Storage(tmp_path / "test.db"))
+
+    status, _, body = await _post_json(
+        server_module.app,
+        "/api/execute/batch",
+        {"steps": [{"command": "env.status"}, {"command": "ws.stats"}]},
+    )
+
+    assert status == 200
+    result = json.loads(body)
+    assert [r["status"] for r in result["data"]["results"]] == ["success", "success"]
+    assert server_module.storage.get_command_history("env.status")
+    assert not server_module.storage.get_command_history("ws.stats")
+
+
+@pytest.mark.asyncio
+async def test_execute_body_matches_history(tmp_path, monkeypatch):
+    """Test /api/execute sends the same serialized result it saves to history."""
+    import mechanic.server as server_module
+
+    monkeypatch.setattr(server_module, "storage", Storage(tmp_path / "test.db"))
+
+    status, headers, body = await _post_json(
+        server_module.app, "/api/execute", {"command": "env.status"}
+    )
+
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    [entry] = server_module.storage.get_command_history("env.status")
+    assert entry["success"]
+    assert entry["result"] == json.loads(body)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Prometheus Metrics
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_prometheus_writer_formats_families():
+    """Test counters, labels and millisecond histograms render as Prometheus text."""
+    from afd.core import Histogram, PrometheusWriter
+
+    latency = Histogram(buckets=(10, 100))
+    for ms in (5, 50, 500):
+        latency.observe(ms)
+
+    out = PrometheusWriter()
+    out.counter("app_calls_total", "Calls", 2, {"command": 'say "hi"'})
+    out.counter("app_calls_total", "Calls", 1, {"command": "other"})
+    out.histogram("app_latency_seconds", "Latency", latency)
+    lines = out.render().splitlines()
+
+    assert lines[:4] == [
+        "# HELP app_calls_total Calls",
+        "# TYPE app_calls_total counter",
+        'app_calls_total{command="say \\"hi\\""} 2',
+        'app_calls_total{command="other"} 1',
+    ]
+    assert 'app_latency_seconds_bucket{le="0.01"} 1' in lines
+    assert 'app_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "app_latency_seconds_sum 0.555" in lines
+    assert "app_latency_seconds_count 3" in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_runtime_stats(tmp_path, monkeypatch):
+    """Test /metrics covers commands, cache, ingest, WebSocket and SQLite."""
+    import mechanic.server as server_module
+    from mechanic.commands.core import get_server
+
+    monkeypatch.setattr(server_module, "storage", Storage(tmp_path / "test.db"))
+    await get_server().execute("ws.stats", {})
+    await get_server().execute("no.such.command", {})
+    await _post_json(server_module.app, "/api/execute", {"command": "env.status"})
+
+    status, headers, body = await _get(server_module.app, "/metrics")
+
+    assert status == 200
+    assert headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = body.decode()
+    assert 'mechanic_command_executions_total{command="ws.stats"}' in text
+    assert 'command="no.such.command"' not in text
+    assert 'mechanic_command_duration_seconds_bucket{command="ws.stats",le="+Inf"}' in text
+    assert "mechanic_cache_hit_ratio " in text
+    assert 'mechanic_ingest_stage_duration_seconds_count{stage="parse"}' in text
+    assert "mechanic_ws_clients 0" in text
+    assert 'mechanic_sqlite_write_duration_seconds_count{operation="save_command_result"} 1' in text
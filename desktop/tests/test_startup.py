@@ -0,0 +1,194 @@
+"""
+CLI Startup Tests for Mechanic Desktop.
+
+Agents run `mech call ...` hundreds of times per session, so import cost
+dominates short commands. Tests measure imports with `python -X importtime`
+in a fresh interpreter and verify:
+- `mech call/commands/shell` never import the dashboard server stack
+- Command modules are imported only when one of their commands is used,
+  and lazy commands appear in every listing
+- Importing the CLI stays within a time budget
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from afd import success
+from afd.core import CommandDefinition, create_command_registry
+from afd.server import create_server
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Modules only the dashboard and MCP servers need
+SERVER_MODULES = ("mechanic.server", "mechanic.watcher", "fastapi", "uvicorn")
+
+# Generous budget for `import mechanic.cli` (it took ~500ms when it pulled
+# in FastAPI and uvicorn); loaded CI machines are slow
+CLI_IMPORT_BUDGET_MS = 250
+
+
+def _run(code: str, *args: str, data_dir: Path = None):
+    """Run code in a fresh interpreter from src/."""
+    env = dict(os.environ)
+    if data_dir is not None:
+        env["MECHANIC_DATA_DIR"] = str(data_dir)
+    proc = subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return proc
+
+
+def _import_times(code: str, data_dir: Path = None) -> dict:
+    """Run code with -X importtime; returns {module: cumulative ms}."""
+    proc = _run(code, "-X", "importtime", data_dir=data_dir)
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative) / 1000
+    return times
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Import Graph
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_cli_import_skips_server_stack():
+    """Test importing the CLI doesn't build the dashboard app or load uvicorn."""
+    times = _import_times("import mechanic.cli")
+
+    assert "mechanic.cli" in times
+    assert not [m for m in SERVER_MODULES if m in times]
+    assert "mechanic.storage" not in times
+
+
+def test_call_path_skips_server_stack(tmp_path):
+    """Test registering every command (a cold `mech call`) stays light."""
+    times = _import_times(
+        "import mechanic.cli\n"
+        "from mechanic.commands.core import get_server\n"
+        "get_server()",
+        data_dir=tmp_path,
+    )
+
+    assert not [m for m in SERVER_MODULES if m in times]
+    assert "requests" not in times
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Lazy Registration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _command_modules(code: str, data_dir: Path) -> set:
+    """Command modules imported by running code (importlib bypasses -X importtime)."""
+    proc = _run(
+        code + "\nimport sys\nprint(' '.join(sys.modules))", data_dir=data_dir
+    )
+    return {
+        m.rsplit(".", 1)[1]
+        for m in proc.stdout.split()
+        if m.startswith("mechanic.commands.")
+        and m not in ("mechanic.commands.core", "mechanic.commands.manifest")
+    }
+
+
+@pytest.mark.asyncio
+async def test_lazy_commands_load_on_first_use():
+    """Test a lazy loader runs once, on execute or listing, and stale names go away."""
+    server = create_server("lazy-test")
+    loads = []
+
+    def loader():
+        loads.append(1)
+
+        @server.command(name="lazy.echo", description="Echo")
+        async def echo(input):
+            return success({"ok": True})
+
+    server.register_lazy(["lazy.echo", "lazy.gone"], loader)
+    assert loads == []
+
+    assert (await server.execute("lazy.echo", {})).success
+    assert (await server.execute("lazy.echo", {})).success
+    assert loads == [1]
+    assert not server.registry.has("lazy.gone")
+    assert [c.name for c in server.list_commands()] == ["lazy.echo"]
+
+
+def test_lazy_commands_listed_by_category():
+    """Test list_by_category loads pending lazy commands like list() does."""
+    registry = create_command_registry()
+
+    async def handler(input):
+        return success({})
+
+    def loader():
+        registry.register(
+            CommandDefinition(
+                name="lazy.echo", description="Echo", handler=handler, category="lazy"
+            )
+        )
+
+    registry.register_lazy(["lazy.echo"], loader)
+
+    assert [c.name for c in registry.list_by_category("lazy")] == ["lazy.echo"]
+    assert registry.list_by_category("other") == []
+
+
+def test_warm_manifest_imports_only_needed_modules(tmp_path):
+    """Test listing imports no command modules and a call imports just its own."""
+    build = _command_modules(
+        "from mechanic.commands.core import get_server\nget_server()", tmp_path
+    )
+    assert "deadcode" in build  # cold: everything, once
+    assert (tmp_path / "command_manifest.json").exists()
+
+    listing = _command_modules(
+        "from mechanic.commands.core import list_command_summaries\n"
+        "assert len(list_command_summaries()) > 50",
+        tmp_path,
+    )
+    assert listing == set()
+
+    call = _command_modules(
+        "import asyncio\n"
+        "from mechanic.commands.core import get_server\n"
+        "assert asyncio.run(get_server().execute('cache.stats', {})).success",
+        tmp_path,
+    )
+    assert call == {"diagnostics"}
+
+
+def test_manifest_rebuilt_when_sources_change(tmp_path):
+    """Test a manifest for a different source fingerprint is ignored."""
+    from mechanic.commands import manifest
+
+    path = tmp_path / manifest.MANIFEST_FILENAME
+    manifest.save_manifest(path, manifest.build_manifest("abc", {}))
+
+    assert manifest.load_manifest(path, "abc") is not None
+    assert manifest.load_manifest(path, "def") is None
+    assert manifest.load_manifest(tmp_path / "missing.json", "abc") is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Budget
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_cli_import_time_budget():
+    """Test `import mechanic.cli` stays within its startup budget (best of 3)."""
+    best = min(_import_times("import mechanic.cli")["mechanic.cli"] for _ in range(3))
+
+    assert best < CLI_IMPORT_BUDGET_MS, f"mechanic.cli took {best:.0f}ms to import"
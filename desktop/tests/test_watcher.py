@@ -0,0 +1,162 @@
+"""
+Watcher Tests for Mechanic Desktop.
+
+Tests verify the SavedVariables ingest pipeline:
+- Stage timing via IngestTrace
+- Histogram aggregation exposed through watcher.stats
+- Adaptive stat-polling backend (SVPoller)
+"""
+
+import os
+import time
+
+import pytest
+
+from afd.core.metrics import Histogram
+from afd.testing.assertions import assert_success
+from mechanic.commands.core import get_server
+from mechanic.metrics import INGEST_STAGES, IngestStats, IngestTrace
+from mechanic.watcher import SVPoller, SVWatcher
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Histogram
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_histogram_percentiles_stay_within_observed_range():
+    """Test percentile estimates are bounded by min/max."""
+    h = Histogram(buckets=(10, 100, 1000))
+    for value in (5, 6, 7, 50, 900):
+        h.observe(value)
+
+    snap = h.snapshot()
+    assert snap["count"] == 5
+    assert snap["min"] == 5
+    assert snap["max"] == 900
+    assert 5 <= snap["p50"] <= 10
+    assert snap["p99"] <= 900
+    assert h.cumulative_buckets()[-1] == (float("inf"), 5)
+
+
+def test_histogram_empty_snapshot():
+    """Test an empty histogram reports no percentiles."""
+    snap = Histogram().snapshot()
+    assert snap["count"] == 0
+    assert snap["p95"] is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Ingest Traces
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_ingest_trace_records_all_stages(tmp_path):
+    """Test a complete trace produces a duration for every stage."""
+    sv_file = tmp_path / "!Mechanic.lua"
+    sv_file.write_text("MechanicDB = {}", encoding="utf-8")
+
+    trace = IngestTrace(str(sv_file))
+    for stage in INGEST_STAGES[1:]:
+        time.sleep(0.001)
+        trace.mark(stage)
+
+    durations = trace.durations()
+    assert trace.complete
+    assert set(durations) == set(INGEST_STAGES)
+    assert all(ms >= 0 for ms in durations.values())
+
+    stats = IngestStats()
+    stats.record(trace)
+    snap = stats.snapshot()
+    assert snap["completed"] == 1
+    assert snap["total"]["count"] == 1
+    assert snap["last"]["file"] == "!Mechanic.lua"
+
+
+def test_ingest_trace_partial_counts_as_skipped(tmp_path):
+    """Test a trace abandoned after parsing is counted as skipped."""
+    trace = IngestTrace(str(tmp_path / "missing.lua"))
+    trace.mark("debounce")
+    trace.mark("read")
+
+    stats = IngestStats()
+    stats.record(trace)
+    snap = stats.snapshot()
+    assert snap["skipped"] == 1
+    assert snap["stages"]["read"]["count"] == 1
+    assert snap["stages"]["storage"]["count"] == 0
+    # No file on disk means no write lag measurement
+    assert snap["stages"]["fs_event"]["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sv_parse_marks_read_and_parse(tmp_path):
+    """Test sv.parse marks read/parse stages on a trace passed via context."""
+    from afd.core import CommandContext
+
+    sv_file = tmp_path / "TestDB.lua"
+    sv_file.write_text('TestDB = { version = 1 }', encoding="utf-8")
+    trace = IngestTrace(str(sv_file))
+
+    server = get_server()
+    result = await server.execute(
+        "sv.parse",
+        {"file_path": str(sv_file)},
+        CommandContext(extra={"ingest_trace": trace}),
+    )
+
+    assert_success(result)
+    assert "read" in trace.marks
+    assert "parse" in trace.marks
+
+
+@pytest.mark.asyncio
+async def test_watcher_stats_command():
+    """Test watcher.stats returns per-stage histograms."""
+    server = get_server()
+    result = await server.execute("watcher.stats", {})
+
+    data = assert_success(result)
+    assert set(data.stages) == set(INGEST_STAGES)
+    assert "p95" in data.total
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Polling Backend
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_poller_detects_modified_and_added_files(tmp_path):
+    """Test SVPoller reports writes to known files and picks up new ones on rescan."""
+    from watchfiles import Change
+
+    sv_file = tmp_path / "TestDB.lua"
+    sv_file.write_text("TestDB = {}", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    poller = SVPoller([tmp_path])
+    assert poller.poll() == set()
+
+    sv_file.write_text("TestDB = { version = 2 }", encoding="utf-8")
+    stat = os.stat(sv_file)
+    os.utime(sv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert poller.poll() == {(Change.modified, str(sv_file))}
+
+    new_file = tmp_path / "OtherDB.lua"
+    new_file.write_text("OtherDB = {}", encoding="utf-8")
+    poller._last_rescan -= poller.RESCAN_INTERVAL
+    assert poller.poll() == {(Change.added, str(new_file))}
+
+
+def test_poller_interval_backs_off_and_resets():
+    """Test the poll interval grows while idle and snaps back after a change."""
+    poller = SVPoller([], min_interval=0.1, max_interval=0.5)
+
+    assert poller.next_interval(False) == pytest.approx(0.2)
+    assert poller.next_interval(False) == pytest.approx(0.4)
+    assert poller.next_interval(False) == pytest.approx(0.5)
+    assert poller.next_interval(True) == pytest.approx(0.1)
+
+
+def test_watcher_rejects_unknown_backend(tmp_path):
+    """Test SVWatcher validates the backend name."""
+    with pytest.raises(ValueError):
+        SVWatcher([tmp_path], backend="inotify")